@@ -1,29 +1,139 @@
-from typing import List
-from fastapi import FastAPI, HTTPException, Depends
+from datetime import datetime
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, Depends, Request, Query
+from fastapi.responses import PlainTextResponse, ORJSONResponse, FileResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import tuple_
 from sqlmodel import select, Session
-from .models import User, UserCreate, UserRead, Task, TaskCreate, TaskUpdate
-from .db import init_db, get_session
-from .auth import hash_password, verify_password, create_access_token, decode_token
+from .models import (
+    User, UserCreate, UserRead, Task, TaskCreate, TaskUpdate, TaskMove, TaskTags, TaskImport,
+    Project, ProjectCreate, Tag, TagCreate, RefreshRequest, AuditEvent, utcnow
+)
+from .db import engine, init_db, get_session, get_read_session
+from .auth import hash_password, verify_password, needs_rehash, decode_token
+from .tokens import issue_tokens, rotate, logout as revoke_login
+from .compression import CompressionMiddleware
+from .config import (
+    COMPRESSION_ENCODINGS, COMPRESSION_MIN_SIZE, GZIP_LEVEL, BROTLI_QUALITY, METRICS_ENABLED,
+    SQL_PROFILE_ENABLED, SQL_PROFILE_REPEAT_THRESHOLD,
+    HEALTH_DB_TIMEOUT, HEALTH_CACHE_SECONDS, HEALTH_MAX_WAITING, USER_CACHE_TTL,
+    RATE_LIMIT_ENABLED, RATE_LIMITS, MAX_CONCURRENCY, ADMISSION_TIMEOUT,
+    COMPACTION_ENABLED, COMPACTION_INTERVAL, COMPACTION_IDLE_SECONDS, TOMBSTONE_RETENTION_DAYS,
+    COMPACTION_BATCH, VACUUM_PAGES, JOBS_BACKEND, JOBS_DB_PATH, JOB_WORKERS, JOB_LEASE_SECONDS,
+    AUDIT_SINK, AUDIT_FILE, AUDIT_FILE_MAX_BYTES, AUDIT_FILE_BACKUPS, AUDIT_BATCH, AUDIT_FLUSH_INTERVAL, AUDIT_MAX_BUFFER
+)
+from .cache import cache, user_key, invalidate_user, rebalance_key, USERS_LIST_KEY
+from .metrics import MetricsMiddleware, render as render_metrics
+from .ratelimit import RateLimitMiddleware
+from . import profiler, health as health_checks
+from .maintenance import delete_user_cascade, ActivityMiddleware, ActivityTracker, Compactor
+from .ordering import last_position, move_task
+from .taxonomy import (
+    parse_ids, filter_tasks, task_tag_ids, task_live_changed, set_task_project, set_task_tags, missing_owned,
+    delete_project, delete_tag
+)
+from .jobs import JobQueue, create_job_store, job_summary, SUCCEEDED
+from . import job_handlers
+from .audit import AuditLog, create_sink, event_dict, parse_cursor, make_cursor, naive_utc
+from .serialization import USER_FIELDS, TASK_SORTS, task_projection, sorted_task_query, admin_task_query, select_users, rows_response, rows_to_dicts
 
 app = FastAPI(title="Tasks API (JWT)", version="2.0.0")
+app.add_middleware(
+    CompressionMiddleware,
+    encodings=COMPRESSION_ENCODINGS,
+    minimum_size=COMPRESSION_MIN_SIZE,
+    gzip_level=GZIP_LEVEL,
+    brotli_quality=BROTLI_QUALITY
+)
+if SQL_PROFILE_ENABLED:
+    app.add_middleware(profiler.SQLProfilerMiddleware, repeat_threshold=SQL_PROFILE_REPEAT_THRESHOLD)
+job_queue = JobQueue(create_job_store(JOBS_BACKEND, JOBS_DB_PATH), JOB_WORKERS, lease=JOB_LEASE_SECONDS)
+audit = AuditLog(
+    create_sink(AUDIT_SINK, engine, AUDIT_FILE, AUDIT_FILE_MAX_BYTES, AUDIT_FILE_BACKUPS),
+    batch_size=AUDIT_BATCH, flush_interval=AUDIT_FLUSH_INTERVAL, max_buffer=AUDIT_MAX_BUFFER
+)
+
+activity = ActivityTracker()
+compactor = Compactor(activity, COMPACTION_INTERVAL, COMPACTION_IDLE_SECONDS,
+                      TOMBSTONE_RETENTION_DAYS, COMPACTION_BATCH, VACUUM_PAGES)
+if COMPACTION_ENABLED:
+    app.add_middleware(ActivityMiddleware, tracker=activity)
+if RATE_LIMIT_ENABLED or MAX_CONCURRENCY > 0:
+    # Outside compression/profiling so rejected requests cost almost nothing
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits=RATE_LIMITS if RATE_LIMIT_ENABLED else {},
+        max_concurrency=MAX_CONCURRENCY,
+        queue_timeout=ADMISSION_TIMEOUT
+    )
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
 @app.on_event("startup")
 def on_startup():
     init_db()
+    job_queue.start()
+    audit.start()
+    if COMPACTION_ENABLED:
+        compactor.start()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    compactor.stop()
+    job_queue.stop()
+    audit.stop()
 
 # ---- helper: Bearer token ----
-def get_current_user(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
+def get_current_user(request: Request, token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)) -> User:
     username = decode_token(token)
     if not username:
         raise HTTPException(status_code=401, detail="Invalid token")
-    user = session.exec(select(User).where(User.username == username)).first()
-    if not user:
-        raise HTTPException(status_code=401, detail="User not found")
+    cached = cache.get(user_key(username))
+    if cached is not None:
+        user = User(**cached)
+    else:
+        user = session.exec(select(User).where(User.username == username)).first()
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        cache.set(user_key(username), user.model_dump(exclude={"hashed_password"}), USER_CACHE_TTL)
+    # Read-your-writes routing (see db.get_read_session)
+    request.state.user_id = user.id
+    session.info["user_id"] = user.id
     return user
 
+# ---- helper: live (not soft-deleted) task ----
+def get_live_task(session: Session, task_id: int) -> Optional[Task]:
+    task = session.get(Task, task_id)
+    return task if task is not None and task.deleted_at is None else None
+
+# ---- helper: task create/update with project and tags (counts kept in step; caller commits) ----
+def add_task(session: Session, data: TaskCreate, owner_id: int) -> Task:
+    task = Task(**data.dict(exclude={"project_id", "tag_ids"}), owner_id=owner_id, position=last_position(session, owner_id) + 1)
+    session.add(task)
+    session.flush()
+    set_task_project(session, task, data.project_id)
+    set_task_tags(session, task, data.tag_ids)
+    return task
+
+def apply_task_changes(session: Session, task: Task, data: TaskUpdate) -> dict:
+    changes = data.dict(exclude_unset=True)
+    for key, value in changes.items():
+        if key == "project_id":
+            set_task_project(session, task, value)
+        else:
+            setattr(task, key, value)
+    session.add(task)
+    return changes
+
+# ---- helper: manual order rebalance (at most one pending job per owner) ----
+def schedule_rebalance(owner_id: int):
+    key = rebalance_key(owner_id)
+    if cache.get(key) is None:
+        cache.set(key, True, 300)
+        job_queue.submit("rebalance_positions", {"owner_id": owner_id})
+
 # ---- helper:admin ----
 def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
     if not current_user.is_admin:
@@ -34,6 +144,23 @@ def get_admin_user(current_user: User = Depends(get_current_user)) -> User:
 def health():
     return {"status": "ok"}
 
+@app.get("/health/live")
+def health_live():
+    """Process is up; never touches the database"""
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def health_ready():
+    """DB connectivity, pool saturation, schema version and worker backlog (cached briefly)"""
+    result = await health_checks.readiness(HEALTH_DB_TIMEOUT, HEALTH_CACHE_SECONDS, HEALTH_MAX_WAITING)
+    return ORJSONResponse(result, status_code=200 if result["status"] == "ok" else 503)
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 # ---------------- AUTH ----------------
 
 
@@ -46,8 +173,24 @@ def login(form: OAuth2PasswordRequestForm = Depends(), session: Session = Depend
     if not verify_password(form.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid password")
     
-    token = create_access_token(user.username)
-    return {"access_token": token, "token_type": "bearer"}
+    if needs_rehash(user.hashed_password):
+        # Hashing settings changed: upgrade (or downgrade) while the plain password is at hand
+        user.hashed_password = hash_password(form.password)
+        session.add(user)
+        session.commit()
+    
+    return issue_tokens(user)
+
+@app.post("/auth/refresh")
+def refresh(data: RefreshRequest, session: Session = Depends(get_session)):
+    """New access + refresh token pair for a refresh token (no password check); the old refresh token is revoked"""
+    return rotate(session, data.refresh_token)
+
+@app.post("/auth/logout", status_code=204)
+def logout(data: RefreshRequest, session: Session = Depends(get_session)):
+    """Revoke the refresh token and every token rotated from the same login"""
+    revoke_login(session, data.refresh_token)
+    return None
 
 @app.get("/auth/me", response_model=UserRead)
 def get_me(current_user: User = Depends(get_current_user)):
@@ -55,46 +198,176 @@ def get_me(current_user: User = Depends(get_current_user)):
 
 # ---------------- TASKS (per user) ----------------
 @app.get("/tasks", response_model=List[Task])
-def get_tasks(current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
-    tasks = session.exec(select(Task).where(Task.owner_id == current_user.id)).all()
-    return tasks
+def get_tasks(fields: Optional[str] = None, summary: bool = False, sort: Optional[str] = None,
+              limit: Optional[int] = Query(None, ge=1, le=1000), cursor: Optional[str] = None,
+              project_id: Optional[int] = None, tags: Optional[str] = None,
+              current_user: User = Depends(get_current_user), session: Session = Depends(get_read_session)):
+    """
+    List own tasks; `fields=id,title,...` projects columns, `summary=true` truncates descriptions.
+    `sort=` one of TASK_SORTS (prefix - for descending, due_at NULLs last); with `limit`
+    one page is returned and X-Next-Cursor carries the `cursor=` of the next one.
+    `project_id=` and `tags=1,2` (tasks having all of them) filter in SQL
+    """
+    names, columns = task_projection(fields, summary)
+    statement = sorted_task_query(columns, sort, cursor, TASK_SORTS).where(Task.owner_id == current_user.id, Task.deleted_at.is_(None))
+    statement = filter_tasks(statement, project_id, parse_ids(tags))
+    return rows_response(session, statement, names, limit=limit)
 
 @app.post("/tasks", response_model=Task, status_code=201)
 def create_task(data: TaskCreate, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
-    task = Task(**data.dict(), owner_id=current_user.id)
-    session.add(task)
+    task = add_task(session, data, current_user.id)
     session.commit()
     session.refresh(task)
     return task
 
 @app.get("/tasks/{task_id}", response_model=Task)
-def get_task(task_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
-    task = session.get(Task, task_id)
+def get_task(task_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_read_session)):
+    task = get_live_task(session, task_id)
     if not task or task.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 @app.put("/tasks/{task_id}", response_model=Task)
 def update_task(task_id: int, data: TaskUpdate, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
-    task = session.get(Task, task_id)
+    task = get_live_task(session, task_id)
     if not task or task.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(task, key, value)
-    
+    apply_task_changes(session, task, data)
+    session.commit()
+    session.refresh(task)
+    return task
+
+@app.post("/tasks/{task_id}/move", response_model=Task)
+def move_task_endpoint(task_id: int, data: TaskMove, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Reorder: place task right after `after_id` (null = top); updates only this task's position"""
+    task = get_live_task(session, task_id)
+    if not task or task.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    needs_rebalance = move_task(session, task, data.after_id)
     session.add(task)
     session.commit()
     session.refresh(task)
+    if needs_rebalance:
+        schedule_rebalance(task.owner_id)
     return task
 
 @app.delete("/tasks/{task_id}", status_code=204)
 def delete_task(task_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
-    task = session.get(Task, task_id)
+    task = get_live_task(session, task_id)
     if not task or task.owner_id != current_user.id:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    session.delete(task)
+    task.deleted_at = utcnow()
+    session.add(task)
+    task_live_changed(session, task, -1)
+    session.commit()
+    return None
+
+@app.post("/tasks/{task_id}/restore", response_model=Task)
+def restore_task(task_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Undo a delete (until compaction purges the tombstone)"""
+    task = session.get(Task, task_id)
+    if not task or task.owner_id != current_user.id or task.deleted_at is None:
+        raise HTTPException(status_code=404, detail="Deleted task not found")
+    
+    task.deleted_at = None
+    session.add(task)
+    task_live_changed(session, task, 1)
+    session.commit()
+    session.refresh(task)
+    return task
+
+@app.get("/tasks/{task_id}/tags", response_model=List[Tag])
+def get_task_tags(task_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_read_session)):
+    task = get_live_task(session, task_id)
+    if not task or task.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return session.exec(select(Tag).where(Tag.id.in_(task_tag_ids(session, task_id))).order_by(Tag.name)).all()
+
+@app.put("/tasks/{task_id}/tags", response_model=List[Tag])
+def set_task_tags_endpoint(task_id: int, data: TaskTags, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Replace the task's tags"""
+    task = get_live_task(session, task_id)
+    if not task or task.owner_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Task not found")
+    tag_ids = set_task_tags(session, task, data.tag_ids)
+    session.commit()
+    return session.exec(select(Tag).where(Tag.id.in_(tag_ids)).order_by(Tag.name)).all()
+
+# ---------------- PROJECTS & TAGS (per user) ----------------
+def get_owned(session: Session, model, item_id: int, user: User):
+    item = session.get(model, item_id)
+    if not item or item.owner_id != user.id:
+        raise HTTPException(status_code=404, detail=f"{model.__name__} not found")
+    return item
+
+def check_name_free(session: Session, model, name: str, user: User):
+    if session.exec(select(model.id).where(model.owner_id == user.id, model.name == name)).first() is not None:
+        raise HTTPException(status_code=400, detail=f"{model.__name__} already exists")
+
+@app.get("/projects", response_model=List[Project])
+def get_projects(current_user: User = Depends(get_current_user), session: Session = Depends(get_read_session)):
+    """Own projects with live task counts (maintained on write, no task scan)"""
+    return session.exec(select(Project).where(Project.owner_id == current_user.id).order_by(Project.name)).all()
+
+@app.post("/projects", response_model=Project, status_code=201)
+def create_project(data: ProjectCreate, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    check_name_free(session, Project, data.name, current_user)
+    project = Project(owner_id=current_user.id, name=data.name)
+    session.add(project)
+    session.commit()
+    session.refresh(project)
+    return project
+
+@app.put("/projects/{project_id}", response_model=Project)
+def rename_project(project_id: int, data: ProjectCreate, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    project = get_owned(session, Project, project_id, current_user)
+    if data.name != project.name:
+        check_name_free(session, Project, data.name, current_user)
+    project.name = data.name
+    session.add(project)
+    session.commit()
+    session.refresh(project)
+    return project
+
+@app.delete("/projects/{project_id}", status_code=204)
+def delete_project_endpoint(project_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Delete project; its tasks are kept without a project"""
+    delete_project(session, get_owned(session, Project, project_id, current_user))
+    session.commit()
+    return None
+
+@app.get("/tags", response_model=List[Tag])
+def get_tags(current_user: User = Depends(get_current_user), session: Session = Depends(get_read_session)):
+    """Own tags with live task counts (maintained on write, no task scan)"""
+    return session.exec(select(Tag).where(Tag.owner_id == current_user.id).order_by(Tag.name)).all()
+
+@app.post("/tags", response_model=Tag, status_code=201)
+def create_tag(data: TagCreate, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    check_name_free(session, Tag, data.name, current_user)
+    tag = Tag(owner_id=current_user.id, name=data.name)
+    session.add(tag)
+    session.commit()
+    session.refresh(tag)
+    return tag
+
+@app.put("/tags/{tag_id}", response_model=Tag)
+def rename_tag(tag_id: int, data: TagCreate, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    tag = get_owned(session, Tag, tag_id, current_user)
+    if data.name != tag.name:
+        check_name_free(session, Tag, data.name, current_user)
+    tag.name = data.name
+    session.add(tag)
+    session.commit()
+    session.refresh(tag)
+    return tag
+
+@app.delete("/tags/{tag_id}", status_code=204)
+def delete_tag_endpoint(tag_id: int, current_user: User = Depends(get_current_user), session: Session = Depends(get_session)):
+    """Delete tag; removed from all tasks"""
+    delete_tag(session, get_owned(session, Tag, tag_id, current_user))
     session.commit()
     return None
 
@@ -119,17 +392,38 @@ def create_user_admin(data: UserCreate, admin: User = Depends(get_admin_user), s
     session.add(user)
     session.commit()
     session.refresh(user)
+    cache.delete(USERS_LIST_KEY)
+    audit.record(admin.id, "user.create", "user", user.id, username=user.username)
     return user
 
 @app.get("/admin/users", response_model=List[UserRead])
-def get_all_users(admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
-    users = session.exec(select(User)).all()
-    return users
+def get_all_users(admin: User = Depends(get_admin_user), session: Session = Depends(get_read_session)):
+    users = cache.get(USERS_LIST_KEY)
+    if users is None:
+        users = rows_to_dicts(USER_FIELDS, session.exec(select_users()).all())
+        cache.set(USERS_LIST_KEY, users, USER_CACHE_TTL)
+    return ORJSONResponse(users)
 
 @app.get("/admin/tasks", response_model=List[Task])
-def get_all_tasks(admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
-    tasks = session.exec(select(Task)).all()
-    return tasks
+def get_all_tasks(fields: Optional[str] = None, summary: bool = False, with_owner: bool = False,
+                  owner: Optional[str] = None, sort: Optional[str] = None,
+                  limit: Optional[int] = Query(None, ge=1, le=1000), cursor: Optional[str] = None,
+                  admin: User = Depends(get_admin_user), session: Session = Depends(get_read_session)):
+    """
+    List all tasks; `with_owner=true` adds owner_username/owner_email (SQL join),
+    `owner=` filters by owner username, `sort=` a task field or owner (prefix - for
+    descending); `limit`/`cursor` page as in GET /tasks, otherwise the listing is streamed
+    """
+    names, columns = task_projection(fields, summary)
+    names, statement = admin_task_query(names, columns, with_owner, owner, sort, cursor)
+    return rows_response(session, statement, names, stream=True, limit=limit)
+
+@app.get("/admin/tasks/{task_id}", response_model=Task)
+def get_task_admin(task_id: int, admin: User = Depends(get_admin_user), session: Session = Depends(get_read_session)):
+    task = get_live_task(session, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
 
 @app.post("/admin/tasks", response_model=Task, status_code=201)
 def create_task_admin(data: TaskCreate, owner_id: int, admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
@@ -137,46 +431,71 @@ def create_task_admin(data: TaskCreate, owner_id: int, admin: User = Depends(get
     if not owner:
         raise HTTPException(status_code=404, detail="User not found")
     
-    task = Task(**data.dict(), owner_id=owner_id)
-    session.add(task)
+    task = add_task(session, data, owner_id)
     session.commit()
     session.refresh(task)
+    audit.record(admin.id, "task.create", "task", task.id, owner_id=owner_id)
     return task
 
 @app.put("/admin/tasks/{task_id}", response_model=Task)
 def update_task_admin(task_id: int, data: TaskUpdate, admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
-    task = session.get(Task, task_id)
+    task = get_live_task(session, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    for key, value in data.dict(exclude_unset=True).items():
-        setattr(task, key, value)
-    
-    session.add(task)
+    changes = apply_task_changes(session, task, data)
     session.commit()
     session.refresh(task)
+    audit.record(admin.id, "task.update", "task", task.id, owner_id=task.owner_id, fields=sorted(changes))
     return task
 
 @app.delete("/admin/tasks/{task_id}", status_code=204)
 def delete_task_admin(task_id: int, admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
-    task = session.get(Task, task_id)
+    task = get_live_task(session, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    session.delete(task)
+    task.deleted_at = utcnow()
+    session.add(task)
+    task_live_changed(session, task, -1)
     session.commit()
+    audit.record(admin.id, "task.delete", "task", task_id, owner_id=task.owner_id)
     return None
 
+@app.post("/admin/tasks/{task_id}/restore", response_model=Task)
+def restore_task_admin(task_id: int, admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
+    task = session.get(Task, task_id)
+    if not task or task.deleted_at is None:
+        raise HTTPException(status_code=404, detail="Deleted task not found")
+    
+    task.deleted_at = None
+    session.add(task)
+    task_live_changed(session, task, 1)
+    session.commit()
+    session.refresh(task)
+    audit.record(admin.id, "task.restore", "task", task.id, owner_id=task.owner_id)
+    return task
+
 @app.delete("/admin/users/{user_id}", status_code=204)
-def delete_user(user_id: int, admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
+def delete_user(user_id: int, background: bool = False,
+                admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
+    """Delete user with all their tasks; `background=true` enqueues a chunked purge job (202 + job)"""
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if user.id == admin.id:
         raise HTTPException(status_code=400, detail="Cannot delete yourself")
     
-    session.delete(user)
+    if background:
+        job = job_queue.submit("purge_user", {"user_id": user.id}, created_by=admin.id)
+        audit.record(admin.id, "user.delete", "user", user.id, username=user.username, job_id=job["id"])
+        return ORJSONResponse(job_summary(job), status_code=202)
+    
+    username = user.username
+    delete_user_cascade(session, user)
     session.commit()
+    invalidate_user(username)
+    audit.record(admin.id, "user.delete", "user", user_id, username=username)
     return None
 
 @app.put("/admin/users/{user_id}/make-admin", response_model=UserRead)
@@ -189,4 +508,110 @@ def make_admin(user_id: int, admin: User = Depends(get_admin_user), session: Ses
     session.add(user)
     session.commit()
     session.refresh(user)
+    invalidate_user(user.username)
+    audit.record(admin.id, "user.make_admin", "user", user.id, username=user.username)
     return user
+
+@app.get("/admin/audit")
+def get_audit_events(since: Optional[datetime] = None, until: Optional[datetime] = None,
+                     action: Optional[str] = None, actor_id: Optional[int] = None,
+                     cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000),
+                     admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
+    """
+    Audit events, newest first, within [since, until) (naive UTC). Pass the
+    returned `next_cursor` as `cursor` for the next (older) page.
+    Only the "db" sink can be queried; the NDJSON file is for log shippers.
+    """
+    if AUDIT_SINK != "db":
+        raise HTTPException(status_code=501, detail=f"Audit events are not queryable with API_AUDIT_SINK={AUDIT_SINK}")
+    audit.flush()
+    statement = select(AuditEvent)
+    if since:
+        statement = statement.where(AuditEvent.ts >= naive_utc(since))
+    if until:
+        statement = statement.where(AuditEvent.ts < naive_utc(until))
+    if action:
+        statement = statement.where(AuditEvent.action == action)
+    if actor_id is not None:
+        statement = statement.where(AuditEvent.actor_id == actor_id)
+    if cursor:
+        try:
+            cursor_ts, cursor_id = parse_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        statement = statement.where(tuple_(AuditEvent.ts, AuditEvent.id) < tuple_(cursor_ts, cursor_id))
+    events = session.exec(statement.order_by(AuditEvent.ts.desc(), AuditEvent.id.desc()).limit(limit)).all()
+    return ORJSONResponse({
+        "events": [event_dict(event) for event in events],
+        "next_cursor": make_cursor(events[-1]) if len(events) == limit else None
+    })
+
+# ---------------- JOBS ----------------
+@app.post("/admin/jobs/import-tasks", status_code=202)
+def enqueue_import_tasks(data: TaskImport, admin: User = Depends(get_admin_user), session: Session = Depends(get_session)):
+    """Import many tasks for one user in the background; projects and tags must be the user's"""
+    unknown = {
+        "projects": missing_owned(session, Project, data.owner_id, (t.project_id for t in data.tasks if t.project_id is not None)),
+        "tags": missing_owned(session, Tag, data.owner_id, (tag_id for t in data.tasks for tag_id in t.tag_ids))
+    }
+    if unknown["projects"] or unknown["tags"]:
+        raise HTTPException(status_code=400, detail={"unknown": unknown})
+    params = {"owner_id": data.owner_id, "tasks": [task.dict() for task in data.tasks]}
+    job = job_queue.submit("import_tasks", params, created_by=admin.id)
+    audit.record(admin.id, "job.import_tasks", "user", data.owner_id, job_id=job["id"], tasks=len(data.tasks))
+    return ORJSONResponse(job_summary(job), status_code=202)
+
+@app.post("/admin/jobs/export-tasks", status_code=202)
+def enqueue_export_tasks(owner_id: Optional[int] = None, admin: User = Depends(get_admin_user)):
+    """Export live tasks (optionally of one user) as JSON lines; download via GET /jobs/{id}/download"""
+    job = job_queue.submit("export_tasks", {"owner_id": owner_id}, created_by=admin.id)
+    audit.record(admin.id, "job.export_tasks", "user" if owner_id is not None else None, owner_id, job_id=job["id"])
+    return ORJSONResponse(job_summary(job), status_code=202)
+
+@app.post("/admin/jobs/compact", status_code=202)
+def enqueue_compact(admin: User = Depends(get_admin_user)):
+    """Purge old soft-deleted tasks and release free pages now"""
+    job = job_queue.submit("compact", {}, created_by=admin.id)
+    audit.record(admin.id, "job.compact", job_id=job["id"])
+    return ORJSONResponse(job_summary(job), status_code=202)
+
+def get_visible_job(job_id: str, current_user: User) -> dict:
+    job = job_queue.get(job_id)
+    if not job or not (current_user.is_admin or job["created_by"] == current_user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """Job status, progress (0..1) and result"""
+    return ORJSONResponse(job_summary(get_visible_job(job_id, current_user)))
+
+@app.post("/jobs/{job_id}/cancel")
+def cancel_job(job_id: str, current_user: User = Depends(get_current_user)):
+    """Cancel a queued job, or ask a running one to stop at its next checkpoint"""
+    get_visible_job(job_id, current_user)
+    return ORJSONResponse(job_summary(job_queue.cancel(job_id)))
+
+@app.get("/jobs/{job_id}/download")
+def download_job_result(job_id: str, current_user: User = Depends(get_current_user)):
+    job = get_visible_job(job_id, current_user)
+    if job["kind"] != "export_tasks" or job["status"] != SUCCEEDED:
+        raise HTTPException(status_code=404, detail="No export available")
+    return FileResponse(job_handlers.export_path(job_id), media_type="application/x-ndjson", filename=job["result"]["file"])
+
+# ---------------- DEBUG ----------------
+def require_sql_profiler():
+    if not SQL_PROFILE_ENABLED:
+        raise HTTPException(status_code=404, detail="SQL profiler disabled")
+
+@app.get("/debug/sql-profiles", include_in_schema=False, dependencies=[Depends(require_sql_profiler)])
+def list_sql_profiles(limit: int = 20, admin: User = Depends(get_admin_user)):
+    """Recent request SQL profiles (newest first)"""
+    return profiler.recent_profiles(limit)
+
+@app.get("/debug/sql-profiles/{request_id}", include_in_schema=False, dependencies=[Depends(require_sql_profiler)])
+def get_sql_profile(request_id: int, admin: User = Depends(get_admin_user)):
+    profile = profiler.get_profile(request_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
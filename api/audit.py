@@ -0,0 +1,173 @@
+"""
+Audit log of admin actions.
+
+record() only appends to an in-memory buffer; a background thread
+flushes the buffer in batches (one INSERT per batch) to the append-only
+`audit_event` table, or to a size-rotated NDJSON file. The buffer is
+bounded: when it is full new events are dropped and counted in
+`audit_events_dropped_total`. Pending events are flushed on shutdown.
+"""
+import atexit
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
+import orjson
+
+from .metrics import Counter
+from .models import AuditEvent, utcnow
+
+logger = logging.getLogger("api.audit")
+
+AUDIT_DROPPED = Counter("audit_events_dropped_total", "Audit events dropped because the buffer was full")
+
+class DatabaseSink:
+    """Bulk insert into audit_event"""
+
+    def __init__(self, engine):
+        self.engine = engine
+
+    def write(self, events: list):
+        with self.engine.begin() as conn:
+            conn.execute(AuditEvent.__table__.insert(), events)
+
+class NDJSONSink:
+    """Append JSON lines to a file rotated at max_bytes (path, path.1 ... path.<backups>)"""
+
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def write(self, events: list):
+        data = b"".join(orjson.dumps(event) + b"\n" for event in events)
+        if os.path.exists(self.path) and os.path.getsize(self.path) + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "ab") as f:
+            f.write(data)
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{i}"):
+                os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+        if self.backups:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+class AuditLog:
+    """Buffered, batched audit writer"""
+
+    def __init__(self, sink, batch_size: int = 500, flush_interval: float = 1.0, max_buffer: int = 10_000):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def record(self, actor_id: Optional[int], action: str, target_type: str = None,
+               target_id: int = None, **details):
+        """Queue one event (never blocks on I/O)"""
+        if self.sink is None:
+            return
+        event = {
+            "ts": utcnow(),
+            "actor_id": actor_id,
+            "action": action,
+            "target_type": target_type,
+            "target_id": target_id,
+            "details": orjson.dumps(details).decode() if details else None
+        }
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                AUDIT_DROPPED.inc()
+                return
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all buffered events now"""
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._buffer[:self.batch_size]
+                    del self._buffer[:self.batch_size]
+                if not batch:
+                    return
+                try:
+                    self.sink.write(batch)
+                except Exception:
+                    logger.exception("Audit flush failed; re-queueing %s events", len(batch))
+                    with self._lock:
+                        keep = max(self.max_buffer - len(self._buffer), 0)
+                        if keep < len(batch):
+                            AUDIT_DROPPED.inc(amount=len(batch) - keep)
+                        self._buffer[:0] = batch[:keep]
+                    return
+
+    def start(self):
+        if self.sink is None or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="audit-flusher", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Stop the flusher and write what is left (shutdown hook)"""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+        if self.sink is not None:
+            self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+def create_sink(kind: str, engine, path: str, max_bytes: int, backups: int):
+    """Sink for "db", "file" or "off" (None: record() is a no-op)"""
+    if kind == "db":
+        return DatabaseSink(engine)
+    if kind == "file":
+        return NDJSONSink(path, max_bytes, backups)
+    if kind == "off":
+        return None
+    raise ValueError(f"Unknown audit sink: {kind}")
+
+def event_dict(event) -> dict:
+    return {
+        "id": event.id,
+        "ts": event.ts.isoformat(),
+        "actor_id": event.actor_id,
+        "action": event.action,
+        "target_type": event.target_type,
+        "target_id": event.target_id,
+        "details": orjson.loads(event.details) if event.details else None
+    }
+
+def naive_utc(value: datetime) -> datetime:
+    """Query bounds: aware datetimes are converted to the stored naive UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def parse_cursor(cursor: str) -> tuple:
+    """Pagination cursor "<iso ts>,<id>" -> (datetime, id)"""
+    ts, _, event_id = cursor.rpartition(",")
+    return datetime.fromisoformat(ts), int(event_id)
+
+def make_cursor(event) -> str:
+    return f"{event.ts.isoformat()},{event.id}"
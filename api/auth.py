@@ -3,32 +3,147 @@ from typing import Optional
 from jose import jwt, JWTError
 import bcrypt
 import hashlib
+import uuid
+from .config import PASSWORD_HASH_SCHEME, BCRYPT_ROUNDS, ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM
+from .metrics import PASSWORD_HASH_DURATION
+
+try:
+    from argon2 import PasswordHasher, Type
+    from argon2.exceptions import VerificationError, InvalidHashError
+except ImportError:  # optional: only needed for argon2id hashes
+    PasswordHasher = None
 
 SECRET_KEY = "super-secret-change-me"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
+# Refresh tokens get new access tokens without the password (bcrypt) check;
+# single use: each refresh rotates it (see tokens.py)
+REFRESH_TOKEN_EXPIRE_DAYS = 30
 
 def _prepare_password(password: str) -> bytes:
     return hashlib.sha256(password.encode('utf-8')).hexdigest().encode('utf-8')
 
+class BcryptHasher:
+    """bcrypt of the SHA-256 hex digest (no 72-byte limit); "$2b$<rounds>$..." """
+
+    scheme = "bcrypt"
+
+    def __init__(self, rounds: int = 12):
+        self.rounds = rounds
+
+    @staticmethod
+    def identify(hashed: str) -> bool:
+        return hashed.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def hash(self, password: str) -> str:
+        return bcrypt.hashpw(_prepare_password(password), bcrypt.gensalt(self.rounds)).decode('utf-8')
+
+    @staticmethod
+    def verify(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(_prepare_password(password), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return int(hashed.split("$")[2]) != self.rounds
+
+class Argon2Hasher:
+    """argon2id of the password; "$argon2id$v=19$m=<KiB>,t=<passes>,p=<lanes>$..." """
+
+    scheme = "argon2id"
+
+    def __init__(self, time_cost: int = 3, memory_cost: int = 65536, parallelism: int = 4):
+        if PasswordHasher is None:
+            raise RuntimeError("argon2id password hashing needs the argon2-cffi package")
+        self._hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism, type=Type.ID)
+
+    @staticmethod
+    def identify(hashed: str) -> bool:
+        return hashed.startswith("$argon2id$")
+
+    def hash(self, password: str) -> str:
+        return self._hasher.hash(password)
+
+    @staticmethod
+    def verify(password: str, hashed: str) -> bool:
+        # Parameters are read from the hash, so any settings verify any argon2id hash
+        if PasswordHasher is None:
+            raise RuntimeError("argon2id password hashing needs the argon2-cffi package")
+        try:
+            return PasswordHasher().verify(hashed, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        return self._hasher.check_needs_rehash(hashed)
+
+HASHERS = (BcryptHasher, Argon2Hasher)
+
+def create_hasher(scheme: str):
+    """Hasher for new passwords from configuration"""
+    if scheme == "bcrypt":
+        return BcryptHasher(BCRYPT_ROUNDS)
+    if scheme == "argon2id":
+        return Argon2Hasher(ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM)
+    raise ValueError(f"Unknown password hash scheme: {scheme}")
+
+hasher = create_hasher(PASSWORD_HASH_SCHEME)
+
 def hash_password(password: str) -> str:
-    """SHA256"""
-    prepared = _prepare_password(password)
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(prepared, salt)
-    return hashed.decode('utf-8')
+    """Hash with the configured scheme and cost"""
+    with PASSWORD_HASH_DURATION.time("hash"):
+        return hasher.hash(password)
 
 def verify_password(plain: str, hashed: str) -> bool:
-    prepared = _prepare_password(plain)
-    return bcrypt.checkpw(prepared, hashed.encode('utf-8'))
+    """Check against a hash of any supported scheme, using the cost stored in it"""
+    for candidate in HASHERS:
+        if candidate.identify(hashed):
+            with PASSWORD_HASH_DURATION.time("verify"):
+                return candidate.verify(plain, hashed)
+    return False
+
+def needs_rehash(hashed: str) -> bool:
+    """True if the hash was made with another scheme or cost than configured"""
+    return not hasher.identify(hashed) or hasher.needs_rehash(hashed)
 
 def create_access_token(sub: str, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES) -> str:
     to_encode = {"sub": sub, "exp": datetime.utcnow() + timedelta(minutes=expires_minutes)}
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def create_refresh_token(user_id: int, family: Optional[str] = None, expires_days: int = REFRESH_TOKEN_EXPIRE_DAYS) -> str:
+    """
+    Refresh token for a user id (usernames can be registered again after a
+    delete): `jti` identifies this token, `fam` the login session it was
+    rotated from (a new one when omitted).
+    """
+    now = datetime.utcnow()
+    to_encode = {
+        "sub": str(user_id),
+        "type": "refresh",
+        "jti": uuid.uuid4().hex,
+        "fam": family or uuid.uuid4().hex,
+        "iat": now,
+        "exp": now + timedelta(days=expires_days)
+    }
+    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+
+def decode_refresh_token(token: str) -> Optional[dict]:
+    """Claims of a valid, unexpired refresh token (revocation is checked by the caller)"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    if payload.get("type") != "refresh" or not payload.get("jti") or not payload.get("fam"):
+        return None
+    if not str(payload.get("sub", "")).isdigit() or not isinstance(payload.get("iat"), int):
+        # Issued before refresh tokens carried the user id
+        return None
+    return payload
+
 def decode_token(token: str) -> Optional[str]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
     except JWTError:
         return None
+    if payload.get("type") == "refresh":
+        # Refresh tokens only work on /auth/refresh
+        return None
+    return payload.get("sub")
@@ -0,0 +1,187 @@
+"""
+Pluggable cache backends.
+
+- "memory": in-process LRU dict; correct only with a single worker.
+- "sqlite": shared SQLite file (WAL) visible to all workers on one host.
+- "redis": Redis or any Redis-compatible server (needs the `redis` package).
+
+Values must be JSON-serializable so every backend can store them. Writes
+and deletes go straight to the shared store, so an invalidation made by
+one worker is seen by all others on their next read. incr() is an atomic
+counter (rate limiting); counter keys are only read through incr().
+"""
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import orjson
+from .config import CACHE_BACKEND, CACHE_URL
+
+class MemoryCache:
+    """In-process LRU cache with per-key TTL"""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Add 1 to a counter that expires ttl seconds after its first increment"""
+        now = time.monotonic()
+        with self._lock:
+            value, expires = self._data.get(key, (0, now + ttl))
+            if expires < now:
+                value, expires = 0, now + ttl
+            self._data[key] = (value + 1, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return value + 1
+
+    def delete(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+class SQLiteCache:
+    """Cache shared by processes on one host through a SQLite file in WAL mode"""
+
+    PURGE_PROBABILITY = 0.001
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._conn().execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return orjson.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float):
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (key, orjson.dumps(value), time.time() + ttl)
+        )
+        self._maybe_purge(conn)
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Add 1 to a counter that expires ttl seconds after its first increment (one atomic statement)"""
+        now = time.time()
+        conn = self._conn()
+        value = conn.execute("""
+            INSERT INTO cache (key, value, expires) VALUES (:key, 1, :expires)
+            ON CONFLICT (key) DO UPDATE SET
+                value = CASE WHEN expires < :now THEN 1 ELSE CAST(value AS INTEGER) + 1 END,
+                expires = CASE WHEN expires < :now THEN excluded.expires ELSE expires END
+            RETURNING value
+        """, {"key": key, "expires": now + ttl, "now": now}).fetchone()[0]
+        self._maybe_purge(conn)
+        return value
+
+    def _maybe_purge(self, conn: sqlite3.Connection):
+        if random.random() < self.PURGE_PROBABILITY:
+            conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+
+    def delete(self, *keys: str):
+        if keys:
+            placeholders = ",".join("?" * len(keys))
+            self._conn().execute(f"DELETE FROM cache WHERE key IN ({placeholders})", keys)
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache")
+
+class RedisCache:
+    """Cache on a Redis-compatible server"""
+
+    def __init__(self, url: str, prefix: str = "taskmanager:"):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.client.get(self.prefix + key)
+        return orjson.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Any, ttl: float):
+        self.client.set(self.prefix + key, orjson.dumps(value), px=max(int(ttl * 1000), 1))
+
+    def incr(self, key: str, ttl: float) -> int:
+        """Add 1 to a counter that expires ttl seconds after its first increment"""
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, 0, nx=True, px=max(int(ttl * 1000), 1))
+        pipe.incr(self.prefix + key)
+        return pipe.execute()[1]
+
+    def delete(self, *keys: str):
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+def create_cache(backend: str, url: str = ""):
+    """Build cache backend from configuration"""
+    if backend == "memory":
+        return MemoryCache()
+    if backend == "sqlite":
+        return SQLiteCache(url or "cache.db")
+    if backend == "redis":
+        return RedisCache(url or "redis://localhost:6379/0")
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+cache = create_cache(CACHE_BACKEND, CACHE_URL)
+
+# ---- keys ----
+USERS_LIST_KEY = "admin:users"
+
+def user_key(username: str) -> str:
+    return f"user:{username}"
+
+def rebalance_key(owner_id: int) -> str:
+    """Set while a position rebalance job for the owner is pending"""
+    return f"rebalance:{owner_id}"
+
+def invalidate_user(username: str):
+    """Drop cached user (auth lookup) and the admin user listing in every worker"""
+    cache.delete(user_key(username), USERS_LIST_KEY)
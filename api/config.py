@@ -0,0 +1,106 @@
+import os
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def _env_rate(name: str, default: str) -> tuple:
+    """Parse "rate,burst" (requests per second, burst)"""
+    rate, _, burst = os.getenv(name, default).partition(",")
+    return float(rate), float(burst or rate)
+
+# Database
+DATABASE_URL = os.getenv("API_DATABASE_URL", "sqlite:///tasks.db")
+# Optional read replica for read-only routes (SQLite: same WAL file opened read-only,
+# e.g. sqlite:///file:tasks.db?mode=ro&uri=true); empty = everything on the primary
+DATABASE_READ_URL = os.getenv("API_DATABASE_READ_URL", "")
+# After a user's own write their reads go to the primary for this long (replica lag bound)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("API_READ_YOUR_WRITES_SECONDS", "5"))
+# Connection pool (server databases such as PostgreSQL; per worker process)
+DB_POOL_SIZE = int(os.getenv("API_DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("API_DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("API_DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("API_DB_POOL_RECYCLE", "1800"))
+# Rows fetched per round trip when large listings stream from a server-side cursor
+DB_STREAM_BATCH = int(os.getenv("API_DB_STREAM_BATCH", "2000"))
+
+# Response compression: encodings in order of preference ("off" disables)
+COMPRESSION_ENCODINGS = [e.strip() for e in os.getenv("API_COMPRESSION", "br,gzip").split(",") if e.strip() and e.strip() != "off"]
+COMPRESSION_MIN_SIZE = int(os.getenv("API_COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("API_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("API_BROTLI_QUALITY", "4"))
+
+# Metrics: /metrics endpoint, request middleware and SQL/bcrypt timings
+METRICS_ENABLED = _env_bool("API_METRICS", True)
+
+# SQL profiler (opt-in): per-request statement log, N+1 detection, /debug/sql-profiles
+SQL_PROFILE_ENABLED = _env_bool("API_SQL_PROFILE", False)
+SQL_PROFILE_HISTORY = int(os.getenv("API_SQL_PROFILE_HISTORY", "200"))
+SQL_PROFILE_REPEAT_THRESHOLD = int(os.getenv("API_SQL_PROFILE_REPEAT_THRESHOLD", "2"))
+
+# Readiness probe (/health/ready): DB check timeout, result cache, tolerated threadpool backlog
+HEALTH_DB_TIMEOUT = float(os.getenv("API_HEALTH_DB_TIMEOUT", "1.0"))
+HEALTH_CACHE_SECONDS = float(os.getenv("API_HEALTH_CACHE_SECONDS", "2.0"))
+HEALTH_MAX_WAITING = int(os.getenv("API_HEALTH_MAX_WAITING", "20"))
+
+# Password hashing: "bcrypt" or "argon2id" (needs argon2-cffi) and its cost. Parameters are
+# stored in each hash; a hash made with other settings is redone on the user's next login
+PASSWORD_HASH_SCHEME = os.getenv("API_PASSWORD_HASH", "bcrypt")
+BCRYPT_ROUNDS = int(os.getenv("API_BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("API_ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST = int(os.getenv("API_ARGON2_MEMORY_COST", "65536"))  # KiB
+ARGON2_PARALLELISM = int(os.getenv("API_ARGON2_PARALLELISM", "4"))
+
+# Cache backend: "memory" (single worker), "sqlite" (shared file, multi-worker on one host) or "redis"
+CACHE_BACKEND = os.getenv("API_CACHE_BACKEND", "memory")
+CACHE_URL = os.getenv("API_CACHE_URL", "")
+USER_CACHE_TTL = float(os.getenv("API_USER_CACHE_TTL", "60"))
+
+# Rate limiting per route class and user (bearer token), login username + client IP, or client IP:
+# "rate/s,burst" = burst requests per burst/rate seconds; rate 0 = unlimited. Counted in the
+# cache backend, so limits are per deployment with a shared (sqlite/redis) cache
+RATE_LIMIT_ENABLED = _env_bool("API_RATE_LIMIT", True)
+RATE_LIMITS = {
+    "read": _env_rate("API_RATE_LIMIT_READ", "20,40"),
+    "write": _env_rate("API_RATE_LIMIT_WRITE", "5,20"),
+    "login": _env_rate("API_RATE_LIMIT_LOGIN", "0.2,5"),
+    # All logins from one client IP, whatever the username (shared NATs need headroom)
+    "login_ip": _env_rate("API_RATE_LIMIT_LOGIN_IP", "1,30"),
+}
+# Admission control: requests served concurrently per worker (0 = off), max wait for a slot
+MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "64"))
+ADMISSION_TIMEOUT = float(os.getenv("API_ADMISSION_TIMEOUT", "0.5"))
+
+# Background user purge (DELETE /admin/users/{id}?background=true): tasks deleted per transaction, pause between chunks
+USER_PURGE_CHUNK = int(os.getenv("API_USER_PURGE_CHUNK", "5000"))
+USER_PURGE_PAUSE = float(os.getenv("API_USER_PURGE_PAUSE", "0.05"))
+
+# Soft-delete compaction: purge tombstones older than the retention when the worker is idle
+COMPACTION_ENABLED = _env_bool("API_COMPACTION", True)
+COMPACTION_INTERVAL = float(os.getenv("API_COMPACTION_INTERVAL", "3600"))
+COMPACTION_IDLE_SECONDS = float(os.getenv("API_COMPACTION_IDLE_SECONDS", "30"))
+TOMBSTONE_RETENTION_DAYS = float(os.getenv("API_TOMBSTONE_RETENTION_DAYS", "7"))
+COMPACTION_BATCH = int(os.getenv("API_COMPACTION_BATCH", "5000"))
+VACUUM_PAGES = int(os.getenv("API_VACUUM_PAGES", "2000"))
+
+# Manual task order: owner's positions are renumbered in the background once a gap between neighbours is narrower than this
+POSITION_MIN_GAP = float(os.getenv("API_POSITION_MIN_GAP", "1e-6"))
+
+# Background jobs: "memory" (lost on restart) or "sqlite" (durable, shared by worker processes)
+JOBS_BACKEND = os.getenv("API_JOBS_BACKEND", "memory")
+JOBS_DB_PATH = os.getenv("API_JOBS_DB", "jobs.db")
+JOB_WORKERS = int(os.getenv("API_JOB_WORKERS", "2"))
+# A running job whose process has not heartbeated for this many seconds is queued again
+JOB_LEASE_SECONDS = float(os.getenv("API_JOB_LEASE_SECONDS", "60"))
+EXPORT_DIR = os.getenv("API_EXPORT_DIR", "exports")
+
+# Audit log of admin actions: "db" (audit_event table), "file" (rotated NDJSON) or "off"
+AUDIT_SINK = os.getenv("API_AUDIT_SINK", "db")
+AUDIT_FILE = os.getenv("API_AUDIT_FILE", "audit.ndjson")
+AUDIT_FILE_MAX_BYTES = int(os.getenv("API_AUDIT_FILE_MAX_BYTES", str(50 * 1024 * 1024)))
+AUDIT_FILE_BACKUPS = int(os.getenv("API_AUDIT_FILE_BACKUPS", "5"))
+AUDIT_BATCH = int(os.getenv("API_AUDIT_BATCH", "500"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("API_AUDIT_FLUSH_INTERVAL", "1.0"))
+AUDIT_MAX_BUFFER = int(os.getenv("API_AUDIT_MAX_BUFFER", "10000"))
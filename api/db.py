@@ -1,10 +1,112 @@
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlmodel import SQLModel, create_engine, Session
+from .config import (
+    DATABASE_URL, DATABASE_READ_URL, READ_YOUR_WRITES_SECONDS,
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    METRICS_ENABLED, SQL_PROFILE_ENABLED
+)
+from .cache import cache
+from . import metrics, profiler
+from .migrations import is_fresh, run_migrations
 
-engine = create_engine("sqlite:///tasks.db", echo=False)
+def engine_options(url: str):
+    """Resolve database URL and create_engine() options for its backend"""
+    url = make_url(url)
+    if url.get_backend_name() != "postgresql":
+        return url, {}
+    if url.drivername == "postgresql":
+        # Bare postgresql:// means psycopg2 to SQLAlchemy; we ship psycopg 3
+        url = url.set(drivername="postgresql+psycopg")
+    return url, {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        # Replace connections dropped by server restarts / idle timeouts before use
+        "pool_pre_ping": True
+    }
+
+def _create_engine(database_url: str):
+    url, options = engine_options(database_url)
+    new_engine = create_engine(url, echo=False, **options)
+    if new_engine.dialect.name == "sqlite":
+        # SQLite ignores FOREIGN KEY constraints unless enabled per connection
+        @event.listens_for(new_engine, "connect")
+        def _enable_foreign_keys(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+    if METRICS_ENABLED:
+        metrics.instrument_engine(new_engine)
+    if SQL_PROFILE_ENABLED:
+        profiler.instrument_engine(new_engine)
+    return new_engine
+
+engine = _create_engine(DATABASE_URL)
+# Replica for read-only routes; the primary itself when none is configured
+read_engine = _create_engine(DATABASE_READ_URL) if DATABASE_READ_URL else engine
+if SQL_PROFILE_ENABLED:
+    profiler.instrument_sessions(Session)
 
 def init_db():
+    fresh = is_fresh(engine)
+    if fresh and engine.dialect.name == "sqlite":
+        # Lets compaction return freed pages with incremental VACUUM; only
+        # takes effect before the first table is created (else needs full VACUUM)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
     SQLModel.metadata.create_all(engine)
+    run_migrations(engine, fresh)
+    if read_engine is not engine and engine.dialect.name == "sqlite":
+        # Readers on a second pool must not block (or be blocked by) the writer
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+# ---- read-your-writes ----
+# get_current_user (or a background job, for the user whose rows it changes)
+# stores the user id in session.info; a commit that wrote rows pins that
+# user's reads to the primary (shared cache, so all workers agree).
+# ORM flushes and ORM-enabled INSERT/UPDATE/DELETE are detected; Core
+# statements run on session.connection() must call mark_written().
+
+def _primary_key(user_id: int) -> str:
+    return f"primary:{user_id}"
+
+def mark_written(session):
+    session.info["wrote"] = True
+
+@event.listens_for(Session, "after_flush")
+def _mark_dirty(session, flush_context):
+    mark_written(session)
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dirty_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_written(orm_execute_state.session)
+
+@event.listens_for(Session, "after_commit")
+def _record_write(session):
+    user_id = session.info.get("user_id")
+    if session.info.pop("wrote", False) and user_id is not None and read_engine is not engine:
+        cache.set(_primary_key(user_id), True, READ_YOUR_WRITES_SECONDS)
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+def get_read_session(request: Request):
+    """
+    Session on the read replica for read-only routes.
+
+    Must be declared after the auth dependency (which sets request.state.user_id);
+    unknown users and users who wrote within READ_YOUR_WRITES_SECONDS use the primary.
+    """
+    bind = read_engine
+    if read_engine is not engine:
+        user_id = getattr(request.state, "user_id", None)
+        if user_id is None or cache.get(_primary_key(user_id)):
+            bind = engine
+    with Session(bind) as session:
+        yield session
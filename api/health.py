@@ -0,0 +1,95 @@
+"""
+Liveness and readiness checks.
+
+Readiness probes the database with a bounded timeout on a dedicated
+thread (so a saturated request threadpool cannot block the probe) and
+reports pool saturation, schema version and worker-pool backlog. Results
+are cached for a short interval so frequent probes add no load.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from .db import engine, read_engine
+from .migrations import current_version, latest_version
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health")
+_cache = {"result": None, "expires": 0.0}
+_lock = asyncio.Lock()
+
+def _check_database(bind=engine) -> dict:
+    start = time.perf_counter()
+    with bind.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        version = current_version(conn)
+    return {
+        "ok": True,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        "schema_version": version,
+        "schema_expected": latest_version()
+    }
+
+def pool_status() -> dict:
+    pool = engine.pool
+    if not hasattr(pool, "size"):
+        return {"ok": True, "type": type(pool).__name__}
+    capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "ok": saturation < 1.0,
+        "type": type(pool).__name__,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturation": round(saturation, 3)
+    }
+
+def worker_pool_status(max_waiting: int) -> dict:
+    """Request threadpool (anyio default limiter used for sync endpoints)"""
+    import anyio.to_thread
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    stats = limiter.statistics()
+    waiting = stats.tasks_waiting
+    return {
+        "ok": waiting <= max_waiting,
+        "busy": stats.borrowed_tokens,
+        "capacity": stats.total_tokens,
+        "waiting": waiting
+    }
+
+async def _probe(bind, timeout: float) -> dict:
+    loop = asyncio.get_running_loop()
+    try:
+        database = await asyncio.wait_for(loop.run_in_executor(_executor, _check_database, bind), timeout)
+        if database["schema_version"] != database["schema_expected"]:
+            database["ok"] = False
+    except asyncio.TimeoutError:
+        database = {"ok": False, "error": f"timeout after {timeout}s"}
+    except Exception as e:
+        database = {"ok": False, "error": str(e)}
+    return database
+
+async def readiness(timeout: float, cache_seconds: float, max_waiting: int) -> dict:
+    """Run (or return cached) readiness checks"""
+    now = time.monotonic()
+    if _cache["result"] is not None and now < _cache["expires"]:
+        return _cache["result"]
+
+    async with _lock:
+        if _cache["result"] is not None and time.monotonic() < _cache["expires"]:
+            return _cache["result"]
+
+        checks = {
+            "database": await _probe(engine, timeout),
+            "pool": pool_status(),
+            "workers": worker_pool_status(max_waiting)
+        }
+        if read_engine is not engine:
+            checks["replica"] = await _probe(read_engine, timeout)
+        result = {
+            "status": "ok" if all(c["ok"] for c in checks.values()) else "unavailable",
+            "checks": checks
+        }
+        _cache["result"] = result
+        _cache["expires"] = time.monotonic() + cache_seconds
+        return result
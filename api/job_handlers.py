@@ -0,0 +1,140 @@
+"""Handlers for background jobs (see jobs.py)"""
+import os
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+from sqlmodel import Session, select, func
+
+from .cache import invalidate_user, cache, rebalance_key
+from .config import (
+    USER_PURGE_CHUNK, USER_PURGE_PAUSE, TOMBSTONE_RETENTION_DAYS, COMPACTION_BATCH,
+    VACUUM_PAGES, EXPORT_DIR, DB_STREAM_BATCH
+)
+from .db import engine, mark_written
+from .jobs import job_handler, JobCancelled
+from .maintenance import purge_user, compact
+from .ordering import last_position, rebalance_positions
+from .taxonomy import missing_owned, adjust_counts
+from .models import Task, User, Project, Tag, TaskTag
+from .serialization import TASK_FIELDS, TASK_COLUMNS
+
+IMPORT_BATCH = 1000
+
+def export_path(job_id: str) -> Path:
+    return Path(EXPORT_DIR) / f"tasks-{job_id}.jsonl"
+
+@job_handler("purge_user")
+def purge_user_job(ctx, user_id: int):
+    with Session(engine) as session:
+        total = session.exec(select(func.count()).select_from(Task).where(Task.owner_id == user_id)).one()
+    result = purge_user(
+        user_id, USER_PURGE_CHUNK, USER_PURGE_PAUSE, on_done=invalidate_user,
+        should_stop=lambda: ctx.cancelled,
+        on_progress=lambda deleted: ctx.progress(deleted, total, f"{deleted}/{total} tasks deleted")
+    )
+    if not result["user_deleted"] and ctx.cancelled:
+        raise JobCancelled()
+    return result
+
+@job_handler("compact")
+def compact_job(ctx):
+    return compact(TOMBSTONE_RETENTION_DAYS, COMPACTION_BATCH, VACUUM_PAGES, should_stop=lambda: ctx.cancelled)
+
+@job_handler("rebalance_positions")
+def rebalance_positions_job(ctx, owner_id: int):
+    """Renumber an owner's manual order so moves get wide gaps again"""
+    try:
+        with Session(engine) as session:
+            session.info["user_id"] = owner_id
+            count = rebalance_positions(session, owner_id)
+            session.commit()
+    finally:
+        cache.delete(rebalance_key(owner_id))
+    return {"tasks": count}
+
+@job_handler("export_tasks")
+def export_tasks_job(ctx, owner_id: int = None):
+    """Write live tasks (optionally of one owner) as JSON lines, streamed in batches"""
+    statement = select(*TASK_COLUMNS).where(Task.deleted_at.is_(None)).order_by(Task.id)
+    count = select(func.count()).select_from(Task).where(Task.deleted_at.is_(None))
+    if owner_id is not None:
+        statement = statement.where(Task.owner_id == owner_id)
+        count = count.where(Task.owner_id == owner_id)
+
+    path = export_path(ctx.job["id"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    try:
+        with engine.connect() as conn, open(path, "wb") as f:
+            total = conn.execute(count).scalar()
+            result = conn.execution_options(stream_results=True, yield_per=DB_STREAM_BATCH).execute(statement)
+            for batch in result.partitions():
+                ctx.check_cancelled()
+                f.write(b"".join(orjson.dumps(dict(zip(TASK_FIELDS, row))) + b"\n" for row in batch))
+                rows += len(batch)
+                ctx.progress(rows, total, f"{rows}/{total} tasks exported")
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return {"rows": rows, "file": path.name, "bytes": os.path.getsize(path)}
+
+def parse_datetime(value):
+    # Params of the sqlite job store went through JSON
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+def adjust_import_counts(session: Session, tasks: list):
+    """Count newly inserted live tasks into their projects and tags, one UPDATE per distinct increment"""
+    projects = Counter(t["project_id"] for t in tasks if t["project_id"] is not None)
+    tags = Counter(tag_id for t in tasks for tag_id in t["tag_ids"])
+    for project_id, count in projects.items():
+        adjust_counts(session, project_id, (), count)
+    by_count = defaultdict(list)
+    for tag_id, count in tags.items():
+        by_count[count].append(tag_id)
+    for count, tag_ids in by_count.items():
+        adjust_counts(session, None, tag_ids, count)
+
+@job_handler("import_tasks")
+def import_tasks_job(ctx, owner_id: int, tasks: list):
+    """
+    Insert tasks for one owner in batches (one transaction per batch), appended
+    to the manual order, with their project, tags and the maintained counts
+    """
+    tasks = [{**t, "project_id": t.get("project_id"), "tag_ids": list(dict.fromkeys(t.get("tag_ids") or ()))} for t in tasks]
+    with Session(engine) as session:
+        if session.get(User, owner_id) is None:
+            raise ValueError(f"User {owner_id} not found")
+        unknown_projects = missing_owned(session, Project, owner_id, (t["project_id"] for t in tasks if t["project_id"] is not None))
+        unknown_tags = missing_owned(session, Tag, owner_id, (tag_id for t in tasks for tag_id in t["tag_ids"]))
+        if unknown_projects or unknown_tags:
+            raise ValueError(f"Unknown projects {unknown_projects} / tags {unknown_tags} of user {owner_id}")
+        position = last_position(session, owner_id)
+
+    insert_tasks = Task.__table__.insert().returning(Task.__table__.c.id, sort_by_parameter_order=True)
+    inserted = 0
+    for first in range(0, len(tasks), IMPORT_BATCH):
+        ctx.check_cancelled()
+        chunk = tasks[first:first + IMPORT_BATCH]
+        batch = [
+            {"title": t["title"], "description": t.get("description"),
+             "completed": bool(t.get("completed")), "owner_id": owner_id,
+             "priority": t.get("priority") or 0, "due_at": parse_datetime(t.get("due_at")),
+             "project_id": t["project_id"], "position": position + n}
+            for n, t in enumerate(chunk, start=1)
+        ]
+        position += len(batch)
+        with Session(engine) as session:
+            session.info["user_id"] = owner_id
+            conn = session.connection()
+            task_ids = conn.execute(insert_tasks, batch).scalars().all()
+            links = [{"task_id": task_id, "tag_id": tag_id} for task_id, t in zip(task_ids, chunk) for tag_id in t["tag_ids"]]
+            if links:
+                conn.execute(TaskTag.__table__.insert(), links)
+            adjust_import_counts(session, chunk)
+            mark_written(session)
+            session.commit()
+        inserted += len(batch)
+        ctx.progress(inserted, len(tasks), f"{inserted}/{len(tasks)} tasks imported")
+    return {"inserted": inserted}
@@ -0,0 +1,344 @@
+"""
+Background job queue.
+
+Heavy admin operations are enqueued and run on worker threads instead of
+inside an HTTP request. Job state lives in a store:
+
+- "memory": in-process; jobs are lost on restart.
+- "sqlite": separate SQLite file; jobs survive restarts and every API
+  worker process pulls from the same queue.
+
+A claimed job records its owner (one id per JobQueue, i.e. per process)
+and a heartbeat the owner refreshes while the job runs. A job whose
+heartbeat is older than the lease belongs to a process that died and is
+queued again; jobs of live processes are never touched, so starting
+another worker or a rolling restart does not run them twice.
+
+Handlers are registered with @job_handler(kind) and receive a JobContext
+for progress reports and cooperative cancellation.
+"""
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Optional
+
+import orjson
+
+logger = logging.getLogger("api.jobs")
+
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+HANDLERS = {}
+
+def job_handler(kind: str):
+    """Register fn(ctx, **params) -> JSON-serializable result for a job kind"""
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+class JobCancelled(Exception):
+    pass
+
+def job_summary(job: dict) -> dict:
+    """Job as returned by the API (params can be large, e.g. imports)"""
+    return {key: value for key, value in job.items() if key != "params"}
+
+def new_job(kind: str, params: dict, created_by: Optional[int]) -> dict:
+    return {
+        "id": uuid.uuid4().hex,
+        "kind": kind,
+        "params": params,
+        "status": QUEUED,
+        "progress": 0.0,
+        "message": None,
+        "result": None,
+        "error": None,
+        "cancel_requested": False,
+        "created_by": created_by,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "owner": None,
+        "heartbeat_at": None
+    }
+
+class MemoryJobStore:
+    """Jobs in a dict; FIFO queue of ids"""
+
+    def __init__(self, max_finished: int = 1000):
+        self._jobs = {}
+        self._queue = deque()
+        self._finished = deque()
+        self._max_finished = max_finished
+        self._lock = threading.Lock()
+
+    def add(self, job: dict):
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._queue.append(job["id"])
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def claim_next(self, owner: str) -> Optional[dict]:
+        with self._lock:
+            while self._queue:
+                job = self._jobs.get(self._queue.popleft())
+                if job and job["status"] == QUEUED:
+                    now = time.time()
+                    job.update(status=RUNNING, started_at=now, owner=owner, heartbeat_at=now)
+                    return dict(job)
+        return None
+
+    def update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs[job_id]
+            job.update(fields)
+            if fields.get("status") in FINISHED:
+                self._track_finished(job_id)
+
+    def _track_finished(self, job_id: str):
+        # Keep memory bounded: forget the oldest finished jobs (caller holds the lock)
+        self._finished.append(job_id)
+        while len(self._finished) > self._max_finished:
+            self._jobs.pop(self._finished.popleft(), None)
+
+    def request_cancel(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["status"] == QUEUED:
+                job.update(status=CANCELLED, finished_at=time.time())
+                self._track_finished(job_id)
+            elif job["status"] == RUNNING:
+                job["cancel_requested"] = True
+            return dict(job)
+
+    def heartbeat(self, owner: str, job_ids: list):
+        pass
+
+    def requeue_expired(self, lease: float) -> int:
+        # Jobs die with the process that holds the store
+        return 0
+
+class SQLiteJobStore:
+    """Durable jobs table in its own SQLite file (WAL), shared by all worker processes"""
+
+    COLUMNS = tuple(new_job("", {}, None))
+    JSON_COLUMNS = ("params", "result")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, kind TEXT NOT NULL, params BLOB, status TEXT NOT NULL,
+                progress REAL, message TEXT, result BLOB, error TEXT, cancel_requested INTEGER,
+                created_by INTEGER, created_at REAL, started_at REAL, finished_at REAL,
+                owner TEXT, heartbeat_at REAL
+            )
+        """)
+        # Job files created before leases
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for name, type_ in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if name not in existing:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {type_}")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_queued ON jobs (created_at) WHERE status = 'queued'")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_running ON jobs (heartbeat_at) WHERE status = 'running'")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _encode(self, fields: dict) -> dict:
+        return {k: orjson.dumps(v) if k in self.JSON_COLUMNS else v for k, v in fields.items()}
+
+    def _decode(self, row) -> Optional[dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        for key in self.JSON_COLUMNS:
+            job[key] = orjson.loads(job[key]) if job[key] is not None else None
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def add(self, job: dict):
+        fields = self._encode(job)
+        placeholders = ", ".join(f":{name}" for name in self.COLUMNS)
+        self._conn().execute(f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({placeholders})", fields)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self._decode(self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def claim_next(self, owner: str) -> Optional[dict]:
+        # Atomic claim: only one process/thread wins the queued -> running transition
+        row = self._conn().execute("""
+            UPDATE jobs SET status = 'running', started_at = :now, owner = :owner, heartbeat_at = :now
+            WHERE id = (SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1)
+            RETURNING *
+        """, {"now": time.time(), "owner": owner}).fetchone()
+        return self._decode(row)
+
+    def update(self, job_id: str, **fields):
+        assignments = ", ".join(f"{name} = :{name}" for name in fields)
+        self._conn().execute(f"UPDATE jobs SET {assignments} WHERE id = :id", {**self._encode(fields), "id": job_id})
+
+    def request_cancel(self, job_id: str) -> Optional[dict]:
+        conn = self._conn()
+        conn.execute("UPDATE jobs SET status = 'cancelled', finished_at = ? WHERE id = ? AND status = 'queued'", (time.time(), job_id))
+        conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,))
+        return self.get(job_id)
+
+    def heartbeat(self, owner: str, job_ids: list):
+        """Extend the lease of the owner's running jobs"""
+        if job_ids:
+            placeholders = ", ".join("?" for _ in job_ids)
+            self._conn().execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running' AND id IN ({placeholders})",
+                (time.time(), owner, *job_ids)
+            )
+
+    def requeue_expired(self, lease: float) -> int:
+        """Jobs whose owner stopped heartbeating (crash, kill, shutdown) start over"""
+        return self._conn().execute("""
+            UPDATE jobs SET status = 'queued', started_at = NULL, progress = 0, owner = NULL, heartbeat_at = NULL
+            WHERE status = 'running' AND (heartbeat_at IS NULL OR heartbeat_at < ?)
+        """, (time.time() - lease,)).rowcount
+
+class JobContext:
+    """Handed to job handlers: progress reporting and cancellation checks"""
+
+    PROGRESS_INTERVAL = 0.5
+
+    def __init__(self, store, job: dict):
+        self.store = store
+        self.job = job
+        self._last_report = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        job = self.store.get(self.job["id"])
+        return job is None or job["cancel_requested"]
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled()
+
+    def progress(self, done: float, total: float = None, message: str = None):
+        """Report done/total (or a 0..1 fraction when total is None); throttled"""
+        now = time.monotonic()
+        if now - self._last_report < self.PROGRESS_INTERVAL:
+            return
+        self._last_report = now
+        fraction = done / total if total else done
+        self.store.update(self.job["id"], progress=round(min(max(fraction, 0.0), 1.0), 4), message=message)
+
+class JobQueue:
+    """Worker threads pulling jobs from a store"""
+
+    def __init__(self, store, workers: int = 2, poll_interval: float = 1.0, lease: float = 60.0):
+        self.store = store
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        self._running = set()
+        self._running_lock = threading.Lock()
+        self._wakeup = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self._requeue_expired()
+        threads = [threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True) for i in range(self.workers)]
+        threads.append(threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True))
+        for thread in threads:
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+
+    def submit(self, kind: str, params: dict, created_by: Optional[int] = None) -> dict:
+        if kind not in HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = new_job(kind, params, created_by)
+        self.store.add(job)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        return self.store.request_cancel(job_id)
+
+    def _requeue_expired(self):
+        requeued = self.store.requeue_expired(self.lease)
+        if requeued:
+            logger.info("Requeued %s interrupted jobs", requeued)
+
+    def _heartbeat(self):
+        """Keep this process's running jobs leased; recover jobs of dead processes"""
+        while not self._stop.wait(self.lease / 3):
+            try:
+                with self._running_lock:
+                    job_ids = list(self._running)
+                self.store.heartbeat(self.owner, job_ids)
+                self._requeue_expired()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    def _work(self):
+        while not self._stop.is_set():
+            job = self.store.claim_next(self.owner)
+            if job is None:
+                # Woken by submit() in this process; polling picks up jobs from other processes
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            with self._running_lock:
+                self._running.add(job["id"])
+            try:
+                self._run(job)
+            finally:
+                with self._running_lock:
+                    self._running.discard(job["id"])
+
+    def _run(self, job: dict):
+        ctx = JobContext(self.store, job)
+        start = time.perf_counter()
+        try:
+            result = HANDLERS[job["kind"]](ctx, **job["params"])
+            fields = {"status": SUCCEEDED, "progress": 1.0, "result": result}
+        except JobCancelled:
+            fields = {"status": CANCELLED}
+        except Exception as e:
+            logger.exception("Job %s (%s) failed", job["id"], job["kind"])
+            fields = {"status": FAILED, "error": str(e)}
+        self.store.update(job["id"], finished_at=time.time(), **fields)
+        logger.info("Job %s (%s) %s in %.2fs", job["id"], job["kind"], fields["status"], time.perf_counter() - start)
+
+def create_job_store(backend: str, path: str = ""):
+    if backend == "memory":
+        return MemoryJobStore()
+    if backend == "sqlite":
+        return SQLiteJobStore(path or "jobs.db")
+    raise ValueError(f"Unknown job store: {backend}")
@@ -0,0 +1,179 @@
+"""
+Bulk data maintenance.
+
+Set-based deletes instead of per-row ORM deletes. Large purges run in
+short chunked transactions so the SQLite write lock is released between
+chunks and other writers can get in.
+
+Soft-deleted tasks (tombstones) are purged by a background compactor
+that waits for idle periods, deletes old tombstones in batches and then
+returns free pages to the OS with incremental VACUUM (SQLite).
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+from sqlmodel import Session, select, delete
+from .db import engine
+from .models import Task, User, utcnow
+from .taxonomy import delete_owned
+from .tokens import purge_expired, revoke_user
+
+logger = logging.getLogger("api.maintenance")
+
+def delete_user_cascade(session: Session, user: User):
+    """Delete user with all their tasks, projects, tags and refresh tokens in the session's transaction (caller commits)"""
+    session.exec(delete(Task).where(Task.owner_id == user.id))
+    delete_owned(session, user.id)
+    revoke_user(session, user.id)
+    session.delete(user)
+
+def purge_user(user_id: int, chunk_size: int, pause: float, on_done=None,
+               should_stop=None, on_progress=None) -> dict:
+    """
+    Delete a user's tasks in chunks of chunk_size (one transaction each,
+    `pause` seconds apart), then the remainder and the user together.
+    Tasks created while the purge runs are removed by the final transaction.
+    If should_stop() turns true between chunks the user is kept.
+    """
+    start = time.perf_counter()
+    deleted = 0
+    while True:
+        with Session(engine) as session:
+            ids = select(Task.id).where(Task.owner_id == user_id).limit(chunk_size)
+            count = session.exec(delete(Task).where(Task.id.in_(ids))).rowcount
+            session.commit()
+        deleted += count
+        if on_progress is not None:
+            on_progress(deleted)
+        if count < chunk_size:
+            break
+        if should_stop is not None and should_stop():
+            return {"tasks_deleted": deleted, "user_deleted": False}
+        time.sleep(pause)
+
+    with Session(engine) as session:
+        user = session.get(User, user_id)
+        if user is not None:
+            username = user.username
+            delete_user_cascade(session, user)
+            session.commit()
+            if on_done is not None:
+                on_done(username)
+    logger.info("Purged user %s: %s tasks in %.2fs", user_id, deleted, time.perf_counter() - start)
+    return {"tasks_deleted": deleted, "user_deleted": user is not None}
+
+# ---- tombstone compaction ----
+
+def purge_tombstones(retention_days: float, batch_size: int, pause: float = 0.0, should_stop=None) -> int:
+    """Delete tasks soft-deleted more than retention_days ago in batches; returns rows deleted"""
+    cutoff = utcnow() - timedelta(days=retention_days)
+    deleted = 0
+    while should_stop is None or not should_stop():
+        with Session(engine) as session:
+            ids = select(Task.id).where(Task.deleted_at.is_not(None), Task.deleted_at < cutoff).limit(batch_size)
+            count = session.exec(delete(Task).where(Task.id.in_(ids))).rowcount
+            session.commit()
+        deleted += count
+        if count < batch_size:
+            break
+        time.sleep(pause)
+    return deleted
+
+def incremental_vacuum(pages: int) -> int:
+    """Release up to `pages` free pages (SQLite with auto_vacuum=INCREMENTAL); returns pages freed"""
+    if engine.dialect.name != "sqlite":
+        return 0
+    conn = engine.raw_connection()
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            return 0
+        before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        # execute() steps the pragma once (one page); executescript runs it to completion
+        conn.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+        return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    finally:
+        conn.close()
+
+def compact(retention_days: float, batch_size: int, vacuum_pages: int, should_stop=None) -> dict:
+    """Purge old tombstones and expired token revocations, then run incremental VACUUM; stops between batches if should_stop()"""
+    start = time.perf_counter()
+    purged = purge_tombstones(retention_days, batch_size, pause=0.01, should_stop=should_stop)
+    with Session(engine) as session:
+        tokens = purge_expired(session)
+        session.commit()
+    freed = incremental_vacuum(vacuum_pages) if should_stop is None or not should_stop() else 0
+    return {"tombstones_purged": purged, "revoked_tokens_purged": tokens, "pages_freed": freed, "seconds": round(time.perf_counter() - start, 2)}
+
+class ActivityMiddleware:
+    """ASGI middleware tracking in-flight requests and time of the last one (for idle detection)"""
+
+    def __init__(self, app, tracker: "ActivityTracker"):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self.tracker.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.tracker.in_flight -= 1
+            self.tracker.last_request = time.monotonic()
+
+class ActivityTracker:
+    def __init__(self):
+        self.in_flight = 0
+        self.last_request = time.monotonic()
+
+    def idle_for(self) -> float:
+        return 0.0 if self.in_flight else time.monotonic() - self.last_request
+
+class Compactor:
+    """
+    Background thread: every `interval` seconds, once the worker has been
+    idle for `idle_seconds`, purge old tombstones and run incremental VACUUM.
+    """
+
+    def __init__(self, tracker: ActivityTracker, interval: float, idle_seconds: float,
+                 retention_days: float, batch_size: int, vacuum_pages: int):
+        self.tracker = tracker
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _busy(self) -> bool:
+        return self._stop.is_set() or self.tracker.idle_for() < self.idle_seconds
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            # Wait (up to one interval) for a quiet moment
+            deadline = time.monotonic() + self.interval
+            while self._busy() and time.monotonic() < deadline and not self._stop.wait(1.0):
+                pass
+            if self._busy():
+                continue
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Compaction failed")
+
+    def run_once(self) -> dict:
+        # Yield between batches as soon as traffic returns
+        result = compact(self.retention_days, self.batch_size, self.vacuum_pages, should_stop=self._busy)
+        if result["tombstones_purged"] or result["pages_freed"]:
+            logger.info("Compaction: %s", result)
+        return result
@@ -0,0 +1,76 @@
+"""
+Minimal schema migrations.
+
+`create_all` creates missing tables but never alters existing ones, so
+column/index changes to existing tables are listed in MIGRATIONS. The
+applied version is stored in the `schema_version` table. A fresh database
+is created at the latest schema and just stamped.
+"""
+from sqlalchemy import inspect, text
+from .models import Task, TASK_SORT_INDEXES, utcnow
+
+def _add_column(conn, column):
+    """ALTER TABLE ... ADD COLUMN for a model column (nullable, no default)"""
+    column_type = column.type.compile(dialect=conn.dialect)
+    conn.execute(text(f'ALTER TABLE "{column.table.name}" ADD COLUMN {column.name} {column_type}'))
+
+def _create_indexes(conn, table, *names):
+    for index in table.indexes:
+        if index.name in names:
+            index.create(conn, checkfirst=True)
+
+def _index_task_owner(conn):
+    # Per-user listings and the admin owner join look tasks up by owner
+    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_task_owner_id ON task (owner_id)"))
+
+def _task_soft_delete(conn):
+    _add_column(conn, Task.__table__.c.deleted_at)
+    _create_indexes(conn, Task.__table__, "ix_task_owner_live", "ix_task_deleted_at")
+
+def _task_ordering(conn):
+    table = Task.__table__
+    for name in ("priority", "due_at", "position", "created_at", "updated_at"):
+        _add_column(conn, table.c[name])
+    # Existing tasks keep insertion order; timestamps start at migration time
+    conn.execute(
+        text("UPDATE task SET priority = 0, position = id, created_at = :now, updated_at = :now"),
+        {"now": utcnow()}
+    )
+    _create_indexes(conn, table, *TASK_SORT_INDEXES.values())
+
+def _task_projects(conn):
+    # project/tag/task_tag are new tables (create_all); existing tasks only gain the column
+    _add_column(conn, Task.__table__.c.project_id)
+    _create_indexes(conn, Task.__table__, "ix_task_project_live")
+
+# Append only; each entry is fn(conn) applied in order
+MIGRATIONS = [
+    _index_task_owner,
+    _task_soft_delete,
+    _task_ordering,
+    _task_projects,
+]
+
+def latest_version() -> int:
+    return len(MIGRATIONS)
+
+def current_version(conn) -> int:
+    row = conn.execute(text("SELECT version FROM schema_version")).first()
+    return row[0] if row else 0
+
+def is_fresh(engine) -> bool:
+    """True if the database has no application tables yet (call before create_all)"""
+    return not inspect(engine).has_table("user")
+
+def run_migrations(engine, fresh: bool):
+    """Apply pending migrations (or stamp latest version for a fresh database)"""
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+        has_row = conn.execute(text("SELECT COUNT(*) FROM schema_version")).scalar()
+        if not has_row:
+            conn.execute(text("INSERT INTO schema_version (version) VALUES (0)"))
+
+        version = latest_version() if fresh else current_version(conn)
+        for migration in MIGRATIONS[version:]:
+            migration(conn)
+        conn.execute(text("UPDATE schema_version SET version = :v"), {"v": latest_version()})
@@ -1,6 +1,12 @@
-from typing import Optional
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import Index, UniqueConstraint, text
 from sqlmodel import SQLModel, Field
 
+def utcnow() -> datetime:
+    """Naive UTC timestamp (stored the same way on SQLite and PostgreSQL)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 # --- User models ---
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -25,17 +31,129 @@ class TaskBase(SQLModel):
     title: str
     description: Optional[str] = None
     completed: bool = False
+    priority: int = 0  # higher = more important
+    due_at: Optional[datetime] = None
+
+def _live_index(name: str, *columns: str) -> Index:
+    """Partial index over live (not soft-deleted) tasks"""
+    where = text("deleted_at IS NULL")
+    return Index(name, *columns, sqlite_where=where, postgresql_where=where)
+
+# Per-owner sort orders served by an index (listing sort= / keyset pagination)
+TASK_SORT_INDEXES = {
+    "priority": "ix_task_owner_priority",
+    "due_at": "ix_task_owner_due_at",
+    "created_at": "ix_task_owner_created_at",
+    "updated_at": "ix_task_owner_updated_at",
+    "position": "ix_task_owner_position",
+}
 
 class Task(TaskBase, table=True):
+    __table_args__ = (
+        # Listings only read live rows; tombstones are only scanned by compaction
+        _live_index("ix_task_owner_live", "owner_id", "id"),
+        Index("ix_task_deleted_at", "deleted_at",
+              sqlite_where=text("deleted_at IS NOT NULL"), postgresql_where=text("deleted_at IS NOT NULL")),
+        *(_live_index(name, "owner_id", column, "id") for column, name in TASK_SORT_INDEXES.items()),
+        _live_index("ix_task_project_live", "project_id", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
-    owner_id: int = Field(foreign_key="user.id")
+    owner_id: int = Field(foreign_key="user.id", index=True)
+    project_id: Optional[int] = Field(default=None, foreign_key="project.id")
+    # User-defined manual order (ascending)
+    position: float = 0.0
+    created_at: datetime = Field(default_factory=utcnow)
+    updated_at: datetime = Field(default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow})
+    # Soft delete: set instead of removing the row; purged later by compaction
+    deleted_at: Optional[datetime] = None
 
 class TaskCreate(SQLModel):
     title: str
     description: Optional[str] = None
     completed: Optional[bool] = False
+    priority: int = 0
+    due_at: Optional[datetime] = None
+    project_id: Optional[int] = None
+    tag_ids: List[int] = []
+
+class TaskMove(SQLModel):
+    # Task to place the moved one right after; None moves it to the top
+    after_id: Optional[int] = None
+
+class TaskImport(SQLModel):
+    owner_id: int
+    tasks: List[TaskCreate]
 
 class TaskUpdate(SQLModel):
     title: Optional[str] = None
     description: Optional[str] = None
     completed: Optional[bool] = None
+    priority: Optional[int] = None
+    due_at: Optional[datetime] = None
+    position: Optional[float] = None
+    project_id: Optional[int] = None
+
+class TaskTags(SQLModel):
+    tag_ids: List[int]
+
+# --- Projects and tags (per user) ---
+# task_count = live tasks in the project / with the tag, kept up to date on every
+# task change (see taxonomy.py) so sidebars never count rows
+class Project(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("owner_id", "name"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    owner_id: int = Field(foreign_key="user.id", index=True)
+    name: str
+    task_count: int = 0
+
+class Tag(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("owner_id", "name"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    owner_id: int = Field(foreign_key="user.id", index=True)
+    name: str
+    task_count: int = 0
+
+class TaskTag(SQLModel, table=True):
+    """Task <-> tag link: primary key serves tags of a task, ix_task_tag_tag tasks of a tag"""
+    __tablename__ = "task_tag"
+    __table_args__ = (Index("ix_task_tag_tag", "tag_id", "task_id"),)
+
+    task_id: int = Field(foreign_key="task.id", primary_key=True, ondelete="CASCADE")
+    tag_id: int = Field(foreign_key="tag.id", primary_key=True, ondelete="CASCADE")
+
+class ProjectCreate(SQLModel):
+    name: str
+
+class TagCreate(SQLModel):
+    name: str
+
+# --- Refresh token revocation list ---
+class RevokedToken(SQLModel, table=True):
+    """
+    Refresh token ids that may not be used again: `jti` of a rotated or
+    logged-out token, or "family:<fam>" for a whole login session. Rows are
+    purged by compaction once the token would have expired anyway.
+    """
+    __tablename__ = "revoked_token"
+
+    jti: str = Field(primary_key=True)
+    expires_at: datetime = Field(index=True)
+
+class RefreshRequest(SQLModel):
+    refresh_token: str
+
+# --- Audit log (append-only) ---
+class AuditEvent(SQLModel, table=True):
+    __tablename__ = "audit_event"
+    __table_args__ = (Index("ix_audit_event_ts_id", "ts", "id"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    ts: datetime
+    actor_id: Optional[int] = None
+    action: str
+    target_type: Optional[str] = None
+    target_id: Optional[int] = None
+    details: Optional[str] = None  # JSON
@@ -0,0 +1,73 @@
+"""
+Manual task order.
+
+Task.position is a fractional rank: a moved task gets the midpoint between
+its new neighbours, so a move updates exactly one row. Every move into the
+same gap halves it; once a gap is narrower than POSITION_MIN_GAP the
+owner's tasks are renumbered 1..n by a background job (or right away, in
+the rare case the midpoint is no longer representable as a float).
+"""
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import bindparam, update
+from sqlmodel import Session, select, func
+from .config import POSITION_MIN_GAP
+from .db import mark_written
+from .models import Task
+
+def _live(owner_id: int) -> tuple:
+    return Task.owner_id == owner_id, Task.deleted_at.is_(None)
+
+def last_position(session: Session, owner_id: int) -> float:
+    """Position of the owner's last live task (0 when there is none)"""
+    return session.exec(select(func.max(Task.position)).where(*_live(owner_id))).one() or 0.0
+
+def neighbours(session: Session, task: Task, after_id: Optional[int]) -> tuple:
+    """(lower, upper) positions around the slot after task `after_id` (None = first); None = open end"""
+    others = select(Task.position).where(*_live(task.owner_id), Task.id != task.id).order_by(Task.position)
+    if after_id is None:
+        return None, session.exec(others.limit(1)).first()
+    after = session.get(Task, after_id)
+    if after is None or after.deleted_at is not None or after.owner_id != task.owner_id or after.id == task.id:
+        raise HTTPException(status_code=400, detail="after_id must be another live task of the same owner")
+    return after.position, session.exec(others.where(Task.position > after.position).limit(1)).first()
+
+def position_between(lower: Optional[float], upper: Optional[float]) -> Optional[float]:
+    """Rank strictly between two positions; None if the gap is exhausted"""
+    if lower is None and upper is None:
+        return 1.0
+    if lower is None:
+        return upper - 1.0
+    if upper is None:
+        return lower + 1.0
+    middle = (lower + upper) / 2
+    return middle if lower < middle < upper else None
+
+def move_task(session: Session, task: Task, after_id: Optional[int]) -> bool:
+    """
+    Place `task` right after task `after_id` (None = first) by changing only
+    its position (caller commits). Returns True when the gaps around it got
+    narrow enough that the owner's order should be rebalanced.
+    """
+    lower, upper = neighbours(session, task, after_id)
+    position = position_between(lower, upper)
+    if position is None:
+        rebalance_positions(session, task.owner_id)
+        # The renumbering bypassed the ORM: reload task and neighbours
+        session.expire_all()
+        lower, upper = neighbours(session, task, after_id)
+        position = position_between(lower, upper)
+    task.position = position
+    return lower is not None and upper is not None and (upper - lower) / 2 < POSITION_MIN_GAP
+
+def rebalance_positions(session: Session, owner_id: int) -> int:
+    """Renumber the owner's live tasks 1..n keeping their order (caller commits); returns the count"""
+    ids = session.exec(select(Task.id).where(*_live(owner_id)).order_by(Task.position, Task.id)).all()
+    if ids:
+        table = Task.__table__
+        # Renumbering is not an edit: keep updated_at
+        statement = (update(table).where(table.c.id == bindparam("task_id"))
+                     .values(position=bindparam("new_position"), updated_at=table.c.updated_at))
+        session.connection().execute(statement, [{"task_id": id, "new_position": float(n)} for n, id in enumerate(ids, start=1)])
+        mark_written(session)
+    return len(ids)
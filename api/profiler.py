@@ -0,0 +1,162 @@
+"""
+Opt-in per-request SQL profiler with N+1 detection.
+
+Every statement executed while serving a request is recorded with its
+duration and row count. Statements whose SQL text repeats within one
+request are flagged (same text + same parameters = duplicate, same text
+with different parameters = likely N+1 loop). A summary goes out in the
+X-SQL-Profile and Server-Timing headers; full profiles of recent requests
+are kept in a bounded buffer for the debug endpoint.
+"""
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+from .config import SQL_PROFILE_HISTORY
+
+logger = logging.getLogger(__name__)
+
+current_profile: ContextVar[Optional[dict]] = ContextVar("current_profile", default=None)
+
+_profiles = deque(maxlen=SQL_PROFILE_HISTORY)
+_profiles_lock = threading.Lock()
+_request_ids = itertools.count(1)
+
+def instrument_engine(engine):
+    """Record each cursor execution (text, params, duration, rowcount) into the current profile"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        # On the execution context: failed statements leave nothing on the connection
+        if current_profile.get() is not None:
+            context._profile_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        start = getattr(context, "_profile_start", None)
+        if profile is None or start is None:
+            return
+        elapsed = time.perf_counter() - start
+        rowcount = cursor.rowcount if cursor.rowcount is not None and cursor.rowcount >= 0 else None
+        profile["statements"].append({
+            "sql": statement,
+            "params": repr(parameters)[:200],
+            "duration_ms": round(elapsed * 1000, 3),
+            "rows": rowcount,
+            "executemany": executemany
+        })
+
+def instrument_sessions(session_class):
+    """Count rows returned by ORM/session SELECTs (cursor rowcount is -1 for SELECT)"""
+    from sqlalchemy import event
+
+    @event.listens_for(session_class, "do_orm_execute")
+    def _do_orm_execute(orm_execute_state):
+        profile = current_profile.get()
+        if profile is None or not orm_execute_state.is_select:
+            return None
+        index = len(profile["statements"])
+        frozen = orm_execute_state.invoke_statement().freeze()
+        recorded = profile["statements"][index:]
+        if recorded:
+            recorded[-1]["rows"] = len(frozen.data)
+        return frozen()
+
+def summarize(profile: dict, repeat_threshold: int) -> dict:
+    """Aggregate statements and flag repeated ones"""
+    groups = {}
+    for stmt in profile["statements"]:
+        group = groups.setdefault(stmt["sql"], {"count": 0, "duration_ms": 0.0, "params": set()})
+        group["count"] += 1
+        group["duration_ms"] += stmt["duration_ms"]
+        group["params"].add(stmt["params"])
+
+    repeated = [
+        {
+            "sql": sql,
+            "count": group["count"],
+            "duration_ms": round(group["duration_ms"], 3),
+            "kind": "duplicate" if len(group["params"]) == 1 else "n+1"
+        }
+        for sql, group in groups.items()
+        if group["count"] >= repeat_threshold
+    ]
+    return {
+        "queries": len(profile["statements"]),
+        "duration_ms": round(sum(s["duration_ms"] for s in profile["statements"]), 3),
+        "repeated": repeated
+    }
+
+def recent_profiles(limit: int = 20) -> list:
+    with _profiles_lock:
+        return list(_profiles)[-limit:][::-1]
+
+def get_profile(request_id: int) -> Optional[dict]:
+    with _profiles_lock:
+        for profile in _profiles:
+            if profile["id"] == request_id:
+                return profile
+    return None
+
+class SQLProfilerMiddleware:
+    """
+    ASGI middleware collecting the SQL profile of each request.
+
+    Args:
+        app: ASGI application
+        repeat_threshold: Executions of one SQL text in a request that get flagged
+    """
+
+    def __init__(self, app, repeat_threshold: int = 2):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = {
+            "id": next(_request_ids),
+            "method": scope["method"],
+            "path": scope["path"],
+            "started_at": time.time(),
+            "statements": []
+        }
+        token = current_profile.set(profile)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                summary = summarize(profile, self.repeat_threshold)
+                profile.update(summary)
+                profile["status"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-sql-profile-id", str(profile["id"]).encode()))
+                headers.append((
+                    b"x-sql-profile",
+                    f"queries={summary['queries']}; time_ms={summary['duration_ms']}; repeated={len(summary['repeated'])}".encode()
+                ))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={summary["duration_ms"]};desc="{summary["queries"]} queries"'.encode()
+                ))
+                message = {**message, "headers": headers}
+                if summary["repeated"]:
+                    for group in summary["repeated"]:
+                        logger.warning(
+                            "%s %s: %s statement executed %d times: %s",
+                            profile["method"], profile["path"], group["kind"], group["count"], group["sql"][:200]
+                        )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            with _profiles_lock:
+                _profiles.append(profile)
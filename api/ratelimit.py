@@ -0,0 +1,168 @@
+"""
+Rate limiting and admission control.
+
+Each request is classified as "login" (POST /auth/token), "read" (GET/HEAD)
+or "write" and counted against a limit keyed by route class and caller
+(user from the bearer token, otherwise client IP). A login is counted twice:
+per username + client IP, so clients sharing a NAT or proxy do not lock each
+other out, and per client IP ("login_ip"), so one client cannot spray many
+usernames. Over a limit gives 429 with Retry-After.
+
+A limit "rate,burst" allows `burst` requests per window of burst/rate
+seconds. Counters live in the shared cache (cache.py), so with several
+workers on the sqlite or redis backend the limit holds for the whole
+deployment rather than per process.
+
+A global concurrency limit (per worker process) admits a bounded number of
+requests; others wait up to a short timeout and then get 503, so overload
+sheds requests instead of growing latency without bound.
+"""
+import asyncio
+import math
+import time
+from urllib.parse import parse_qs
+
+import orjson
+from starlette.concurrency import run_in_threadpool
+
+from .auth import decode_token
+from .cache import cache as shared_cache, MemoryCache
+from .metrics import Counter
+
+EXEMPT_PATHS = ("/health", "/metrics")
+# Login forms are tiny; larger bodies are not parsed for the username
+LOGIN_BODY_MAX = 4096
+
+HTTP_REJECTED = Counter("http_rejected_total", "Requests rejected by rate limiting / admission control", ("reason", "route_class"))
+
+def route_class(method: str, path: str) -> str:
+    if path == "/auth/token":
+        return "login"
+    if method in ("GET", "HEAD", "OPTIONS"):
+        return "read"
+    return "write"
+
+class RateWindows:
+    """Fixed-window request counters per key in a cache backend: `burst` requests per burst/rate seconds"""
+
+    def __init__(self, name: str, rate: float, burst: float, store):
+        self.name = name
+        self.limit = max(int(burst), 1)
+        self.window = self.limit / rate
+        self.store = store
+
+    def take(self, key: str) -> float:
+        """Count one request; returns 0 if allowed, else seconds until the window resets"""
+        now = time.time()
+        window = int(now // self.window)
+        count = self.store.incr(f"rate:{self.name}:{key}:{window}", self.window)
+        if count <= self.limit:
+            return 0.0
+        return (window + 1) * self.window - now
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying per-caller request limits and a global concurrency limit.
+
+    limits maps route class ("read", "write", "login", "login_ip") -> (rate per second,
+    burst); a missing class is unlimited.
+    max_concurrency <= 0 disables admission control.
+    """
+
+    def __init__(self, app, limits: dict, max_concurrency: int = 0, queue_timeout: float = 0.5, store=None):
+        self.app = app
+        store = store or shared_cache
+        self.windows = {name: RateWindows(name, rate, burst, store) for name, (rate, burst) in limits.items() if rate > 0}
+        # Shared backends do I/O: keep it off the event loop
+        self._blocking = not isinstance(store, MemoryCache)
+        self.queue_timeout = queue_timeout
+        self.semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency > 0 else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        cls = route_class(scope["method"], scope["path"])
+        if cls == "login":
+            checks = [("login_ip", f"ip:{self._client_ip(scope)}")]
+            if "login" in self.windows:
+                caller, receive = await self._login_caller(scope, receive)
+                checks.append(("login", caller))
+        else:
+            checks = [(cls, self._caller(scope))]
+        for name, key in checks:
+            windows = self.windows.get(name)
+            if windows is None:
+                continue
+            wait = await run_in_threadpool(windows.take, key) if self._blocking else windows.take(key)
+            if wait:
+                HTTP_REJECTED.inc("rate_limit", name)
+                await self._reject(send, 429, "Rate limit exceeded", wait)
+                return
+
+        if self.semaphore is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            HTTP_REJECTED.inc("overloaded", cls)
+            await self._reject(send, 503, "Server overloaded", 1)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.semaphore.release()
+
+    @staticmethod
+    def _client_ip(scope) -> str:
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @classmethod
+    def _caller(cls, scope) -> str:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                username = decode_token(token) if scheme.lower() == "bearer" else None
+                if username:
+                    return f"user:{username}"
+                break
+        return f"ip:{cls._client_ip(scope)}"
+
+    @classmethod
+    async def _login_caller(cls, scope, receive) -> tuple:
+        """Limit key username@ip from the login form; returns (key, receive replaying the consumed body)"""
+        messages, body, more = [], b"", True
+        while more and len(body) <= LOGIN_BODY_MAX:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        async def replay():
+            return messages.pop(0) if messages else await receive()
+
+        username = ""
+        if not more and len(body) <= LOGIN_BODY_MAX:
+            values = parse_qs(body.decode("latin-1")).get("username")
+            username = values[0] if values else ""
+        return f"login:{username}@{cls._client_ip(scope)}", replay
+
+    @staticmethod
+    async def _reject(send, status: int, detail: str, retry_after: float):
+        body = orjson.dumps({"detail": detail})
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(retry_after))).encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
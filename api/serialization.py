@@ -0,0 +1,194 @@
+"""
+Fast JSON responses for list endpoints.
+
+Rows are selected as plain column tuples and zipped with pre-built field
+names, so large listings skip per-row ORM hydration, response_model
+validation and the stdlib JSON encoder. On backends with server-side
+cursors (PostgreSQL) big listings are streamed in batches instead of
+being materialized in memory.
+
+Sorted listings page with keyset cursors over (sort column, id): a page
+starts strictly after the last row of the previous one, so rows inserted
+meanwhile never shift or duplicate results (unlike OFFSET).
+"""
+import base64
+from datetime import datetime
+from typing import Optional
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import Boolean, type_coerce, tuple_, and_, or_
+from sqlmodel import Session, select, func
+from .config import DB_STREAM_BATCH
+from .models import Task, User
+
+# Pre-built schemas: public field names and matching columns
+TASK_FIELDS = ("id", "title", "description", "completed", "owner_id", "project_id", "priority", "due_at", "position", "created_at", "updated_at")
+TASK_COLUMNS = tuple(getattr(Task, name) for name in TASK_FIELDS)
+
+# Summary mode for list screens: short description preview, full text via GET /tasks/{id}
+SUMMARY_DESCRIPTION_LENGTH = 120
+TASK_SUMMARY_FIELDS = ("id", "title", "completed", "owner_id", "project_id", "priority", "due_at", "position", "description")
+
+# sort= keys (prefix "-" for descending); ties broken by id
+TASK_SORTS = {name: getattr(Task, name) for name in ("id", "title", "priority", "due_at", "position", "created_at", "updated_at")}
+NULLABLE_SORTS = {"due_at"}  # NULLs sort last in both directions
+DATETIME_SORTS = {"due_at", "created_at", "updated_at"}
+# JSON type of a cursor's sort value per sort key (datetimes travel as ISO strings)
+CURSOR_VALUE_TYPES = {"id": int, "priority": int, "position": (int, float), "title": str, "owner": str,
+                      **{name: str for name in DATETIME_SORTS}}
+
+# Admin listing: owner columns joined from user
+OWNER_FIELDS = ("owner_username", "owner_email")
+OWNER_COLUMNS = (User.username.label("owner_username"), User.email.label("owner_email"))
+ADMIN_TASK_SORTS = {**TASK_SORTS, "owner": User.username}
+
+USER_FIELDS = ("id", "username", "email", "is_admin")
+USER_COLUMNS = tuple(getattr(User, name) for name in USER_FIELDS)
+
+def select_tasks():
+    return select(*TASK_COLUMNS)
+
+def task_projection(fields: Optional[str] = None, summary: bool = False):
+    """
+    Resolve `fields=` / `summary=` query params into (field names, columns).
+
+    fields is a comma separated subset of TASK_FIELDS. In summary mode the
+    description is truncated in SQL and `description_truncated` is added.
+    """
+    if fields:
+        names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in TASK_FIELDS]
+        if not names:
+            raise HTTPException(status_code=400, detail="No fields requested")
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    elif summary:
+        names = TASK_SUMMARY_FIELDS
+    else:
+        names = TASK_FIELDS
+
+    columns = []
+    for name in names:
+        if summary and name == "description":
+            columns.append(func.substr(Task.description, 1, SUMMARY_DESCRIPTION_LENGTH).label("description"))
+        else:
+            columns.append(getattr(Task, name))
+    if summary and "description" in names:
+        names = names + ("description_truncated",)
+        truncated = func.coalesce(func.length(Task.description), 0) > SUMMARY_DESCRIPTION_LENGTH
+        columns.append(type_coerce(truncated, Boolean).label("description_truncated"))
+    return names, tuple(columns)
+
+def encode_cursor(value, task_id: int) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps([value, task_id])).decode()
+
+def _valid_cursor_value(value, sort_key: str) -> bool:
+    if value is None:
+        return sort_key in NULLABLE_SORTS
+    # bool is an int subclass but never a sort value
+    return not isinstance(value, bool) and isinstance(value, CURSOR_VALUE_TYPES[sort_key])
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple:
+    """(sort value, id) of a cursor; 400 unless the value has the sort column's type"""
+    try:
+        value, task_id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not _valid_cursor_value(value, sort_key) or type(task_id) is not int:
+            raise ValueError(cursor)
+        if value is not None and sort_key in DATETIME_SORTS:
+            value = datetime.fromisoformat(value)
+        return value, task_id
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def sorted_task_query(columns: tuple, sort: Optional[str], cursor: Optional[str] = None, sorts: dict = TASK_SORTS):
+    """
+    select(*columns) ordered by `sort` then id, starting after `cursor`.
+
+    The sort value and id are appended as two trailing columns (ignored by
+    rows_to_dicts, used by rows_response to build the next cursor).
+    """
+    descending = bool(sort) and sort.startswith("-")
+    sort_key = sort.lstrip("-") if sort else "id"
+    if sort_key not in sorts:
+        raise HTTPException(status_code=400, detail=f"Unknown sort: {sort}. Use one of: {', '.join(sorts)}")
+    column = sorts[sort_key]
+    nullable = sort_key in NULLABLE_SORTS
+
+    statement = select(*columns, column.label("_sort_value"), Task.id.label("_sort_id"))
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_key)
+        after = (lambda a, b: a < b) if descending else (lambda a, b: a > b)
+        if sort_key == "id":
+            condition = after(Task.id, last_id)
+        elif value is None:
+            # Already inside the NULL tail
+            condition = and_(column.is_(None), after(Task.id, last_id))
+        else:
+            condition = after(tuple_(column, Task.id), tuple_(value, last_id))
+            if nullable:
+                condition = or_(condition, column.is_(None))
+        statement = statement.where(condition)
+
+    if nullable:
+        statement = statement.order_by(column.is_(None))
+    if sort_key != "id":
+        statement = statement.order_by(column.desc() if descending else column)
+    return statement.order_by(Task.id.desc() if descending else Task.id)
+
+def admin_task_query(names: tuple, columns: tuple, with_owner: bool = False,
+                     owner: Optional[str] = None, sort: Optional[str] = None, cursor: Optional[str] = None):
+    """
+    Build admin task listing: optional owner join (`with_owner`), owner
+    username filter (case-insensitive substring) and keyset-paged `sort` by a
+    task field or owner (prefix "-" for descending). Returns (field names, statement).
+    """
+    if with_owner:
+        names = names + OWNER_FIELDS
+        columns = columns + OWNER_COLUMNS
+    statement = sorted_task_query(columns, sort, cursor, ADMIN_TASK_SORTS).where(Task.deleted_at.is_(None))
+    if with_owner or owner or (sort or "").lstrip("-") == "owner":
+        statement = statement.join(User, User.id == Task.owner_id)
+    if owner:
+        statement = statement.where(func.lower(User.username).contains(owner.lower(), autoescape=True))
+    return names, statement
+
+def select_users():
+    return select(*USER_COLUMNS)
+
+def rows_to_dicts(fields: tuple, rows) -> list:
+    return [dict(zip(fields, row)) for row in rows]
+
+def rows_response(session: Session, statement, fields: tuple, stream: bool = False, limit: Optional[int] = None):
+    """
+    Execute column-tuple query and return rows as ORJSONResponse.
+
+    With `limit` (statement from sorted_task_query) one page is returned and
+    the cursor of the next page, if any, is sent in the X-Next-Cursor header.
+    With stream=True and a backend supporting server-side cursors the rows
+    are sent as a streamed JSON array instead.
+    """
+    if limit is not None:
+        rows = session.exec(statement.limit(limit + 1)).all()
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers["X-Next-Cursor"] = encode_cursor(rows[-1][-2], rows[-1][-1])
+        return ORJSONResponse(rows_to_dicts(fields, rows), headers=headers)
+
+    bind = session.get_bind()
+    if stream and bind.dialect.supports_server_side_cursors:
+        return StreamingResponse(_stream_rows(bind, statement, fields), media_type="application/json")
+    rows = session.exec(statement).all()
+    return ORJSONResponse(rows_to_dicts(fields, rows))
+
+def _stream_rows(bind, statement, fields: tuple):
+    # Own connection: the request session may be closed before the body is sent
+    with bind.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=DB_STREAM_BATCH).execute(statement)
+        yield b"["
+        separator = b""
+        for rows in result.partitions():
+            yield separator + b",".join(orjson.dumps(dict(zip(fields, row))) for row in rows)
+            separator = b","
+        yield b"]"
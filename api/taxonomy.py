@@ -0,0 +1,107 @@
+"""
+Projects and tags.
+
+A task belongs to at most one project (task.project_id) and has any
+number of tags (task_tag link table). Project.task_count and
+Tag.task_count count live tasks; every change that moves a task in or out
+(create, reassign, retag, soft delete, restore) adjusts them with a
+relative UPDATE in the same transaction, so listing them never scans tasks.
+
+Listing filters are joins through the indexes: task.project_id via
+ix_task_project_live, each required tag via the task_tag primary key.
+"""
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import and_
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select, update, delete
+from .models import Task, Project, Tag, TaskTag
+
+def parse_ids(value: Optional[str]) -> list:
+    """Comma separated ids (query param) -> unique ints"""
+    if not value:
+        return []
+    try:
+        return list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid id list: {value}")
+
+def filter_tasks(statement, project_id: Optional[int] = None, tag_ids: list = ()):
+    """Restrict a task listing to a project and to tasks having all of tag_ids"""
+    if project_id is not None:
+        statement = statement.where(Task.project_id == project_id)
+    for tag_id in tag_ids:
+        link = aliased(TaskTag)
+        statement = statement.join(link, and_(link.task_id == Task.id, link.tag_id == tag_id))
+    return statement
+
+def missing_owned(session: Session, model, owner_id: int, ids) -> list:
+    """Ids among `ids` that are not projects/tags (model) of owner_id"""
+    ids = set(ids)
+    if not ids:
+        return []
+    owned = set(session.exec(select(model.id).where(model.id.in_(ids), model.owner_id == owner_id)).all())
+    return sorted(ids - owned)
+
+def task_tag_ids(session: Session, task_id: int) -> list:
+    return list(session.exec(select(TaskTag.tag_id).where(TaskTag.task_id == task_id)).all())
+
+def adjust_counts(session: Session, project_id: Optional[int], tag_ids, delta: int):
+    if project_id is not None:
+        session.exec(update(Project).where(Project.id == project_id).values(task_count=Project.task_count + delta))
+    if tag_ids:
+        session.exec(update(Tag).where(Tag.id.in_(tag_ids)).values(task_count=Tag.task_count + delta))
+
+def task_live_changed(session: Session, task: Task, delta: int):
+    """Call when a task is soft-deleted (-1) or restored (+1)"""
+    adjust_counts(session, task.project_id, task_tag_ids(session, task.id), delta)
+
+def set_task_project(session: Session, task: Task, project_id: Optional[int]):
+    """Move task to a project of its owner (None = no project)"""
+    if project_id is not None:
+        project = session.get(Project, project_id)
+        if project is None or project.owner_id != task.owner_id:
+            raise HTTPException(status_code=400, detail=f"Unknown project: {project_id}")
+    if project_id == task.project_id:
+        return
+    if task.deleted_at is None:
+        adjust_counts(session, task.project_id, (), -1)
+        adjust_counts(session, project_id, (), 1)
+    task.project_id = project_id
+    session.add(task)
+
+def set_task_tags(session: Session, task: Task, tag_ids: list) -> list:
+    """Replace the task's tags with tag_ids (tags of its owner); task must have an id (flushed)"""
+    tag_ids = list(dict.fromkeys(tag_ids))
+    if tag_ids:
+        owned = set(session.exec(select(Tag.id).where(Tag.id.in_(tag_ids), Tag.owner_id == task.owner_id)).all())
+        unknown = [str(tag_id) for tag_id in tag_ids if tag_id not in owned]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown tags: {', '.join(unknown)}")
+
+    current = set(task_tag_ids(session, task.id))
+    added = [tag_id for tag_id in tag_ids if tag_id not in current]
+    removed = list(current - set(tag_ids))
+    if removed:
+        session.exec(delete(TaskTag).where(TaskTag.task_id == task.id, TaskTag.tag_id.in_(removed)))
+    session.add_all(TaskTag(task_id=task.id, tag_id=tag_id) for tag_id in added)
+    if task.deleted_at is None:
+        adjust_counts(session, None, removed, -1)
+        adjust_counts(session, None, added, 1)
+    return tag_ids
+
+def delete_owned(session: Session, owner_id: int):
+    """Remove all projects and tags of a user (their tasks must be deleted first)"""
+    owned_tags = select(Tag.id).where(Tag.owner_id == owner_id)
+    session.exec(delete(TaskTag).where(TaskTag.tag_id.in_(owned_tags)))
+    session.exec(delete(Tag).where(Tag.owner_id == owner_id))
+    session.exec(delete(Project).where(Project.owner_id == owner_id))
+
+def delete_project(session: Session, project: Project):
+    """Delete project; its tasks (live or soft-deleted) stay, without a project"""
+    session.exec(update(Task).where(Task.project_id == project.id).values(project_id=None))
+    session.delete(project)
+
+def delete_tag(session: Session, tag: Tag):
+    session.exec(delete(TaskTag).where(TaskTag.tag_id == tag.id))
+    session.delete(tag)
@@ -0,0 +1,100 @@
+"""
+Refresh token rotation and revocation.
+
+Login returns a short-lived access token and a refresh token. POST
+/auth/refresh exchanges a refresh token for a new pair without checking
+the password, so bcrypt only runs at interactive login. Refresh tokens are
+single use: the used token's `jti` goes into the revoked_token table, whose
+primary key makes a second (possibly concurrent) use fail. Presenting an
+already used token means it leaked, so its whole family (every token
+rotated from the same login) is revoked. Deleting a user revokes every
+refresh token issued to that user id until then ("user:<id>"), as SQLite
+may hand the id to the next account. Apart from that table, tokens are
+verified statelessly by signature and expiry.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, delete
+from .auth import create_access_token, create_refresh_token, decode_refresh_token, ACCESS_TOKEN_EXPIRE_MINUTES, REFRESH_TOKEN_EXPIRE_DAYS
+from .models import RevokedToken, User, utcnow
+
+def _family_key(family: str) -> str:
+    return f"family:{family}"
+
+def _user_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+def _expires_at(payload: dict) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], timezone.utc).replace(tzinfo=None)
+
+def _invalid(detail: str = "Invalid refresh token") -> HTTPException:
+    return HTTPException(status_code=401, detail=detail, headers={"WWW-Authenticate": "Bearer"})
+
+def issue_tokens(user: User, family: Optional[str] = None) -> dict:
+    """Access + refresh token pair (login response)"""
+    return {
+        "access_token": create_access_token(user.username),
+        "refresh_token": create_refresh_token(user.id, family),
+        "token_type": "bearer",
+        "expires_in": ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+def revoke_family(session: Session, family: str):
+    """Revoke every refresh token of a login session (commits)"""
+    # Later rotations may expire up to REFRESH_TOKEN_EXPIRE_DAYS from now
+    session.merge(RevokedToken(jti=_family_key(family), expires_at=utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)))
+    try:
+        session.commit()
+    except IntegrityError:
+        # Revoked concurrently
+        session.rollback()
+
+def revoke_user(session: Session, user_id: int):
+    """Revoke every refresh token issued to user_id so far, e.g. on delete (caller commits)"""
+    # The row's expiry encodes the revocation time: tokens issued up to then outlive it by at most REFRESH_TOKEN_EXPIRE_DAYS
+    session.merge(RevokedToken(jti=_user_key(user_id), expires_at=utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)))
+
+def _revoked_user(row: Optional[RevokedToken], payload: dict) -> bool:
+    if row is None:
+        return False
+    revoked_at = row.expires_at - timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    return datetime.fromtimestamp(payload["iat"], timezone.utc).replace(tzinfo=None) <= revoked_at
+
+def rotate(session: Session, token: str) -> dict:
+    """Exchange a refresh token for a new pair, revoking it; 401 if invalid, expired, revoked or reused"""
+    payload = decode_refresh_token(token)
+    if payload is None:
+        raise _invalid()
+    user_id = int(payload["sub"])
+    keys = (payload["jti"], _family_key(payload["fam"]), _user_key(user_id))
+    revoked = {row.jti: row for row in session.exec(select(RevokedToken).where(RevokedToken.jti.in_(keys))).all()}
+    if keys[1] in revoked or _revoked_user(revoked.get(keys[2]), payload):
+        raise _invalid("Refresh token revoked")
+    if keys[0] in revoked:
+        revoke_family(session, payload["fam"])
+        raise _invalid("Refresh token reuse detected")
+    user = session.get(User, user_id)
+    if user is None:
+        raise _invalid()
+
+    session.add(RevokedToken(jti=payload["jti"], expires_at=_expires_at(payload)))
+    try:
+        session.commit()
+    except IntegrityError:
+        # Lost a race with another use of the same token
+        session.rollback()
+        revoke_family(session, payload["fam"])
+        raise _invalid("Refresh token reuse detected")
+    return issue_tokens(user, payload["fam"])
+
+def logout(session: Session, token: str):
+    """Revoke the login session of a refresh token (no-op for invalid tokens)"""
+    payload = decode_refresh_token(token)
+    if payload is not None:
+        revoke_family(session, payload["fam"])
+
+def purge_expired(session: Session) -> int:
+    """Drop revocations of tokens that have expired anyway (caller commits)"""
+    return session.exec(delete(RevokedToken).where(RevokedToken.expires_at < utcnow())).rowcount
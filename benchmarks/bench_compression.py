@@ -0,0 +1,76 @@
+"""
+Benchmark response compression: bytes on the wire and CPU cost per
+response size for each encoding/level.
+
+Usage:
+    python benchmarks/bench_compression.py --sizes 1000,10000,100000,1000000
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import orjson
+from api.compression import GzipEncoder, BrotliEncoder, brotli
+
+def task_listing(approx_bytes: int) -> bytes:
+    """JSON body shaped like GET /admin/tasks of roughly approx_bytes"""
+    rows = []
+    size = 2
+    i = 0
+    while size < approx_bytes:
+        row = {
+            "id": i,
+            "title": f"Task {i}",
+            "description": f"Description of task {i} for user {i % 97}",
+            "completed": i % 3 == 0,
+            "owner_id": i % 97
+        }
+        rows.append(row)
+        size += len(orjson.dumps(row)) + 1
+        i += 1
+    return orjson.dumps(rows)
+
+def measure(body: bytes, make_encoder, repeat: int) -> dict:
+    cpu = []
+    compressed = b""
+    for _ in range(repeat):
+        start = time.process_time()
+        compressed = make_encoder().finish(body)
+        cpu.append(time.process_time() - start)
+    best = min(cpu)
+    return {
+        "bytes": len(compressed),
+        "ratio": round(len(compressed) / len(body), 4),
+        "cpu_ms": round(best * 1000, 3),
+        "mb_per_s": round(len(body) / best / 1e6, 1) if best else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000,10000000")
+    parser.add_argument("--gzip-levels", default="1,6,9")
+    parser.add_argument("--brotli-qualities", default="1,4,11")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings = [(f"gzip-{level}", lambda level=int(level): GzipEncoder(level)) for level in args.gzip_levels.split(",")]
+    if brotli is not None:
+        settings += [(f"br-{q}", lambda q=int(q): BrotliEncoder(q)) for q in args.brotli_qualities.split(",")]
+
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        body = task_listing(size)
+        entry = {"size": len(body), "encodings": {}}
+        for name, make_encoder in settings:
+            entry["encodings"][name] = measure(body, make_encoder, args.repeat)
+        results.append(entry)
+
+    print(json.dumps({"brotli_available": brotli is not None, "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
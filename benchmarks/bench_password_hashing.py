@@ -0,0 +1,106 @@
+"""
+Benchmark password hashing settings: latency per hash and hashes per second
+per core, for bcrypt rounds and argon2id (time:memory KiB:parallelism)
+parameter sets. A login costs one verify, which costs the same as a hash,
+so this gives the login CPU budget for API_BCRYPT_ROUNDS / API_ARGON2_*.
+
+"single" hashes in one process (CPU time includes all argon2 lanes);
+"all_cores" runs one hashing process per core at once, which also shows
+memory bandwidth limits of large argon2 memory costs.
+
+Usage:
+    python benchmarks/bench_password_hashing.py --bcrypt-rounds 10,12,14 --argon2 2:19456:1,3:65536:4
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.auth import BcryptHasher, Argon2Hasher, PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+
+def make_hasher(setting: tuple):
+    scheme, params = setting
+    return BcryptHasher(*params) if scheme == "bcrypt" else Argon2Hasher(*params)
+
+def setting_name(setting: tuple) -> str:
+    scheme, params = setting
+    if scheme == "bcrypt":
+        return f"bcrypt-{params[0]}"
+    return "argon2id-t{}-m{}-p{}".format(*params)
+
+def measure_single(setting: tuple, repeat: int) -> dict:
+    hasher = make_hasher(setting)
+    hasher.hash(PASSWORD)  # warm up
+    wall = []
+    cpu_start = time.process_time()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hasher.hash(PASSWORD)
+        wall.append(time.perf_counter() - start)
+    cpu = time.process_time() - cpu_start
+    wall.sort()
+    return {
+        "ms_per_hash_p50": round(wall[len(wall) // 2] * 1000, 2),
+        "ms_per_hash_max": round(wall[-1] * 1000, 2),
+        "hashes_per_s_per_core": round(repeat / cpu, 2) if cpu else None
+    }
+
+def _hash_for(setting: tuple, seconds: float) -> int:
+    hasher = make_hasher(setting)
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        hasher.hash(PASSWORD)
+        count += 1
+    return count
+
+def measure_all_cores(setting: tuple, processes: int, seconds: float) -> dict:
+    with ProcessPoolExecutor(processes) as pool:
+        start = time.perf_counter()
+        counts = list(pool.map(_hash_for, [setting] * processes, [seconds] * processes))
+        elapsed = time.perf_counter() - start
+    total = sum(counts) / elapsed
+    cores = min(processes, os.cpu_count() or processes)
+    return {
+        "processes": processes,
+        "hashes_per_s": round(total, 2),
+        "hashes_per_s_per_core": round(total / cores, 2)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bcrypt-rounds", default="10,11,12,13,14")
+    parser.add_argument("--argon2", default="2:19456:1,3:65536:4,4:131072:4",
+                        help="comma separated time_cost:memory_cost_kib:parallelism sets")
+    parser.add_argument("--repeat", type=int, default=10, help="hashes per setting in the single-process run")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="0 skips the all-cores run")
+    parser.add_argument("--seconds", type=float, default=3.0, help="duration of the all-cores run per setting")
+    args = parser.parse_args()
+
+    settings = [("bcrypt", (int(rounds),)) for rounds in args.bcrypt_rounds.split(",") if rounds]
+    if PasswordHasher is not None:
+        settings += [("argon2id", tuple(int(v) for v in spec.split(":"))) for spec in args.argon2.split(",") if spec]
+
+    results = {}
+    for setting in settings:
+        entry = {"single": measure_single(setting, args.repeat)}
+        if args.processes > 0:
+            entry["all_cores"] = measure_all_cores(setting, args.processes, args.seconds)
+        results[setting_name(setting)] = entry
+
+    print(json.dumps({
+        "cpu_count": os.cpu_count(),
+        "argon2_available": PasswordHasher is not None,
+        "results": results
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
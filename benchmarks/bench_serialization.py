@@ -0,0 +1,97 @@
+"""
+Benchmark list serialization: ORM + response_model + stdlib JSON
+versus column tuples + ORJSONResponse.
+
+Usage:
+    python benchmarks/bench_serialization.py --rows 100000 --repeat 5
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pydantic import TypeAdapter
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine, select
+from fastapi.responses import JSONResponse
+from api.models import User, Task
+from api.serialization import TASK_FIELDS, select_tasks, rows_response
+
+def build_database(rows: int):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.execute(User.__table__.insert(), [
+            {"username": "bench", "email": "bench@example.com", "hashed_password": "x", "is_admin": False}
+        ])
+        session.execute(Task.__table__.insert(), [
+            {
+                "title": f"Task {i}",
+                "description": f"Description of task {i} " * 4,
+                "completed": i % 3 == 0,
+                "owner_id": 1
+            }
+            for i in range(rows)
+        ])
+        session.commit()
+    return engine
+
+def current_path(session: Session, adapter: TypeAdapter) -> bytes:
+    """Mirror FastAPI default: ORM rows -> validate response_model -> dump -> json.dumps"""
+    tasks = session.exec(select(Task)).all()
+    validated = adapter.validate_python(tasks, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return JSONResponse(content).body
+
+def fast_path(session: Session) -> bytes:
+    return rows_response(session, select_tasks(), TASK_FIELDS).body
+
+def measure(engine, fn, repeat: int) -> dict:
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        with Session(engine) as session:
+            start = time.perf_counter()
+            body = fn(session)
+            timings.append(time.perf_counter() - start)
+            size = len(body)
+    best = min(timings)
+    return {
+        "best_s": round(best, 4),
+        "mean_s": round(sum(timings) / len(timings), 4),
+        "bytes": size
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = build_database(args.rows)
+    adapter = TypeAdapter(List[Task])
+
+    current = measure(engine, lambda s: current_path(s, adapter), args.repeat)
+    fast = measure(engine, fast_path, args.repeat)
+    for result in (current, fast):
+        result["rows_per_s"] = int(args.rows / result["best_s"]) if result["best_s"] else None
+
+    print(json.dumps({
+        "rows": args.rows,
+        "repeat": args.repeat,
+        "current": current,
+        "fast": fast,
+        "speedup": round(current["best_s"] / fast["best_s"], 2) if fast["best_s"] else None
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Load-testing benchmark for the API.
+
+Builds a synthetic database (users, tasks, ownership skew), starts `api.app:app` either
+in-process (httpx ASGI transport) or under uvicorn, drives a weighted mix
+of requests from concurrent async clients and prints throughput and
+p50/p95/p99 latencies as JSON so runs can be compared across commits.
+
+Usage:
+    python benchmarks/load_test.py --users 100 --tasks 5000 --concurrency 32 --duration 20
+    python benchmarks/load_test.py --mode uvicorn --workers 4 --output results.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(ROOT))
+
+import httpx
+
+PASSWORD = "pass123"
+ADMIN_USERNAME = "admin"
+ADMIN_PASSWORD = "admin123"
+
+# operation -> weight
+DEFAULT_MIX = {
+    "login": 2,
+    "list": 50,
+    "toggle": 20,
+    "create": 15,
+    "admin_list": 8,
+    "get": 5,
+}
+
+def build_database(users: int, tasks: int, skew: float, seed: int):
+    """Create schema and generate synthetic users/tasks (see scripts/generate_data.py)"""
+    from api.db import engine, init_db
+    from scripts.generate_data import generate
+
+    init_db()
+    generate(engine, users, tasks, seed=seed, skew=skew, password=PASSWORD,
+             user_prefix="bench_user", log=lambda *args, **kwargs: None)
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return None
+    # Nearest-rank method
+    rank = math.ceil(pct / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, username: str, admin_token: str, rng: random.Random):
+        self.client = client
+        self.username = username
+        self.admin_token = admin_token
+        self.rng = rng
+        self.token = None
+        self.task_ids = []
+
+    def headers(self, token=None):
+        return {"Authorization": f"Bearer {token or self.token}"}
+
+    async def login(self):
+        r = await self.client.post("/auth/token", data={"username": self.username, "password": PASSWORD})
+        r.raise_for_status()
+        self.token = r.json()["access_token"]
+
+    async def run(self, op: str):
+        if op == "login":
+            await self.login()
+        elif op == "list":
+            r = await self.client.get("/tasks", params={"summary": "true"}, headers=self.headers())
+            r.raise_for_status()
+            self.task_ids = [t["id"] for t in r.json()]
+        elif op == "get" and self.task_ids:
+            r = await self.client.get(f"/tasks/{self.rng.choice(self.task_ids)}", headers=self.headers())
+            r.raise_for_status()
+        elif op == "toggle" and self.task_ids:
+            r = await self.client.put(
+                f"/tasks/{self.rng.choice(self.task_ids)}",
+                json={"completed": self.rng.random() < 0.5},
+                headers=self.headers()
+            )
+            r.raise_for_status()
+        elif op == "create":
+            r = await self.client.post(
+                "/tasks",
+                json={"title": "Load test task", "description": "created by load_test"},
+                headers=self.headers()
+            )
+            r.raise_for_status()
+            self.task_ids.append(r.json()["id"])
+        elif op == "admin_list":
+            r = await self.client.get("/admin/tasks", params={"summary": "true"}, headers=self.headers(self.admin_token))
+            r.raise_for_status()
+        else:
+            # get/toggle before the first list: fetch the list instead
+            await self.run("list")
+
+async def drive(client: httpx.AsyncClient, users: int, concurrency: int, duration: float, warmup: float, mix: dict, seed: int) -> dict:
+    rng = random.Random(seed)
+    r = await client.post("/auth/token", data={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    r.raise_for_status()
+    admin_token = r.json()["access_token"]
+
+    ops, weights = zip(*mix.items())
+    samples = {op: [] for op in ops}
+    errors = {op: 0 for op in ops}
+
+    vusers = [
+        VirtualUser(client, f"bench_user_{rng.randrange(users)}", admin_token, random.Random(seed + i))
+        for i in range(concurrency)
+    ]
+    await asyncio.gather(*(v.login() for v in vusers))
+
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + duration
+
+    async def worker(vuser: VirtualUser):
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                return
+            op = vuser.rng.choices(ops, weights)[0]
+            t0 = time.perf_counter()
+            try:
+                await vuser.run(op)
+                ok = True
+            except Exception:
+                ok = False
+            t1 = time.perf_counter()
+            if t0 >= measure_from:
+                if ok:
+                    samples[op].append(t1 - t0)
+                else:
+                    errors[op] += 1
+
+    await asyncio.gather(*(worker(v) for v in vusers))
+
+    def stats(values: list, error_count: int) -> dict:
+        values = sorted(values)
+        ms = lambda v: round(v * 1000, 2) if v is not None else None
+        return {
+            "count": len(values),
+            "errors": error_count,
+            "throughput_rps": round(len(values) / duration, 1),
+            "p50_ms": ms(percentile(values, 50)),
+            "p95_ms": ms(percentile(values, 95)),
+            "p99_ms": ms(percentile(values, 99)),
+            "max_ms": ms(values[-1] if values else None)
+        }
+
+    all_samples = [v for values in samples.values() for v in values]
+    return {
+        "overall": stats(all_samples, sum(errors.values())),
+        "operations": {op: stats(samples[op], errors[op]) for op in ops}
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+def wait_for_server(base_url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health/live", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("API server did not start")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=5000, help="total tasks")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent for task ownership (0 = uniform)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database", help="existing database URL (skips synthetic data build)")
+    parser.add_argument("--mix", help='JSON operation weights, e.g. \'{"list": 80, "toggle": 20}\'')
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write JSON result to file")
+    args = parser.parse_args()
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    unknown = set(mix) - set(DEFAULT_MIX)
+    if unknown:
+        parser.error(f"unknown operations in mix: {', '.join(sorted(unknown))}")
+
+    tmpdir = None
+    if args.database:
+        database_url = args.database
+    else:
+        tmpdir = tempfile.TemporaryDirectory(prefix="taskbench-")
+        database_url = f"sqlite:///{Path(tmpdir.name) / 'bench.db'}"
+    # Must be set before api modules create the engine
+    os.environ["API_DATABASE_URL"] = database_url
+    # Measure capacity, not per-client budgets (admission control stays on)
+    os.environ.setdefault("API_RATE_LIMIT", "false")
+    if args.mode == "uvicorn" and args.workers > 1 and os.getenv("API_CACHE_BACKEND", "memory") == "memory":
+        # Workers need a shared cache (see scripts/run_server.py)
+        cache_dir = tmpdir.name if tmpdir is not None else tempfile.gettempdir()
+        os.environ["API_CACHE_BACKEND"] = "sqlite"
+        os.environ["API_CACHE_URL"] = str(Path(cache_dir) / "bench_cache.db")
+
+    build_start = time.perf_counter()
+    if not args.database:
+        build_database(args.users, args.tasks, args.skew, args.seed)
+    build_seconds = time.perf_counter() - build_start
+
+    server = None
+    try:
+        if args.mode == "inprocess":
+            from api.app import app
+            transport = httpx.ASGITransport(app=app)
+            base_url = "http://bench"
+        else:
+            base_url = f"http://127.0.0.1:{args.port}"
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "api.app:app", "--port", str(args.port),
+                 "--workers", str(args.workers), "--log-level", "warning"],
+                cwd=ROOT, env=os.environ.copy()
+            )
+            wait_for_server(base_url)
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+
+        async def run():
+            async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60.0) as client:
+                return await drive(client, args.users, args.concurrency, args.duration, args.warmup, mix, args.seed)
+
+        results = asyncio.run(run())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if tmpdir is not None:
+            tmpdir.cleanup()
+
+    report = {
+        "commit": git_commit(),
+        "mode": args.mode,
+        "workers": args.workers if args.mode == "uvicorn" else 1,
+        "users": args.users,
+        "tasks": args.tasks,
+        "skew": args.skew,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "mix": mix,
+        "dataset_build_s": round(build_seconds, 2),
+        **results
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
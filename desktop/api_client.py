@@ -1,37 +1,117 @@
-import requests
+import threading
+from urllib3.util import make_headers
+from instrumentation import TimedSession
+
+class RefreshingSession(TimedSession):
+    """Session that renews an expired access token once on 401 and retries the request"""
+    
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+    
+    def request(self, method, url, *args, **kwargs):
+        response = super().request(method, url, *args, **kwargs)
+        authorization = (kwargs.get("headers") or {}).get("Authorization")
+        if response.status_code == 401 and authorization and self.client.refresh_access_token(authorization):
+            kwargs["headers"] = {**kwargs["headers"], "Authorization": f"Bearer {self.client.token}"}
+            response = super().request(method, url, *args, **kwargs)
+        return response
 
 class APIClient:
     def __init__(self):
         self.base_url = "http://127.0.0.1:8000"
         self.token = None
+        self.refresh_token = None
+        self._refresh_lock = threading.Lock()
+        # Reuse connections; advertise only encodings urllib3 can decode (gzip, br if installed)
+        self.session = RefreshingSession(self)
+        self.session.headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
     
     def login(self, username: str, password: str):
-        response = requests.post(
+        """Password login (the only call that makes the server hash a password)"""
+        response = self.session.post(
             f"{self.base_url}/auth/token",
             data={"username": username, "password": password}
         )
         response.raise_for_status()
         data = response.json()
         self.token = data["access_token"]
+        self.refresh_token = data.get("refresh_token")
+    
+    def refresh_access_token(self, failed_authorization: str) -> bool:
+        """Exchange the refresh token for a new token pair; False if the session cannot be renewed"""
+        with self._refresh_lock:
+            if failed_authorization != f"Bearer {self.token}":
+                # Another thread renewed the token meanwhile
+                return self.token is not None
+            if not self.refresh_token:
+                return False
+            response = self.session.post(f"{self.base_url}/auth/refresh", json={"refresh_token": self.refresh_token})
+            if response.status_code != 200:
+                self.refresh_token = None
+                return False
+            data = response.json()
+            self.token = data["access_token"]
+            self.refresh_token = data["refresh_token"]
+            return True
+    
+    def logout(self):
+        """Revoke the refresh token on the server and forget both tokens"""
+        if self.refresh_token:
+            try:
+                self.session.post(f"{self.base_url}/auth/logout", json={"refresh_token": self.refresh_token})
+            except Exception as e:
+                print(f"Logout error: {e}")
+        self.token = None
+        self.refresh_token = None
     
     def get_me(self):
-        response = requests.get(
+        response = self.session.get(
             f"{self.base_url}/auth/me",
             headers={"Authorization": f"Bearer {self.token}"}
         )
         response.raise_for_status()
         return response.json()
     
-    def get_tasks(self):
+    def get_tasks(self, summary: bool = False, fields: list = None, sort: str = None,
+                  project_id: int = None, tag_ids: list = None):
+        """
+        List own tasks; summary=True returns truncated descriptions, fields projects columns,
+        sort orders (e.g. "position", "-due_at"); project_id / tag_ids (all required) filter server-side
+        """
         headers = {"Authorization": f"Bearer {self.token}"}
-        r = requests.get(f"{self.base_url}/tasks", headers=headers)
+        params = self._list_params(summary, fields)
+        if sort:
+            params["sort"] = sort
+        if project_id is not None:
+            params["project_id"] = project_id
+        if tag_ids:
+            params["tags"] = ",".join(str(tag_id) for tag_id in tag_ids)
+        r = self.session.get(f"{self.base_url}/tasks", params=params, headers=headers)
         r.raise_for_status()
         return r.json()
     
-    def create_task(self, title: str, description: str = "", completed: bool = False):
+    def get_task(self, task_id: int):
         headers = {"Authorization": f"Bearer {self.token}"}
-        data = {"title": title, "description": description, "completed": completed}
-        r = requests.post(f"{self.base_url}/tasks", json=data, headers=headers)
+        r = self.session.get(f"{self.base_url}/tasks/{task_id}", headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    @staticmethod
+    def _list_params(summary: bool, fields: list):
+        params = {}
+        if summary:
+            params["summary"] = "true"
+        if fields:
+            params["fields"] = ",".join(fields)
+        return params
+    
+    def create_task(self, title: str, description: str = "", completed: bool = False,
+                    project_id: int = None, tag_ids: list = None):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        data = {"title": title, "description": description, "completed": completed,
+                "project_id": project_id, "tag_ids": tag_ids or []}
+        r = self.session.post(f"{self.base_url}/tasks", json=data, headers=headers)
         r.raise_for_status()
         return r.json()
     
@@ -45,43 +125,130 @@ class APIClient:
         if completed is not None:
             data["completed"] = completed
         
-        r = requests.put(f"{self.base_url}/tasks/{task_id}", json=data, headers=headers)
+        r = self.session.put(f"{self.base_url}/tasks/{task_id}", json=data, headers=headers)
         r.raise_for_status()
         return r.json()
     
     def delete_task(self, task_id: int):
         headers = {"Authorization": f"Bearer {self.token}"}
-        r = requests.delete(f"{self.base_url}/tasks/{task_id}", headers=headers)
+        r = self.session.delete(f"{self.base_url}/tasks/{task_id}", headers=headers)
+        r.raise_for_status()
+    
+    def restore_task(self, task_id: int):
+        """Undo delete_task"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.post(f"{self.base_url}/tasks/{task_id}/restore", headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def move_task(self, task_id: int, after_id: int = None):
+        """Reorder: place task right after task after_id (None = top)"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.post(f"{self.base_url}/tasks/{task_id}/move", json={"after_id": after_id}, headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def set_task_project(self, task_id: int, project_id: int = None):
+        """Move task to a project (None = no project)"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.put(f"{self.base_url}/tasks/{task_id}", json={"project_id": project_id}, headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def get_task_tags(self, task_id: int):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.get(f"{self.base_url}/tasks/{task_id}/tags", headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def set_task_tags(self, task_id: int, tag_ids: list):
+        """Replace the task's tags"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.put(f"{self.base_url}/tasks/{task_id}/tags", json={"tag_ids": tag_ids}, headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    # Projects and tags (with live task counts)
+    def get_projects(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.get(f"{self.base_url}/projects", headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def create_project(self, name: str):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.post(f"{self.base_url}/projects", json={"name": name}, headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def delete_project(self, project_id: int):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.delete(f"{self.base_url}/projects/{project_id}", headers=headers)
+        r.raise_for_status()
+    
+    def get_tags(self):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.get(f"{self.base_url}/tags", headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def create_tag(self, name: str):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.post(f"{self.base_url}/tags", json={"name": name}, headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def delete_tag(self, tag_id: int):
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.delete(f"{self.base_url}/tags/{tag_id}", headers=headers)
         r.raise_for_status()
     
     # Admin endpoints
     def create_user(self, username: str, email: str, password: str):
         headers = {"Authorization": f"Bearer {self.token}"}
         data = {"username": username, "email": email, "password": password}
-        r = requests.post(f"{self.base_url}/admin/users", json=data, headers=headers)
+        r = self.session.post(f"{self.base_url}/admin/users", json=data, headers=headers)
         r.raise_for_status()
         return r.json()
     
     def get_all_users(self):
         headers = {"Authorization": f"Bearer {self.token}"}
-        r = requests.get(f"{self.base_url}/admin/users", headers=headers)
+        r = self.session.get(f"{self.base_url}/admin/users", headers=headers)
         r.raise_for_status()
         return r.json()
     
-    def get_all_tasks(self):
+    def get_all_tasks(self, summary: bool = False, fields: list = None, with_owner: bool = False,
+                      owner: str = None, sort: str = None):
+        """Admin task listing; with_owner adds owner_username/owner_email, owner filters, sort=id|title|owner"""
         headers = {"Authorization": f"Bearer {self.token}"}
-        r = requests.get(f"{self.base_url}/admin/tasks", headers=headers)
+        params = self._list_params(summary, fields)
+        if with_owner:
+            params["with_owner"] = "true"
+        if owner:
+            params["owner"] = owner
+        if sort:
+            params["sort"] = sort
+        r = self.session.get(f"{self.base_url}/admin/tasks", params=params, headers=headers)
         r.raise_for_status()
         return r.json()
     
-    def delete_user(self, user_id: int):
+    def get_task_admin(self, task_id: int):
+        """Admin fetches full task of any user"""
         headers = {"Authorization": f"Bearer {self.token}"}
-        r = requests.delete(f"{self.base_url}/admin/users/{user_id}", headers=headers)
+        r = self.session.get(f"{self.base_url}/admin/tasks/{task_id}", headers=headers)
+        r.raise_for_status()
+        return r.json()
+    
+    def delete_user(self, user_id: int, background: bool = False):
+        """Delete user and their tasks; background=True lets the server purge large accounts in chunks"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        params = {"background": "true"} if background else None
+        r = self.session.delete(f"{self.base_url}/admin/users/{user_id}", params=params, headers=headers)
         r.raise_for_status()
     
     def make_admin(self, user_id: int):
         headers = {"Authorization": f"Bearer {self.token}"}
-        r = requests.put(f"{self.base_url}/admin/users/{user_id}/make-admin", headers=headers)
+        r = self.session.put(f"{self.base_url}/admin/users/{user_id}/make-admin", headers=headers)
         r.raise_for_status()
         return r.json()
     
@@ -90,7 +257,7 @@ class APIClient:
         """Admin creates task for specific user"""
         headers = {"Authorization": f"Bearer {self.token}"}
         data = {"title": title, "description": description, "completed": completed}
-        r = requests.post(f"{self.base_url}/admin/tasks?owner_id={owner_id}", json=data, headers=headers)
+        r = self.session.post(f"{self.base_url}/admin/tasks?owner_id={owner_id}", json=data, headers=headers)
         r.raise_for_status()
         return r.json()
     
@@ -105,12 +272,19 @@ class APIClient:
         if completed is not None:
             data["completed"] = completed
         
-        r = requests.put(f"{self.base_url}/admin/tasks/{task_id}", json=data, headers=headers)
+        r = self.session.put(f"{self.base_url}/admin/tasks/{task_id}", json=data, headers=headers)
         r.raise_for_status()
         return r.json()
     
     def delete_task_admin(self, task_id: int):
         """Admin deletes task of any user"""
         headers = {"Authorization": f"Bearer {self.token}"}
-        r = requests.delete(f"{self.base_url}/admin/tasks/{task_id}", headers=headers)
-        r.raise_for_status()
\ No newline at end of file
+        r = self.session.delete(f"{self.base_url}/admin/tasks/{task_id}", headers=headers)
+        r.raise_for_status()
+    
+    def restore_task_admin(self, task_id: int):
+        """Admin undoes delete_task_admin"""
+        headers = {"Authorization": f"Bearer {self.token}"}
+        r = self.session.post(f"{self.base_url}/admin/tasks/{task_id}/restore", headers=headers)
+        r.raise_for_status()
+        return r.json()
\ No newline at end of file
@@ -1,8 +1,9 @@
 import flet as ft
-from components.task_card import create_admin_task_card
+from components.task_card import create_admin_task_card, description_preview
+from instrumentation import interaction, span
 
 
-def create_admin_task_manager(page: ft.Page, api):
+def create_admin_task_manager(page: ft.Page, api, users):
     """
     Task management component for administrator.
     Allows adding, editing, and deleting user tasks.
@@ -10,6 +11,7 @@ def create_admin_task_manager(page: ft.Page, api):
     Args:
         page: Flet Page
         api: APIClient instance
+        users: UserDirectory shared by admin components
         
     Returns:
         tuple: (widget, load_tasks_callback)
@@ -89,11 +91,13 @@ def create_admin_task_manager(page: ft.Page, api):
             edit_task_title.error_text = None
         page.update()
     
+    @interaction("admin: load tasks")
     def load_tasks():
         """Load all tasks from system"""
         nonlocal all_tasks_cache
         try:
-            all_tasks = api.get_all_tasks()
+            # Owner names come from the server-side join; no user list needed
+            all_tasks = api.get_all_tasks(summary=True, with_owner=True, sort="owner")
             all_tasks_cache = all_tasks
             
             # Load users for filter
@@ -128,7 +132,7 @@ def create_admin_task_manager(page: ft.Page, api):
         if query:
             filtered = [t for t in filtered 
                        if query in t["title"].lower() or 
-                          query in t.get("description", "").lower()]
+                          query in (t.get("description") or "").lower()]
         
         if not filtered:
             if query:
@@ -145,8 +149,9 @@ def create_admin_task_manager(page: ft.Page, api):
             else:
                 tasks_list.controls.append(create_empty_state())
         else:
-            for task in filtered:
-                tasks_list.controls.append(create_editable_admin_task_card(task))
+            with span("build", "admin task cards"):
+                for task in filtered:
+                    tasks_list.controls.append(create_editable_admin_task_card(task))
         
         # Update statistics
         total = len(all_tasks_cache)
@@ -158,6 +163,7 @@ def create_admin_task_manager(page: ft.Page, api):
         
         page.update()
     
+    @interaction("admin: search tasks")
     def search_changed(e):
         """Handle search field changes"""
         search_query.current = e.control.value
@@ -166,19 +172,15 @@ def create_admin_task_manager(page: ft.Page, api):
     def load_users_filter():
         """Load users for filtering dropdown"""
         try:
-            users = api.get_all_users()
-            
-            # Unique user IDs with tasks
-            user_ids_with_tasks = set(t["owner_id"] for t in all_tasks_cache)
-            
-            # Mapping user_id -> username
-            user_map = {u["id"]: u["username"] for u in users}
+            # Owners with task counts (tasks arrive sorted by owner name)
+            owners = {}
+            for t in all_tasks_cache:
+                username, count = owners.get(t["owner_id"], (t["owner_username"], 0))
+                owners[t["owner_id"]] = (username, count + 1)
             
             # Dropdown options
             options = [ft.dropdown.Option(key="all", text="All Users")]
-            for user_id in sorted(user_ids_with_tasks):
-                username = user_map.get(user_id, f"User {user_id}")
-                task_count = sum(1 for t in all_tasks_cache if t["owner_id"] == user_id)
+            for user_id, (username, task_count) in owners.items():
                 options.append(
                     ft.dropdown.Option(
                         key=str(user_id),
@@ -214,14 +216,13 @@ def create_admin_task_manager(page: ft.Page, api):
         """Load users for dropdown with search"""
         nonlocal all_users_for_dropdown
         try:
-            users = api.get_all_users()
-            all_users_for_dropdown = users
+            all_users_for_dropdown = users.get_users()
             users_dropdown.options = [
                 ft.dropdown.Option(
                     key=str(u["id"]), 
                     text=f"{u['username']} ({u['email']})"
                 )
-                for u in users
+                for u in all_users_for_dropdown
             ]
             user_search_field.value = ""
             page.update()
@@ -263,7 +264,7 @@ def create_admin_task_manager(page: ft.Page, api):
                             )
                         ),
                         ft.Text(
-                            task.get("description", ""),
+                            description_preview(task),
                             size=12,
                             color=ft.Colors.GREY_600,
                             italic=True
@@ -271,7 +272,7 @@ def create_admin_task_manager(page: ft.Page, api):
                         ft.Row([
                             ft.Icon(ft.Icons.PERSON, size=14, color=ft.Colors.BLUE_600),
                             ft.Text(
-                                f"User ID: {task['owner_id']}",
+                                task["owner_username"],
                                 size=11,
                                 color=ft.Colors.BLUE_600
                             )
@@ -299,6 +300,7 @@ def create_admin_task_manager(page: ft.Page, api):
             elevation=2
         )
     
+    @interaction("admin: toggle task")
     def toggle_task(task_id, completed):
         """Change task status"""
         try:
@@ -307,6 +309,7 @@ def create_admin_task_manager(page: ft.Page, api):
         except Exception as e:
             print(f"Error toggling task: {e}")
     
+    @interaction("admin: open add dialog")
     def show_add_dialog(e):
         """Show add task dialog"""
         load_users_for_dropdown()
@@ -318,6 +321,7 @@ def create_admin_task_manager(page: ft.Page, api):
         add_dialog.open = True
         page.update()
     
+    @interaction("admin: add task")
     def create_task_submit(e):
         """Create new task for user with validation"""
         error_text.value = ""
@@ -359,9 +363,17 @@ def create_admin_task_manager(page: ft.Page, api):
             
             page.update()
     
+    @interaction("admin: open edit dialog")
     def show_edit_dialog(task):
         """Show edit task dialog"""
         nonlocal edit_task_id
+        if task.get("description_truncated"):
+            # List holds only a preview; fetch full description for editing
+            try:
+                task = api.get_task_admin(task["id"])
+            except Exception as ex:
+                print(f"Error loading task: {ex}")
+                return
         edit_task_id = task["id"]
         edit_task_title.value = task["title"]
         edit_task_desc.value = task.get("description", "")
@@ -371,6 +383,7 @@ def create_admin_task_manager(page: ft.Page, api):
         edit_dialog.open = True
         page.update()
     
+    @interaction("admin: save task")
     def edit_task_submit(e):
         """Save task edit with validation"""
         edit_error_text.value = ""
@@ -409,6 +422,7 @@ def create_admin_task_manager(page: ft.Page, api):
     
     def delete_task_confirm(task):
         """Confirm task deletion"""
+        @interaction("admin: delete task")
         def delete_confirmed(e):
             try:
                 api.delete_task_admin(task["id"])
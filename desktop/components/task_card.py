@@ -1,11 +1,20 @@
 import flet as ft
 
+def description_preview(task: dict) -> str:
+    """Description text for list cards; marks server-truncated previews with an ellipsis."""
+    description = task.get("description") or ""
+    if task.get("description_truncated"):
+        return description.rstrip() + "…"
+    return description
+
+
 def create_task_card(task: dict, on_toggle, on_edit, on_delete):
     """
     Create a single task card.
     
     Args:
         task: dict with task data {id, title, description, completed}
+              (description may be a preview, see description_truncated)
         on_toggle: callback(task_id, new_value) - change completed status
         on_edit: callback(task) - edit task
         on_delete: callback(task_id) - delete task
@@ -60,7 +69,7 @@ def create_task_card(task: dict, on_toggle, on_edit, on_delete):
                         )
                     ),
                     ft.Text(
-                        task.get("description", ""),
+                        description_preview(task),
                         size=12,
                         color=ft.Colors.GREY_600,
                         italic=True
@@ -143,7 +152,7 @@ def create_admin_task_card(task: dict):
                             )
                         ),
                         ft.Text(
-                            task.get("description", ""),
+                            description_preview(task),
                             size=12,
                             color=ft.Colors.GREY_600,
                             italic=True
@@ -0,0 +1,163 @@
+import flet as ft
+from instrumentation import interaction
+
+
+def create_task_sidebar(page: ft.Page, api, on_filter, on_loaded=None):
+    """
+    Projects and tags sidebar for the user task list.
+    Counts come with the project/tag lists (maintained by the API), so the
+    sidebar never loads tasks to count them.
+
+    Args:
+        page: Flet Page
+        api: APIClient instance
+        on_filter: callback(project_id, tag_ids) - selection changed
+                   (project_id None = all projects; tasks must have all tag_ids)
+        on_loaded: callback(projects, tags) - lists (re)loaded
+
+    Returns:
+        tuple: (widget, load_sidebar_callback)
+    """
+
+    projects = []
+    tags = []
+    selected_project = None
+    selected_tags = []
+
+    project_list = ft.Column(spacing=0)
+    tag_list = ft.Row(wrap=True, spacing=5, run_spacing=5)
+
+    @interaction("user: load sidebar")
+    def load_sidebar():
+        """Fetch projects and tags with their task counts"""
+        nonlocal projects, tags, selected_project, selected_tags
+        try:
+            projects = api.get_projects()
+            tags = api.get_tags()
+        except Exception as e:
+            print(f"Error loading projects/tags: {e}")
+            return
+
+        # Drop selections deleted elsewhere
+        project_ids = {p["id"] for p in projects}
+        tag_ids = {t["id"] for t in tags}
+        if selected_project not in project_ids:
+            selected_project = None
+        selected_tags = [tag_id for tag_id in selected_tags if tag_id in tag_ids]
+
+        render()
+        if on_loaded:
+            on_loaded(projects, tags)
+
+    def render():
+        project_list.controls = [project_tile(None, "All tasks", None)] + [
+            project_tile(p["id"], p["name"], p["task_count"]) for p in projects
+        ]
+        tag_list.controls = [
+            ft.Chip(
+                label=ft.Text(f"{t['name']} ({t['task_count']})", size=12),
+                selected=t["id"] in selected_tags,
+                on_select=lambda e, tag_id=t["id"]: toggle_tag(tag_id)
+            )
+            for t in tags
+        ]
+        page.update()
+
+    def project_tile(project_id, name, count):
+        return ft.ListTile(
+            title=ft.Text(name, size=14),
+            trailing=ft.Text(str(count), size=12, color=ft.Colors.GREY_600) if count is not None else None,
+            selected=project_id == selected_project,
+            dense=True,
+            on_click=lambda e: select_project(project_id)
+        )
+
+    @interaction("user: filter by project")
+    def select_project(project_id):
+        nonlocal selected_project
+        selected_project = project_id
+        render()
+        on_filter(selected_project, list(selected_tags))
+
+    @interaction("user: filter by tag")
+    def toggle_tag(tag_id):
+        if tag_id in selected_tags:
+            selected_tags.remove(tag_id)
+        else:
+            selected_tags.append(tag_id)
+        render()
+        on_filter(selected_project, list(selected_tags))
+
+    # New project / tag dialog
+    name_field = ft.TextField(label="Name", width=300, autofocus=True)
+    name_error = ft.Text("", color=ft.Colors.RED, size=12)
+    creating = None  # "project" or "tag"
+
+    def show_create_dialog(kind):
+        nonlocal creating
+        creating = kind
+        create_dialog.title = ft.Text("New Project" if kind == "project" else "New Tag")
+        name_field.value = ""
+        name_error.value = ""
+        create_dialog.open = True
+        page.update()
+
+    @interaction("user: create project/tag")
+    def create_click(e):
+        name = (name_field.value or "").strip()
+        if not name:
+            name_error.value = "Name is required"
+            page.update()
+            return
+
+        try:
+            if creating == "project":
+                api.create_project(name)
+            else:
+                api.create_tag(name)
+            create_dialog.open = False
+            load_sidebar()
+        except Exception as err:
+            name_error.value = "Name already exists" if "400" in str(err) else f"Error: {err}"
+            page.update()
+
+    create_dialog = ft.AlertDialog(
+        title=ft.Text("New Project"),
+        content=ft.Container(
+            content=ft.Column([name_field, name_error], tight=True, spacing=10),
+            width=300
+        ),
+        actions=[
+            ft.TextButton("Cancel", on_click=lambda e: setattr(create_dialog, 'open', False) or page.update()),
+            ft.ElevatedButton("Create", on_click=create_click)
+        ]
+    )
+
+    page.overlay.append(create_dialog)
+
+    def section_header(title, kind):
+        return ft.Row([
+            ft.Text(title, weight=ft.FontWeight.BOLD, size=14),
+            ft.IconButton(
+                ft.Icons.ADD,
+                icon_size=18,
+                tooltip=f"New {kind}",
+                on_click=lambda e: show_create_dialog(kind)
+            )
+        ], alignment=ft.MainAxisAlignment.SPACE_BETWEEN)
+
+    widget = ft.Container(
+        content=ft.Column([
+            section_header("Projects", "project"),
+            project_list,
+            ft.Divider(),
+            section_header("Tags", "tag"),
+            tag_list
+        ], spacing=5, scroll=ft.ScrollMode.AUTO),
+        width=220,
+        padding=10,
+        bgcolor=ft.Colors.WHITE,
+        border_radius=10
+    )
+
+    return widget, load_sidebar
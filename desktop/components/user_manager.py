@@ -1,7 +1,8 @@
 import flet as ft
+from instrumentation import interaction, span
 
 
-def create_user_manager(page: ft.Page, api):
+def create_user_manager(page: ft.Page, api, users):
     """
     Create user management component for administrator.
     Allows adding, viewing, and deleting users.
@@ -9,6 +10,7 @@ def create_user_manager(page: ft.Page, api):
     Args:
         page: Flet Page instance
         api: APIClient instance
+        users: UserDirectory shared by admin components
         
     Returns:
         Tuple of (widget, load_users_callback)
@@ -73,12 +75,12 @@ def create_user_manager(page: ft.Page, api):
             new_password.error_text = None
         page.update()
     
-    def load_users():
-        """Load all users"""
+    @interaction("admin: load users")
+    def load_users(refresh=True):
+        """Load all users (refresh=False reuses the shared directory if still valid)"""
         try:
             nonlocal all_users_cache
-            all_users = api.get_all_users()
-            all_users_cache = all_users
+            all_users_cache = users.refresh() if refresh else users.get_users()
             filter_users()
         except Exception as e:
             print(f"Error loading users: {e}")
@@ -100,8 +102,9 @@ def create_user_manager(page: ft.Page, api):
         else:
             filtered = all_users_cache
         
-        for u in filtered:
-            users_list.controls.append(create_user_card(u))
+        with span("build", "user cards"):
+            for u in filtered:
+                users_list.controls.append(create_user_card(u))
         
         if filtered:
             stats_text.value = f"Showing: {len(filtered)} / {len(all_users_cache)} users"
@@ -122,6 +125,7 @@ def create_user_manager(page: ft.Page, api):
         
         page.update()
     
+    @interaction("admin: search users")
     def search_changed(e):
         """Handle search field changes"""
         search_query.current = e.control.value
@@ -152,11 +156,12 @@ def create_user_manager(page: ft.Page, api):
             )
         )
     
+    @interaction("admin: delete user")
     def delete_user(user_id):
         """Delete user"""
         try:
-            api.delete_user(user_id)
-            load_users()
+            users.delete_user(user_id)
+            load_users(refresh=False)
         except Exception as e:
             print(f"Error deleting user: {e}")
     
@@ -172,6 +177,7 @@ def create_user_manager(page: ft.Page, api):
         dialog.open = True
         page.update()
     
+    @interaction("admin: add user")
     def create_user_submit(e):
         """Create new user with full validation"""
         error_text.value = ""
@@ -200,7 +206,7 @@ def create_user_manager(page: ft.Page, api):
             return
         
         try:
-            api.create_user(
+            users.create_user(
                 username=new_username.value,
                 email=new_email.value,
                 password=new_password.value
@@ -214,7 +220,7 @@ def create_user_manager(page: ft.Page, api):
             new_email.error_text = None
             new_password.error_text = None
             
-            load_users()
+            load_users(refresh=False)
             page.update()
         except Exception as ex:
             error_msg = str(ex)
@@ -1,4 +1,5 @@
 import flet as ft
+from instrumentation import interaction
 
 
 def create_user_stats(page: ft.Page, api):
@@ -17,10 +18,11 @@ def create_user_stats(page: ft.Page, api):
     completed_tasks = ft.Text("0", size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.GREEN)
     pending_tasks = ft.Text("0", size=32, weight=ft.FontWeight.BOLD, color=ft.Colors.ORANGE)
     
+    @interaction("user: load stats")
     def load_stats():
         """Calculate and display task statistics."""
         try:
-            tasks = api.get_tasks()
+            tasks = api.get_tasks(fields=["id", "completed"])
             total = len(tasks)
             completed = len([t for t in tasks if t["completed"]])
             pending = total - completed
@@ -1,21 +1,43 @@
+import threading
+from collections import deque
 import flet as ft
 from components.task_card import create_task_card, create_empty_state
+from components.task_sidebar import create_task_sidebar
+from instrumentation import interaction, span
 
 
 def create_user_task_manager(page: ft.Page, api):
     """
     Task management component for regular user.
-    Allows viewing, adding, editing, and deleting own tasks.
+    Allows viewing, adding, editing, deleting and reordering (drag and drop) own tasks,
+    filtered by project and tags from the sidebar.
     
     Args:
         page: Flet Page
         api: APIClient instance
         
     Returns:
-        tuple: (widget, load_tasks_callback)
+        tuple: (widget, load_callback)
     """
     
-    task_list = ft.Column(spacing=10, scroll=ft.ScrollMode.ALWAYS, expand=True)
+    # Sidebar selection (applied server-side) and the user's projects/tags
+    project_filter = None
+    tag_filter = []
+    projects = []
+    tags = []
+    
+    def apply_filter(project_id, tag_ids):
+        nonlocal project_filter, tag_filter
+        project_filter, tag_filter = project_id, tag_ids
+        load_tasks()
+    
+    def catalog_loaded(loaded_projects, loaded_tags):
+        nonlocal projects, tags
+        projects, tags = loaded_projects, loaded_tags
+    
+    sidebar, load_sidebar = create_task_sidebar(page, api, on_filter=apply_filter, on_loaded=catalog_loaded)
+    
+    task_list = ft.ReorderableListView(spacing=10, expand=True)
     
     # Error messages
     add_error = ft.Text("", color=ft.Colors.RED, size=12)
@@ -25,14 +47,21 @@ def create_user_task_manager(page: ft.Page, api):
     search_query = ft.Ref[str]()
     search_query.current = ""
     all_tasks_cache = []
+    shown_tasks = []  # tasks behind task_list.controls, in display order
+    
+    # Reorders are applied locally first; moves are sent in order by one background sender
+    pending_moves = deque()
+    moves_lock = threading.Lock()
+    sending_moves = False
     
     # Loading and filtering
+    @interaction("user: load tasks")
     def load_tasks():
         """Fetch tasks from API and display"""
         nonlocal all_tasks_cache
         
         try:
-            tasks = api.get_tasks()
+            tasks = api.get_tasks(summary=True, sort="position", project_id=project_filter, tag_ids=tag_filter)
             all_tasks_cache = tasks
             filter_tasks()
                     
@@ -45,6 +74,7 @@ def create_user_task_manager(page: ft.Page, api):
     
     def filter_tasks():
         """Filter tasks based on search query"""
+        nonlocal shown_tasks
         task_list.controls.clear()
         
         query = search_query.current.lower()
@@ -52,9 +82,10 @@ def create_user_task_manager(page: ft.Page, api):
         if query:
             filtered = [t for t in all_tasks_cache 
                        if query in t["title"].lower() or 
-                          query in t.get("description", "").lower()]
+                          query in (t.get("description") or "").lower()]
         else:
             filtered = all_tasks_cache
+        shown_tasks = list(filtered)
         
         if not filtered:
             if query:
@@ -71,24 +102,72 @@ def create_user_task_manager(page: ft.Page, api):
             else:
                 task_list.controls.append(create_empty_state())
         else:
-            for task in filtered:
-                task_list.controls.append(
-                    create_task_card(
-                        task,
-                        on_toggle=handle_toggle,
-                        on_edit=handle_edit,
-                        on_delete=handle_delete
+            with span("build", "task cards"):
+                for task in filtered:
+                    task_list.controls.append(
+                        create_task_card(
+                            task,
+                            on_toggle=handle_toggle,
+                            on_edit=handle_edit,
+                            on_delete=handle_delete
+                        )
                     )
-                )
         
         page.update()
     
+    @interaction("user: search tasks")
     def search_changed(e):
         """Handle search field changes"""
         search_query.current = e.control.value
         filter_tasks()
     
+    @interaction("user: reorder task")
+    def handle_reorder(e):
+        """Move dropped card locally, then save the new position in the background"""
+        nonlocal sending_moves
+        old, new = e.old_index, e.new_index
+        if old == new or not (0 <= old < len(shown_tasks)) or not (0 <= new < len(shown_tasks)):
+            return
+        
+        task = shown_tasks.pop(old)
+        shown_tasks.insert(new, task)
+        task_list.controls.insert(new, task_list.controls.pop(old))
+        after = shown_tasks[new - 1] if new > 0 else None
+        # Same move in the full list (display may be filtered by search)
+        all_tasks_cache.remove(task)
+        all_tasks_cache.insert(all_tasks_cache.index(after) + 1 if after else 0, task)
+        page.update()
+        
+        with moves_lock:
+            pending_moves.append((task, after["id"] if after else None))
+            if sending_moves:
+                return
+            sending_moves = True
+        page.run_thread(send_moves)
+    
+    def send_moves():
+        """Send queued moves one by one; on failure reload the server's order"""
+        nonlocal sending_moves
+        while True:
+            with moves_lock:
+                if not pending_moves:
+                    sending_moves = False
+                    return
+                task, after_id = pending_moves.popleft()
+            try:
+                task["position"] = api.move_task(task["id"], after_id)["position"]
+            except Exception as err:
+                print(f"Error moving task: {err}")
+                with moves_lock:
+                    pending_moves.clear()
+                    sending_moves = False
+                load_tasks()
+                return
+    
+    task_list.on_reorder = handle_reorder
+    
     # Task action handlers
+    @interaction("user: toggle task")
     def handle_toggle(task_id, new_value):
         """Handle task status change"""
         try:
@@ -101,14 +180,31 @@ def create_user_task_manager(page: ft.Page, api):
         """Handle task edit"""
         show_edit_dialog(task)
     
+    @interaction("user: delete task")
     def handle_delete(task_id):
         """Handle task deletion"""
         try:
             api.delete_task(task_id)
             load_tasks()
+            load_sidebar()
+            page.open(ft.SnackBar(
+                ft.Text("Task deleted"),
+                action="Undo",
+                on_action=lambda e: handle_undo_delete(task_id)
+            ))
         except Exception as err:
             print(f"Error deleting task: {err}")
     
+    @interaction("user: undo delete")
+    def handle_undo_delete(task_id):
+        """Restore a just deleted task"""
+        try:
+            api.restore_task(task_id)
+            load_tasks()
+            load_sidebar()
+        except Exception as err:
+            print(f"Error restoring task: {err}")
+    
     # Add task dialog
     title_field = ft.TextField(
         label="Title *",
@@ -133,6 +229,7 @@ def create_user_task_manager(page: ft.Page, api):
             title_field.error_text = None
         page.update()
     
+    @interaction("user: add task")
     def add_task_click(e):
         add_error.value = ""
         
@@ -144,11 +241,18 @@ def create_user_task_manager(page: ft.Page, api):
             return
         
         try:
-            api.create_task(title_field.value.strip(), desc_field.value.strip() if desc_field.value else "")
+            # New tasks land in the project/tags currently shown
+            api.create_task(
+                title_field.value.strip(),
+                desc_field.value.strip() if desc_field.value else "",
+                project_id=project_filter,
+                tag_ids=tag_filter
+            )
             title_field.value = ""
             desc_field.value = ""
             title_field.error_text = None
             load_tasks()
+            load_sidebar()
             add_dialog.open = False
             page.update()
         except Exception as err:
@@ -191,7 +295,12 @@ def create_user_task_manager(page: ft.Page, api):
         on_change=lambda e: validate_edit_title()
     )
     edit_desc_field = ft.TextField(label="Description", multiline=True, width=500, min_lines=3)
+    edit_project_field = ft.Dropdown(label="Project", width=500)
+    edit_tags_row = ft.Row(wrap=True, spacing=5, run_spacing=5)
     edit_task_id = None
+    edit_project_id = None
+    edit_tag_ids = []
+    edit_selected_tags = set()
     
     def validate_edit_title():
         """Validate edit title"""
@@ -201,9 +310,36 @@ def create_user_task_manager(page: ft.Page, api):
             edit_title_field.error_text = None
         page.update()
     
+    def render_edit_tags():
+        edit_tags_row.controls = [
+            ft.Chip(
+                label=ft.Text(t["name"], size=12),
+                selected=t["id"] in edit_selected_tags,
+                on_select=lambda e, tag_id=t["id"]: edit_selected_tags.symmetric_difference_update({tag_id})
+            )
+            for t in tags
+        ]
+    
+    @interaction("user: open edit dialog")
     def show_edit_dialog(task):
-        nonlocal edit_task_id
+        nonlocal edit_task_id, edit_project_id, edit_tag_ids
+        try:
+            if task.get("description_truncated"):
+                # List holds only a preview; fetch full description for editing
+                task = api.get_task(task["id"])
+            edit_tag_ids = [t["id"] for t in api.get_task_tags(task["id"])] if tags else []
+        except Exception as err:
+            print(f"Error loading task: {err}")
+            return
         edit_task_id = task["id"]
+        edit_project_id = task.get("project_id")
+        edit_selected_tags.clear()
+        edit_selected_tags.update(edit_tag_ids)
+        edit_project_field.options = [ft.dropdown.Option(key="none", text="No project")] + [
+            ft.dropdown.Option(key=str(p["id"]), text=p["name"]) for p in projects
+        ]
+        edit_project_field.value = str(edit_project_id) if edit_project_id is not None else "none"
+        render_edit_tags()
         edit_title_field.value = task["title"]
         edit_desc_field.value = task.get("description", "")
         edit_error.value = ""
@@ -211,6 +347,7 @@ def create_user_task_manager(page: ft.Page, api):
         edit_dialog.open = True
         page.update()
     
+    @interaction("user: save task")
     def save_edit_click(e):
         edit_error.value = ""
         
@@ -227,8 +364,17 @@ def create_user_task_manager(page: ft.Page, api):
                 title=edit_title_field.value.strip(),
                 description=edit_desc_field.value.strip() if edit_desc_field.value else ""
             )
+            project_id = None if edit_project_field.value in (None, "none") else int(edit_project_field.value)
+            project_changed = project_id != edit_project_id
+            tags_changed = edit_selected_tags != set(edit_tag_ids)
+            if project_changed:
+                api.set_task_project(edit_task_id, project_id)
+            if tags_changed:
+                api.set_task_tags(edit_task_id, sorted(edit_selected_tags))
             edit_title_field.error_text = None
             load_tasks()
+            if project_changed or tags_changed:
+                load_sidebar()
             edit_dialog.open = False
             page.update()
         except Exception as err:
@@ -244,7 +390,7 @@ def create_user_task_manager(page: ft.Page, api):
     edit_dialog = ft.AlertDialog(
         title=ft.Text("Edit Task"),
         content=ft.Container(
-            content=ft.Column([edit_title_field, edit_desc_field, edit_error], tight=True, spacing=10),
+            content=ft.Column([edit_title_field, edit_desc_field, edit_project_field, edit_tags_row, edit_error], tight=True, spacing=10),
             width=500
         ),
         actions=[
@@ -266,7 +412,7 @@ def create_user_task_manager(page: ft.Page, api):
         bgcolor=ft.Colors.WHITE
     )
     
-    widget = ft.Column([
+    task_panel = ft.Column([
         ft.Row([
             search_field,
             ft.IconButton(
@@ -293,6 +439,13 @@ def create_user_task_manager(page: ft.Page, api):
             bgcolor="#E3F2FD",
             border_radius=10
         )
-    ], spacing=10)
+    ], spacing=10, expand=True)
+    
+    widget = ft.Row([sidebar, task_panel], spacing=15, vertical_alignment=ft.CrossAxisAlignment.START)
+    
+    def load():
+        """Load sidebar (projects, tags, counts) and tasks"""
+        load_sidebar()
+        load_tasks()
     
-    return widget, load_tasks
+    return widget, load
@@ -1 +1,11 @@
-API_BASE_URL = "http://127.0.0.1:8000"
\ No newline at end of file
+import os
+
+API_BASE_URL = "http://127.0.0.1:8000"
+
+# View cache: number of views kept alive and seconds before a view is refreshed
+VIEW_CACHE_SIZE = 4
+VIEW_CACHE_MAX_AGE = 30.0
+
+# UI instrumentation (opt-in): per-interaction timing breakdown, aggregates dumped to file on exit
+PROFILE_ENABLED = os.getenv("TASKMANAGER_PROFILE", "").lower() in ("1", "true", "yes", "on")
+PROFILE_OUTPUT = os.getenv("TASKMANAGER_PROFILE_OUTPUT", "")
@@ -0,0 +1,161 @@
+"""
+Opt-in UI performance instrumentation.
+
+A user action is wrapped in `interaction(name)`; inside it, `span(category,
+label)` measures API calls ("api"), control-tree construction ("build")
+and page updates ("update"). Span time is exclusive (a span nested in
+another is not counted twice), so the per-interaction breakdown adds up
+to the total, with the remainder reported as "other".
+
+Enable with TASKMANAGER_PROFILE=1; aggregates are written to
+TASKMANAGER_PROFILE_OUTPUT (JSON) on exit or via dump().
+"""
+import atexit
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import requests
+
+from config import PROFILE_ENABLED, PROFILE_OUTPUT
+
+CATEGORIES = ("api", "build", "update")
+MAX_SAMPLES = 1000  # per interaction name
+
+_state = threading.local()
+_samples = {}
+_samples_lock = threading.Lock()
+
+
+class _Interaction:
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.times = {category: 0.0 for category in CATEGORIES}
+        self.calls = {category: 0 for category in CATEGORIES}
+        self.stack = []  # [children_time] per open span
+
+
+@contextmanager
+def interaction(name: str):
+    """Measure one user action; nested interactions join the outer one. Usable as decorator."""
+    if not PROFILE_ENABLED or getattr(_state, "interaction", None) is not None:
+        yield
+        return
+
+    current = _state.interaction = _Interaction(name)
+    try:
+        yield
+    finally:
+        _state.interaction = None
+        _finish(current)
+
+
+@contextmanager
+def span(category: str, label: str = ""):
+    """Measure exclusive time of an api/build/update step within the current interaction"""
+    if not PROFILE_ENABLED:
+        yield
+        return
+
+    if getattr(_state, "interaction", None) is None:
+        # Step outside an explicit action (e.g. background refresh)
+        with interaction(f"{category}: {label}" if label else category):
+            with span(category, label):
+                yield
+        return
+
+    current = _state.interaction
+    current.stack.append(0.0)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        children = current.stack.pop()
+        current.times[category] += elapsed - children
+        current.calls[category] += 1
+        if current.stack:
+            current.stack[-1] += elapsed
+
+
+def _finish(current: _Interaction):
+    total = time.perf_counter() - current.start
+    other = max(total - sum(current.times.values()), 0.0)
+    sample = {"total": total, **current.times, "other": other}
+
+    with _samples_lock:
+        _samples.setdefault(current.name, deque(maxlen=MAX_SAMPLES)).append(sample)
+
+    parts = [f"total {total * 1000:.1f} ms"]
+    for category in CATEGORIES:
+        if current.calls[category]:
+            parts.append(f"{category} {current.times[category] * 1000:.1f} ms ({current.calls[category]}x)")
+    parts.append(f"other {other * 1000:.1f} ms")
+    print(f"[perf] {current.name}: " + " | ".join(parts))
+
+
+def _percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))
+    return values[index]
+
+
+def aggregates() -> dict:
+    """Per-interaction count and mean/p50/p95/max (ms) of each breakdown component"""
+    with _samples_lock:
+        snapshot = {name: list(samples) for name, samples in _samples.items()}
+
+    result = {}
+    for name, samples in snapshot.items():
+        entry = {"count": len(samples)}
+        for key in ("total",) + CATEGORIES + ("other",):
+            values = [s[key] * 1000 for s in samples]
+            entry[key] = {
+                "mean_ms": round(sum(values) / len(values), 2),
+                "p50_ms": round(_percentile(values, 50), 2),
+                "p95_ms": round(_percentile(values, 95), 2),
+                "max_ms": round(max(values), 2)
+            }
+        result[name] = entry
+    return result
+
+
+def dump(path: str = None):
+    """Write aggregates as JSON (defaults to TASKMANAGER_PROFILE_OUTPUT)"""
+    path = path or PROFILE_OUTPUT
+    if not path:
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(aggregates(), f, indent=2)
+    print(f"[perf] aggregates written to {path}")
+
+
+def instrument_page(page):
+    """Time every page.update() call"""
+    if not PROFILE_ENABLED:
+        return
+    original_update = page.update
+
+    def timed_update(*controls):
+        with span("update", "page.update"):
+            return original_update(*controls)
+
+    page.update = timed_update
+
+
+class TimedSession(requests.Session):
+    """requests.Session timing each call (including body download) as an "api" span"""
+
+    def request(self, method, url, *args, **kwargs):
+        if not PROFILE_ENABLED:
+            return super().request(method, url, *args, **kwargs)
+        path = requests.utils.urlparse(url).path
+        with span("api", f"{method} {path}"):
+            return super().request(method, url, *args, **kwargs)
+
+
+if PROFILE_ENABLED and PROFILE_OUTPUT:
+    atexit.register(dump)
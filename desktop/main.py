@@ -4,6 +4,8 @@ from views.login_view import create_login_view
 from views.user_view import create_user_view
 from views.tasks_view import create_tasks_view
 from views.admin_view import create_admin_view
+from view_cache import ViewCache
+from instrumentation import instrument_page, interaction, span
 
 def main(page: ft.Page):
     """Main application entry point."""
@@ -14,12 +16,16 @@ def main(page: ft.Page):
     page.window_min_height = 500
     page.theme_mode = ft.ThemeMode.LIGHT
     page.padding = 0
+    instrument_page(page)
     
     api = APIClient()
     current_user = None
+    views = ViewCache(page)
     
     def show_login():
         """Display login view."""
+        api.logout()
+        views.clear()
         page.controls.clear()
         
         def on_login_success(user):
@@ -33,36 +39,58 @@ def main(page: ft.Page):
         page.add(create_login_view(page, api, on_login_success))
         page.update()
     
+    @interaction("navigate: profile")
     def show_user_profile():
         """Display user profile view with statistics dashboard."""
         page.controls.clear()
         try:
-            page.add(create_user_view(page, api, current_user, on_logout=show_login))
+            page.add(views.get(
+                "profile",
+                lambda: build_view(create_user_view, page, api, current_user, on_logout=show_login, on_manage_tasks=show_tasks)
+            ))
             page.update()
         except Exception as e:
             import traceback
             traceback.print_exc()
     
+    def back_to_profile():
+        """Return to profile; tasks may have changed, so revalidate its stats."""
+        views.invalidate("profile")
+        show_user_profile()
+    
+    @interaction("navigate: tasks")
     def show_tasks():
         """Display tasks view for regular user."""
         page.controls.clear()
         try:
-            page.add(create_tasks_view(page, api, current_user, on_logout=show_login, on_back_to_profile=show_user_profile))
+            page.add(views.get(
+                "tasks",
+                lambda: build_view(create_tasks_view, page, api, current_user, on_logout=show_login, on_back_to_profile=back_to_profile)
+            ))
             page.update()
         except Exception as e:
             import traceback
             traceback.print_exc()
     
+    @interaction("navigate: admin")
     def show_admin():
         """Display admin panel."""
         page.controls.clear()
         try:
-            page.add(create_admin_view(page, api, current_user, on_logout=show_login))
+            page.add(views.get(
+                "admin",
+                lambda: build_view(create_admin_view, page, api, current_user, on_logout=show_login)
+            ))
             page.update()
         except Exception as e:
             import traceback
             traceback.print_exc()
     
+    def build_view(create_view, *args, **kwargs):
+        """Construct view (control tree; nested API calls are timed separately)."""
+        with span("build", create_view.__name__):
+            return create_view(*args, **kwargs)
+    
     # Initialize application with login view
     show_login()
 
@@ -0,0 +1,76 @@
+import threading
+
+
+class UserDirectory:
+    """
+    Shared, versioned user list for an admin session.
+
+    Admin components read users from here instead of each calling
+    /admin/users. The list is fetched once and re-fetched only after it
+    was invalidated by a mutation (create_user, delete_user, make_admin)
+    or an explicit refresh(). Every change bumps `version` and notifies
+    subscribers.
+
+    Args:
+        api: APIClient instance
+    """
+
+    def __init__(self, api):
+        self.api = api
+        self.version = 0
+        self._users = None
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def get_users(self):
+        """Return cached user list, fetching it only if not loaded yet."""
+        with self._lock:
+            users = self._users
+        if users is None:
+            users = self.refresh()
+        return users
+
+    def refresh(self):
+        """Re-fetch user list from API; bumps version if it changed."""
+        users = self.api.get_all_users()
+        with self._lock:
+            changed = users != self._users
+            self._users = users
+            if changed:
+                self.version += 1
+        if changed:
+            self._notify()
+        return users
+
+    def invalidate(self):
+        """Drop cached list so the next get_users() fetches it again."""
+        with self._lock:
+            self._users = None
+            self.version += 1
+        self._notify()
+
+    def subscribe(self, callback):
+        """Register callback() called whenever the directory changes."""
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in user directory listener: {e}")
+
+    # Mutations (invalidate after success)
+    def create_user(self, username: str, email: str, password: str):
+        user = self.api.create_user(username=username, email=email, password=password)
+        self.invalidate()
+        return user
+
+    def delete_user(self, user_id: int):
+        self.api.delete_user(user_id)
+        self.invalidate()
+
+    def make_admin(self, user_id: int):
+        user = self.api.make_admin(user_id)
+        self.invalidate()
+        return user
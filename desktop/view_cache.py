@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+from config import VIEW_CACHE_MAX_AGE, VIEW_CACHE_SIZE
+
+
+class ViewCache:
+    """
+    Bounded cache of constructed views with stale-while-revalidate refresh.
+
+    A cached view is returned immediately. If its data is older than
+    max_age seconds, the view's refresh callback runs in the background
+    and updates the controls in place once the API answers.
+
+    Args:
+        page: Flet Page instance
+        max_entries: Maximum number of views kept alive (least recently used is dropped)
+        max_age: Seconds after which a cached view is considered stale
+    """
+
+    def __init__(self, page, max_entries: int = VIEW_CACHE_SIZE, max_age: float = VIEW_CACHE_MAX_AGE):
+        self.page = page
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, build):
+        """
+        Return cached view for key, building it on first use.
+
+        Args:
+            key: View name (e.g. "profile", "tasks")
+            build: Callable returning (view, refresh_callback); the view is
+                expected to be loaded already when build returns
+
+        Returns:
+            Cached view control
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            view, refresh = build()
+            entry = {"view": view, "refresh": refresh, "loaded_at": time.monotonic(), "refreshing": False}
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return view
+
+        if time.monotonic() - entry["loaded_at"] > self.max_age:
+            self._revalidate(entry)
+
+        return entry["view"]
+
+    def invalidate(self, key: str):
+        """Mark cached view as stale so the next get() refreshes it in the background."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry["loaded_at"] = 0.0
+
+    def clear(self):
+        """Drop all cached views (e.g. on logout)."""
+        with self._lock:
+            self._entries.clear()
+
+    def _revalidate(self, entry):
+        """Run entry refresh callback in background, at most once at a time."""
+        with self._lock:
+            if entry["refreshing"]:
+                return
+            entry["refreshing"] = True
+
+        def run():
+            try:
+                entry["refresh"]()
+                entry["loaded_at"] = time.monotonic()
+            except Exception as e:
+                print(f"Error refreshing view: {e}")
+            finally:
+                entry["refreshing"] = False
+
+        if hasattr(self.page, "run_thread"):
+            self.page.run_thread(run)
+        else:
+            threading.Thread(target=run, daemon=True).start()
@@ -1,75 +1,97 @@
 import flet as ft
 from api_client import APIClient
+from view_cache import ViewCache
+from user_directory import UserDirectory
+from instrumentation import interaction, span
 from components.admin_navbar import create_admin_navbar, create_admin_tabs
 from components.user_manager import create_user_manager
 from components.admin_task_manager import create_admin_task_manager
 
 def create_admin_view(page: ft.Page, api, user, on_logout):
-    """Create admin panel view for managing users and tasks."""
-    
+    """
+    Create admin panel view for managing users and tasks.
+
+    Tab contents are built on first use and kept alive; switching tabs
+    reuses them and only reloads data once it is stale.
+
+    Returns:
+        Tuple of (view, refresh_callback)
+    """
+
     current_view = ft.Ref[str]()
     current_view.current = "users"
-    
-    users_tab_btn = None
-    tasks_tab_btn = None
-    content_area = None
-    
-    users_widget, load_users_callback = create_user_manager(page, api)
-    tasks_widget, load_tasks_callback = create_admin_task_manager(page, api)
-    
-    users_content = ft.Container(
-        content=users_widget,
-        padding=20,
-        expand=True
-    )
-    
-    tasks_content = ft.Container(
-        content=tasks_widget,
-        expand=True
-    )
-    
+
+    tab_cache = ViewCache(page)
+    users = UserDirectory(api)
+    # Task owners/filters depend on the user list
+    users.subscribe(lambda: tab_cache.invalidate("tasks"))
+
+    def build_users_tab():
+        """Build users management tab."""
+        with span("build", "users tab"):
+            users_widget, load_users_callback = create_user_manager(page, api, users)
+        load_users_callback()
+        return ft.Container(content=users_widget, padding=20, expand=True), load_users_callback
+
+    def build_tasks_tab():
+        """Build tasks management tab."""
+        with span("build", "tasks tab"):
+            tasks_widget, load_tasks_callback = create_admin_task_manager(page, api, users)
+        load_tasks_callback()
+        return ft.Container(content=tasks_widget, expand=True), load_tasks_callback
+
+    tab_builders = {
+        "users": build_users_tab,
+        "tasks": build_tasks_tab,
+    }
+
     content_area_widget = ft.Container(
-        content=users_content,
         padding=20,
         expand=True
     )
-    content_area = content_area_widget
-    
+
+    @interaction("admin: switch to users")
     def switch_to_users(e):
         """Switch to users management view."""
         current_view.current = "users"
-        load_users_callback()
         update_view()
-    
+
+    @interaction("admin: switch to tasks")
     def switch_to_tasks(e):
         """Switch to tasks management view."""
         current_view.current = "tasks"
-        load_tasks_callback()
         update_view()
-    
+
     def update_view():
         """Update view based on current_view selection."""
+        content_area_widget.content = tab_cache.get(current_view.current, tab_builders[current_view.current])
         if current_view.current == "users":
-            content_area_widget.content = users_content
             users_tab_btn_widget.bgcolor = ft.Colors.BLUE_700
             tasks_tab_btn_widget.bgcolor = None
         else:
-            content_area_widget.content = tasks_content
             users_tab_btn_widget.bgcolor = None
             tasks_tab_btn_widget.bgcolor = ft.Colors.BLUE_700
         page.update()
-    
-    load_users_callback()
-    
+
+    def refresh():
+        """Mark all tabs stale and revalidate the visible one."""
+        for key in tab_builders:
+            tab_cache.invalidate(key)
+        update_view()
+
+    content_area_widget.content = tab_cache.get(current_view.current, tab_builders[current_view.current])
+
     navbar = create_admin_navbar(page, user, on_logout, switch_to_users, switch_to_tasks)
     tabs_container, users_tab_btn_widget, tasks_tab_btn_widget = create_admin_tabs(
-        switch_to_users, 
-        switch_to_tasks, 
+        switch_to_users,
+        switch_to_tasks,
         current_view.current
     )
-    
-    return ft.Column([
+
+    view = ft.Column([
         navbar,
         tabs_container,
         content_area_widget
-    ], spacing=0)
\ No newline at end of file
+    ], spacing=0)
+
+    return view, refresh
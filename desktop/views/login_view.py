@@ -1,5 +1,6 @@
 import flet as ft
 from api_client import APIClient
+from instrumentation import interaction
 
 def create_login_view(page: ft.Page, api, on_login_success):
     """
@@ -29,6 +30,7 @@ def create_login_view(page: ft.Page, api, on_login_success):
     error_text = ft.Text(color="red", size=12)
     loading = ft.ProgressRing(visible=False, width=30, height=30)
     
+    @interaction("login")
     def login_click(e):
         if not username_field.value or not password_field.value:
             error_text.value = "Please fill in all fields"
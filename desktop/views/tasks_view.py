@@ -11,6 +11,9 @@ def create_tasks_view(page: ft.Page, api, user, on_logout, on_back_to_profile=No
         user: Dictionary containing user data (username, email, is_admin)
         on_logout: Callback function for logout action
         on_back_to_profile: Callback function to return to user profile
+        
+    Returns:
+        Tuple of (view, load_tasks_callback)
     """
     
     tasks_widget, load_tasks_callback = create_user_task_manager(page, api)
@@ -65,4 +68,4 @@ def create_tasks_view(page: ft.Page, api, user, on_logout, on_back_to_profile=No
     
     load_tasks_callback()
     
-    return view
\ No newline at end of file
+    return view, load_tasks_callback
\ No newline at end of file
@@ -2,7 +2,7 @@ import flet as ft
 from components.user_navbar import create_user_navbar
 from components.user_stats import create_user_stats
 
-def create_user_view(page: ft.Page, api, user, on_logout):
+def create_user_view(page: ft.Page, api, user, on_logout, on_manage_tasks):
     """
     Create simplified user profile view with task statistics.
     
@@ -11,23 +11,14 @@ def create_user_view(page: ft.Page, api, user, on_logout):
         api: APIClient instance
         user: Dictionary containing user data
         on_logout: Callback function for logout action
+        on_manage_tasks: Callback function to navigate to tasks view
+        
+    Returns:
+        Tuple of (view, load_stats_callback)
     """
     
     stats_widget, load_stats_callback = create_user_stats(page, api)
     
-    def go_to_tasks(e):
-        """Navigate to tasks view."""
-        from views.tasks_view import create_tasks_view
-        page.controls.clear()
-        
-        def back_to_profile():
-            page.controls.clear()
-            page.add(create_user_view(page, api, user, on_logout))
-            page.update()
-        
-        page.add(create_tasks_view(page, api, user, on_logout, on_back_to_profile=back_to_profile))
-        page.update()
-    
     navbar = create_user_navbar(page, user, on_logout)
     
     view = ft.Column([
@@ -48,7 +39,7 @@ def create_user_view(page: ft.Page, api, user, on_logout):
                 
                 ft.ElevatedButton(
                     "Manage Tasks",
-                    on_click=go_to_tasks,
+                    on_click=lambda e: on_manage_tasks(),
                     width=300,
                     height=50,
                     style=ft.ButtonStyle(
@@ -65,4 +56,4 @@ def create_user_view(page: ft.Page, api, user, on_logout):
     
     load_stats_callback()
     
-    return view
\ No newline at end of file
+    return view, load_stats_callback
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Script to compact the database now
+
+Purges soft-deleted tasks older than the retention period and releases
+free pages. `--full-vacuum` switches an existing SQLite database to
+incremental auto-vacuum (rewrites the file; run while the API is stopped).
+
+Usage:
+    python scripts/compact_db.py --retention-days 7
+    python scripts/compact_db.py --full-vacuum
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.config import TOMBSTONE_RETENTION_DAYS, COMPACTION_BATCH, VACUUM_PAGES
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--retention-days", type=float, default=TOMBSTONE_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=COMPACTION_BATCH)
+    parser.add_argument("--vacuum-pages", type=int, default=VACUUM_PAGES)
+    parser.add_argument("--full-vacuum", action="store_true", help="enable incremental auto-vacuum and rebuild the file (SQLite)")
+    args = parser.parse_args()
+
+    from api.db import engine, init_db
+    from api.maintenance import compact
+
+    init_db()
+    result = compact(args.retention_days, args.batch_size, args.vacuum_pages)
+    print(f"Purged {result['tombstones_purged']} deleted tasks, freed {result['pages_freed']} pages ({result['seconds']}s)")
+
+    if args.full_vacuum:
+        if engine.dialect.name != "sqlite":
+            print("--full-vacuum only applies to SQLite")
+            sys.exit(1)
+        conn = engine.raw_connection()
+        try:
+            conn.driver_connection.executescript("PRAGMA auto_vacuum=INCREMENTAL; VACUUM;")
+        finally:
+            conn.close()
+        print("Database rebuilt with incremental auto-vacuum")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Script to generate large synthetic databases for benchmarking
+
+Builds thousands of users and millions of tasks in seconds: rows are
+bulk-inserted in batches inside one transaction, all users share one
+precomputed password hash, output is deterministic for a given seed and
+task ownership follows a configurable Zipf skew (a few users own most
+tasks).
+
+Usage:
+    python scripts/generate_data.py --users 5000 --tasks 2000000 --skew 1.1 --reset
+"""
+import argparse
+import itertools
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_PASSWORD = "pass123"
+
+TITLE_VERBS = ["Review", "Prepare", "Update", "Fix", "Write", "Plan", "Test", "Deploy", "Analyze", "Design"]
+TITLE_NOUNS = ["report", "presentation", "documentation", "bug", "release", "meeting", "budget", "API", "dashboard", "backup"]
+DESCRIPTION_WORDS = (
+    "client team sprint module invoice database review deadline feature customer "
+    "migration security budget roadmap metrics backlog dashboard release audit"
+).split()
+
+def owner_weights(users: int, skew: float) -> list:
+    """Cumulative Zipf weights: user i gets weight 1 / (i + 1) ** skew (skew=0 -> uniform)"""
+    return list(itertools.accumulate(1.0 / (i + 1) ** skew for i in range(users)))
+
+def generate(engine, users: int, tasks: int, seed: int = 42, skew: float = 1.0,
+             password: str = DEFAULT_PASSWORD, batch_size: int = 50_000, admin: bool = True,
+             user_prefix: str = "user", log=print) -> dict:
+    """
+    Bulk-generate users and tasks into an empty schema.
+
+    Args:
+        engine: SQLAlchemy engine (schema must exist)
+        users: Number of regular users
+        tasks: Total number of tasks
+        seed: Random seed (same seed -> same database)
+        skew: Zipf exponent for task ownership (0 = uniform)
+        password: Password shared by all generated users
+        batch_size: Rows per executemany batch
+        admin: Also create admin / admin123
+        user_prefix: Username prefix (usernames are <prefix>_<n>)
+
+    Returns:
+        dict with counts and timings
+    """
+    from api.models import User, Task
+    from api.auth import hash_password
+
+    rng = random.Random(seed)
+    start = time.perf_counter()
+
+    # One bcrypt call for all users
+    hashed = hash_password(password)
+
+    with engine.connect() as conn:
+        sqlite = conn.dialect.name == "sqlite"
+        if sqlite:
+            # Generator output is disposable; skip fsyncs while loading
+            # (must be set outside a transaction, restored afterwards for the pooled connection)
+            synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.commit()
+
+        if admin:
+            conn.execute(User.__table__.insert(), [{
+                "username": "admin",
+                "email": "admin@taskmanager.com",
+                "hashed_password": hash_password("admin123"),
+                "is_admin": True
+            }])
+
+        for first in range(0, users, batch_size):
+            conn.execute(User.__table__.insert(), [
+                {
+                    "username": f"{user_prefix}_{i}",
+                    "email": f"{user_prefix}_{i}@example.com",
+                    "hashed_password": hashed,
+                    "is_admin": False
+                }
+                for i in range(first, min(first + batch_size, users))
+            ])
+        users_done = time.perf_counter()
+        log(f"  Users: {users} ({users_done - start:.2f}s)")
+
+        owner_ids = [row[0] for row in conn.execute(
+            User.__table__.select().with_only_columns(User.id).where(User.is_admin == False).order_by(User.id)
+        )]
+        cum_weights = owner_weights(len(owner_ids), skew)
+
+        inserted = 0
+        while inserted < tasks:
+            count = min(batch_size, tasks - inserted)
+            owners = rng.choices(owner_ids, cum_weights=cum_weights, k=count)
+            conn.execute(Task.__table__.insert(), [
+                {
+                    "title": f"{rng.choice(TITLE_VERBS)} {rng.choice(TITLE_NOUNS)} #{inserted + n}",
+                    "description": " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(0, 30))) or None,
+                    "completed": rng.random() < 0.35,
+                    "owner_id": owner,
+                    "priority": rng.randint(0, 3),
+                    "position": inserted + n
+                }
+                for n, owner in enumerate(owners)
+            ])
+            inserted += count
+            log(f"  Tasks: {inserted}/{tasks}", end="\r")
+
+        conn.commit()
+        if sqlite:
+            conn.exec_driver_sql(f"PRAGMA synchronous={int(synchronous)}")
+            conn.commit()
+
+    elapsed = time.perf_counter() - start
+    log(f"\n  Done in {elapsed:.2f}s ({tasks / max(elapsed - (users_done - start), 1e-9):,.0f} tasks/s)")
+    return {"users": users, "tasks": tasks, "seconds": round(elapsed, 2)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent for task ownership (0 = uniform)")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+
+    from sqlmodel import SQLModel, Session, select, func
+    from api.db import engine, init_db
+    from api.models import User
+
+    if args.reset:
+        SQLModel.metadata.drop_all(engine)
+    init_db()
+
+    with Session(engine) as session:
+        if session.exec(select(func.count()).select_from(User)).one():
+            print("Database is not empty; use --reset to recreate it")
+            sys.exit(1)
+
+    print(f"\n Generating {args.users} users and {args.tasks} tasks (seed={args.seed}, skew={args.skew})...")
+    generate(engine, args.users, args.tasks, seed=args.seed, skew=args.skew, batch_size=args.batch_size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Script to run the API with one or more uvicorn workers
+
+With more than one worker every process has its own memory, so the
+in-process cache would serve stale users after a change made in another
+worker. In that case the launcher switches to the shared SQLite cache
+and job store (unless a shared backend was chosen explicitly) and runs
+schema setup once before forking, so workers do not race on migrations.
+
+Usage:
+    python scripts/run_server.py --workers 4
+    python scripts/run_server.py --workers 8 --cache redis --cache-url redis://localhost:6379/0
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(ROOT))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--cache", choices=["memory", "sqlite", "redis"],
+                        default=os.getenv("API_CACHE_BACKEND"), help="cache backend (default: memory for 1 worker, sqlite otherwise)")
+    parser.add_argument("--cache-url", default=os.getenv("API_CACHE_URL", ""),
+                        help="SQLite cache file or Redis URL")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+
+    cache = args.cache or ("memory" if args.workers == 1 else "sqlite")
+    if cache == "memory" and args.workers > 1:
+        print("In-process cache cannot be shared between workers; using sqlite")
+        cache = "sqlite"
+
+    # Workers inherit the environment; must be set before api modules are imported
+    os.environ["API_CACHE_BACKEND"] = cache
+    os.environ["API_CACHE_URL"] = args.cache_url
+    if args.workers > 1 and os.getenv("API_JOBS_BACKEND", "memory") == "memory":
+        # GET /jobs/{id} may land on any worker: jobs must live in a shared store
+        print("In-process job queue cannot be shared between workers; using sqlite")
+        os.environ["API_JOBS_BACKEND"] = "sqlite"
+
+    from api.db import init_db
+    from api.cache import cache as shared_cache
+    init_db()
+    # Entries from a previous run may describe users changed since
+    shared_cache.clear()
+
+    import uvicorn
+    print(f"Starting API on http://{args.host}:{args.port} ({args.workers} worker(s), cache={cache})")
+    uvicorn.run("api.app:app", host=args.host, port=args.port, workers=args.workers,
+                log_level=args.log_level, app_dir=str(ROOT))
+
+if __name__ == "__main__":
+    main()
@@ -7,8 +7,8 @@ from pathlib import Path
 # Add parent directory to path to enable imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlmodel import Session, select
-from api.models import User, Task
+from sqlmodel import Session, select, delete
+from api.models import User, Task, Project, Tag, TaskTag
 from api.db import engine, init_db
 from api.auth import hash_password
 
@@ -31,14 +31,12 @@ def seed_database():
         else:
             admin = existing_admin
         
-        old_users = session.exec(select(User).where(User.is_admin == False)).all()
-        for user in old_users:
-            session.delete(user)
-        session.commit()
-        
-        old_tasks = session.exec(select(Task)).all()
-        for task in old_tasks:
-            session.delete(task)
+        # Children first: foreign keys are enforced
+        session.exec(delete(TaskTag))
+        session.exec(delete(Task))
+        session.exec(delete(Tag))
+        session.exec(delete(Project))
+        session.exec(delete(User).where(User.is_admin == False))
         session.commit()
         
         # Create new users
@@ -57,18 +55,23 @@ def seed_database():
             {"username": "kate_taylor", "email": "kate.taylor@company.com", "password": "pass123"},
         ]
         
+        # All sample users share one password: hash it once
+        hashed_passwords = {}
         created_users = []
         for user_data in users_data:
+            password = user_data["password"]
+            if password not in hashed_passwords:
+                hashed_passwords[password] = hash_password(password)
             user = User(
                 username=user_data["username"],
                 email=user_data["email"],
-                hashed_password=hash_password(user_data["password"]),
+                hashed_password=hashed_passwords[password],
                 is_admin=False
             )
             session.add(user)
-            session.commit()
-            session.refresh(user)
             created_users.append(user)
+        session.commit()
+        for user in created_users:
             print(f"  Created: {user.username} (ID: {user.id})")
         
         print(f"\nCreated {len(created_users)} users")
@@ -0,0 +1,97 @@
+"""
+Shared test setup. Settings are read when `api` is first imported, so the
+environment is prepared here, before any test module is collected.
+
+Tests run against a temporary SQLite file, or against PostgreSQL when
+API_TEST_DATABASE_URL is set (test_postgres.py only runs then).
+"""
+import os
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import pytest
+
+_tmp = tempfile.mkdtemp(prefix="taskapi-tests-")
+os.environ.update({
+    "API_DATABASE_URL": os.getenv("API_TEST_DATABASE_URL") or f"sqlite:///{_tmp}/tasks.db",
+    "API_DATABASE_READ_URL": "",
+    "API_CACHE_BACKEND": "memory",
+    "API_JOBS_BACKEND": "memory",
+    "API_RATE_LIMIT": "0",
+    "API_COMPACTION": "0",
+    "API_AUDIT_SINK": "off",
+    "API_BCRYPT_ROUNDS": "4",
+    # Several partitions per streamed listing
+    "API_DB_STREAM_BATCH": "7"
+})
+
+# Add parent directory to path to enable imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+
+from api.app import app
+from api.auth import hash_password
+from api.db import engine
+from api.maintenance import delete_user_cascade
+from api.models import User
+
+PASSWORD = "test-password"
+
+@pytest.fixture(scope="session")
+def client():
+    """App client; startup creates the schema and starts the job workers"""
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def memory_session():
+    """Session on a private in-memory SQLite database with the full schema"""
+    memory_engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(memory_engine, "connect")
+    def _enable_foreign_keys(dbapi_conn, connection_record):
+        dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+    SQLModel.metadata.create_all(memory_engine)
+    with Session(memory_engine) as session:
+        yield session
+    memory_engine.dispose()
+
+@pytest.fixture
+def make_user():
+    """make_user(session, is_admin=False) -> committed User with password PASSWORD and a random name"""
+    def make(session: Session, is_admin: bool = False, username: str = None) -> User:
+        name = username or f"test_{uuid.uuid4().hex[:12]}"
+        user = User(username=name, email=f"{name}@example.com", hashed_password=hash_password(PASSWORD), is_admin=is_admin)
+        session.add(user)
+        session.commit()
+        session.refresh(user)
+        return user
+    return make
+
+@pytest.fixture
+def app_user(client, make_user):
+    """app_user(is_admin=False) -> (user, auth headers) in the app database; users are deleted afterwards"""
+    created = []
+
+    def make(is_admin: bool = False) -> tuple:
+        with Session(engine) as session:
+            user = make_user(session, is_admin)
+        created.append(user.id)
+        response = client.post("/auth/token", data={"username": user.username, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return user, {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    yield make
+    with Session(engine) as session:
+        for user_id in created:
+            user = session.get(User, user_id)
+            if user is not None:
+                delete_user_cascade(session, user)
+        session.commit()
@@ -0,0 +1,66 @@
+import base64
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+
+from api.serialization import encode_cursor
+
+def cursor_of(value) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(value)).decode()
+
+@pytest.fixture
+def user_with_tasks(client, app_user):
+    user, headers = app_user()
+    base = datetime(2030, 1, 1)
+    for n in range(13):
+        due_at = None if n % 4 == 0 else (base + timedelta(days=n % 5)).isoformat()
+        response = client.post("/tasks", json={"title": f"task {n % 6}", "priority": n % 3, "due_at": due_at}, headers=headers)
+        assert response.status_code == 201, response.text
+    return user, headers
+
+@pytest.mark.parametrize("sort", [None, "title", "-priority", "position", "due_at", "-due_at", "created_at", "-updated_at"])
+def test_pages_follow_next_cursor(client, user_with_tasks, sort):
+    _, headers = user_with_tasks
+    params = {"sort": sort} if sort else {}
+    listed = client.get("/tasks", params=params, headers=headers).json()
+
+    paged, cursor = [], None
+    while True:
+        response = client.get("/tasks", params={**params, "limit": 5, **({"cursor": cursor} if cursor else {})}, headers=headers)
+        assert response.status_code == 200, response.text
+        paged += response.json()
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert [task["id"] for task in paged] == [task["id"] for task in listed]
+    assert len(paged) == 13
+
+@pytest.mark.parametrize("sort, cursor", [
+    ("priority", cursor_of([{"a": 1}, 5])),
+    ("priority", cursor_of(["high", 5])),
+    ("priority", cursor_of([True, 5])),
+    ("priority", cursor_of([None, 5])),
+    ("title", cursor_of([3, 5])),
+    ("position", cursor_of(["1.5", 5])),
+    ("due_at", cursor_of([12, 5])),
+    ("due_at", cursor_of(["not a date", 5])),
+    ("created_at", cursor_of([None, 5])),
+    ("id", cursor_of([1, "5"])),
+    ("id", cursor_of([1, 5.5])),
+    ("id", cursor_of([1, 2, 3])),
+    ("id", cursor_of({"value": 1})),
+    ("id", "not base64!"),
+])
+def test_malformed_cursor_is_400(client, user_with_tasks, sort, cursor):
+    _, headers = user_with_tasks
+    response = client.get("/tasks", params={"sort": sort, "limit": 5, "cursor": cursor}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+def test_admin_cursor_checked_against_owner_sort(client, app_user):
+    _, headers = app_user(is_admin=True)
+    response = client.get("/admin/tasks", params={"sort": "owner", "limit": 5, "cursor": encode_cursor(7, 1)}, headers=headers)
+    assert response.status_code == 400
+    response = client.get("/admin/tasks", params={"sort": "owner", "limit": 5, "cursor": encode_cursor("alice", 1)}, headers=headers)
+    assert response.status_code == 200
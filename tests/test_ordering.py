@@ -0,0 +1,95 @@
+import math
+
+import pytest
+from fastapi import HTTPException
+from sqlmodel import select
+
+from api.config import POSITION_MIN_GAP
+from api.models import Task, utcnow
+from api.ordering import move_task, rebalance_positions, position_between
+
+def add_tasks(session, owner, positions: dict) -> dict:
+    tasks = {title: Task(title=title, owner_id=owner.id, position=position) for title, position in positions.items()}
+    session.add_all(tasks.values())
+    session.commit()
+    return tasks
+
+def order(session, owner) -> list:
+    statement = select(Task.title).where(Task.owner_id == owner.id, Task.deleted_at.is_(None)).order_by(Task.position)
+    return session.exec(statement).all()
+
+def move(session, task, after) -> bool:
+    needs_rebalance = move_task(session, task, after.id if after else None)
+    session.add(task)
+    session.commit()
+    return needs_rebalance
+
+def test_move_between_neighbours(memory_session, make_user):
+    owner = make_user(memory_session)
+    tasks = add_tasks(memory_session, owner, {"a": 1.0, "b": 2.0, "c": 3.0})
+    assert not move(memory_session, tasks["c"], tasks["a"])
+    assert order(memory_session, owner) == ["a", "c", "b"]
+    assert tasks["c"].position == 1.5
+    # Only the moved task changed
+    assert (tasks["a"].position, tasks["b"].position) == (1.0, 2.0)
+
+def test_move_to_head_and_tail(memory_session, make_user):
+    owner = make_user(memory_session)
+    tasks = add_tasks(memory_session, owner, {"a": 1.0, "b": 2.0, "c": 3.0})
+    move(memory_session, tasks["c"], None)
+    assert order(memory_session, owner) == ["c", "a", "b"]
+    move(memory_session, tasks["c"], tasks["b"])
+    assert order(memory_session, owner) == ["a", "b", "c"]
+    move(memory_session, tasks["a"], tasks["c"])
+    assert order(memory_session, owner) == ["b", "c", "a"]
+    assert tasks["a"].position == 4.0
+
+def test_narrow_gap_asks_for_rebalance(memory_session, make_user):
+    owner = make_user(memory_session)
+    tasks = add_tasks(memory_session, owner, {"a": 1.0, "b": 1.0 + 1.5 * POSITION_MIN_GAP, "c": 3.0})
+    assert move(memory_session, tasks["c"], tasks["a"])
+    assert order(memory_session, owner) == ["a", "c", "b"]
+
+def test_exhausted_gap_rebalances_in_place(memory_session, make_user):
+    owner = make_user(memory_session)
+    # No float between a and b; c is loaded before the renumbering moves a
+    tasks = add_tasks(memory_session, owner, {"c": 0.5, "a": 5.0, "b": math.nextafter(5.0, 6.0)})
+    assert position_between(tasks["a"].position, tasks["b"].position) is None
+
+    move(memory_session, tasks["c"], tasks["a"])
+    assert order(memory_session, owner) == ["a", "c", "b"]
+    # Renumbered c, a, b = 1, 2, 3, then c placed between a and b
+    assert [tasks[title].position for title in ("a", "c", "b")] == [2.0, 2.5, 3.0]
+
+def test_repeated_moves_into_one_gap_stay_ordered(memory_session, make_user):
+    owner = make_user(memory_session)
+    tasks = add_tasks(memory_session, owner, {"a": 1.0, "b": 2.0, "x": 3.0, "y": 4.0})
+    # Halve the a..b gap until it runs out; the fallback rebalance must keep the order
+    for n in range(80):
+        moved = tasks["x"] if n % 2 == 0 else tasks["y"]
+        move(memory_session, moved, tasks["a"])
+        assert order(memory_session, owner)[:2] == ["a", moved.title]
+    assert order(memory_session, owner)[-1] == "b"
+
+def test_rebalance_keeps_order_and_updated_at(memory_session, make_user):
+    owner = make_user(memory_session)
+    tasks = add_tasks(memory_session, owner, {"a": -7.25, "b": 0.001, "c": 0.0015, "d": 1e9})
+    before = {title: task.updated_at for title, task in tasks.items()}
+    assert rebalance_positions(memory_session, owner.id) == 4
+    memory_session.commit()
+    memory_session.expire_all()
+    assert [(task.title, task.position) for task in memory_session.exec(select(Task).order_by(Task.position))] == [
+        ("a", 1.0), ("b", 2.0), ("c", 3.0), ("d", 4.0)
+    ]
+    assert {title: task.updated_at for title, task in tasks.items()} == before
+
+def test_move_after_foreign_or_deleted_task_rejected(memory_session, make_user):
+    owner, other = make_user(memory_session), make_user(memory_session)
+    tasks = add_tasks(memory_session, owner, {"a": 1.0, "b": 2.0, "gone": 3.0})
+    tasks["gone"].deleted_at = utcnow()
+    memory_session.commit()
+    foreign = add_tasks(memory_session, other, {"z": 1.0})["z"]
+    for after_id in (foreign.id, tasks["gone"].id, tasks["a"].id, 12345):
+        with pytest.raises(HTTPException) as error:
+            move_task(memory_session, tasks["a"], after_id)
+        assert error.value.status_code == 400
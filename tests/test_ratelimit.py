@@ -0,0 +1,58 @@
+import asyncio
+from urllib.parse import urlencode
+
+from api.cache import MemoryCache, SQLiteCache
+from api.ratelimit import RateLimitMiddleware
+
+async def echo_app(scope, receive, send):
+    """Answers 200 with the request body it received"""
+    body, more = b"", True
+    while more:
+        message = await receive()
+        body += message.get("body", b"")
+        more = message.get("more_body", False)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+def call(middleware, path: str = "/auth/token", method: str = "POST", body: bytes = b"", ip: str = "10.0.0.1") -> tuple:
+    scope = {"type": "http", "method": method, "path": path, "headers": [], "client": (ip, 1234)}
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(middleware(scope, receive, send))
+    return sent[0]["status"], sent[1]["body"]
+
+def login(middleware, username: str, ip: str = "10.0.0.1") -> int:
+    return call(middleware, body=urlencode({"username": username, "password": "x"}).encode(), ip=ip)[0]
+
+def limiter(store=None, **limits) -> RateLimitMiddleware:
+    return RateLimitMiddleware(echo_app, {name: (0.001, burst) for name, burst in limits.items()}, store=store or MemoryCache())
+
+def test_login_body_reaches_app():
+    body = urlencode({"username": "alice", "password": "secret"}).encode()
+    assert call(limiter(login=3, login_ip=10), body=body) == (200, body)
+
+def test_login_limited_per_username_and_ip():
+    middleware = limiter(login=3, login_ip=100)
+    assert [login(middleware, "alice") for _ in range(4)] == [200, 200, 200, 429]
+    # Other usernames and other clients have their own budget
+    assert login(middleware, "bob") == 200
+    assert login(middleware, "alice", ip="10.0.0.2") == 200
+
+def test_login_limited_per_ip_across_usernames():
+    middleware = limiter(login=3, login_ip=5)
+    assert [login(middleware, f"user{n}") for n in range(6)] == [200] * 5 + [429]
+    assert login(middleware, "someone", ip="10.0.0.2") == 200
+
+def test_limits_shared_through_cache(tmp_path):
+    store = SQLiteCache(str(tmp_path / "cache.db"))
+    # Two workers sharing one cache file see one budget
+    workers = [limiter(store, read=4), limiter(store, read=4)]
+    statuses = [call(workers[n % 2], path="/tasks", method="GET")[0] for n in range(5)]
+    assert statuses == [200] * 4 + [429]
@@ -0,0 +1,121 @@
+import time
+
+from sqlmodel import Session, select, func
+
+from api.db import engine
+from api.maintenance import purge_tombstones
+from api.models import Task, Project, Tag, TaskTag
+
+def stored_counts(user) -> dict:
+    """{("project"|"tag", id): (task_count, COUNT(*) of live tasks)} for the user's projects and tags"""
+    live = Task.deleted_at.is_(None)
+    with Session(engine) as session:
+        counts = {}
+        for project in session.exec(select(Project).where(Project.owner_id == user.id)):
+            actual = session.exec(select(func.count()).select_from(Task).where(Task.project_id == project.id, live)).one()
+            counts[("project", project.id)] = (project.task_count, actual)
+        for tag in session.exec(select(Tag).where(Tag.owner_id == user.id)):
+            actual = session.exec(select(func.count()).select_from(TaskTag).join(Task, Task.id == TaskTag.task_id)
+                                  .where(TaskTag.tag_id == tag.id, live)).one()
+            counts[("tag", tag.id)] = (tag.task_count, actual)
+    return counts
+
+def assert_counts_match(user) -> dict:
+    counts = stored_counts(user)
+    assert counts
+    for key, (stored, actual) in counts.items():
+        assert stored == actual, key
+    return {key: stored for key, (stored, _) in counts.items()}
+
+def setup_taxonomy(client, headers) -> tuple:
+    projects = [client.post("/projects", json={"name": name}, headers=headers).json()["id"] for name in ("work", "home")]
+    tags = [client.post("/tags", json={"name": name}, headers=headers).json()["id"] for name in ("urgent", "later", "idea")]
+    return projects, tags
+
+def create_task(client, headers, project_id=None, tag_ids=()) -> int:
+    response = client.post("/tasks", json={"title": "t", "project_id": project_id, "tag_ids": list(tag_ids)}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+def test_counts_follow_create_retag_and_move(client, app_user):
+    user, headers = app_user()
+    (work, home), (urgent, later, idea) = setup_taxonomy(client, headers)
+    tasks = [create_task(client, headers, work, (urgent, later)), create_task(client, headers, work, (urgent,)),
+             create_task(client, headers, home), create_task(client, headers)]
+    counts = assert_counts_match(user)
+    assert counts[("project", work)] == 2 and counts[("tag", urgent)] == 2
+
+    client.put(f"/tasks/{tasks[0]}/tags", json={"tag_ids": [later, idea]}, headers=headers)
+    client.put(f"/tasks/{tasks[2]}/tags", json={"tag_ids": [urgent, urgent, idea]}, headers=headers)
+    client.put(f"/tasks/{tasks[1]}", json={"project_id": home}, headers=headers)
+    client.put(f"/tasks/{tasks[3]}", json={"project_id": work}, headers=headers)
+    client.put(f"/tasks/{tasks[2]}", json={"project_id": None}, headers=headers)
+    counts = assert_counts_match(user)
+    assert counts[("tag", idea)] == 2 and counts[("project", home)] == 1
+
+def test_counts_follow_soft_delete_restore_and_purge(client, app_user):
+    user, headers = app_user()
+    admin, admin_headers = app_user(is_admin=True)
+    (work, _), (urgent, later, _) = setup_taxonomy(client, headers)
+    tasks = [create_task(client, headers, work, (urgent, later)) for _ in range(3)]
+
+    assert client.delete(f"/tasks/{tasks[0]}", headers=headers).status_code == 204
+    assert client.delete(f"/admin/tasks/{tasks[1]}", headers=admin_headers).status_code == 204
+    assert assert_counts_match(user)[("project", work)] == 1
+
+    assert client.post(f"/tasks/{tasks[0]}/restore", headers=headers).status_code == 200
+    assert assert_counts_match(user)[("tag", urgent)] == 2
+
+    # Hard delete of the remaining tombstone: already uncounted
+    purge_tombstones(retention_days=0, batch_size=100)
+    with Session(engine) as session:
+        assert session.get(Task, tasks[1]) is None
+    assert assert_counts_match(user)[("tag", later)] == 2
+
+def test_deleting_project_or_tag_keeps_other_counts(client, app_user):
+    user, headers = app_user()
+    (work, home), (urgent, later, _) = setup_taxonomy(client, headers)
+    task = create_task(client, headers, work, (urgent, later))
+    create_task(client, headers, home, (later,))
+
+    assert client.delete(f"/projects/{work}", headers=headers).status_code == 204
+    assert client.delete(f"/tags/{urgent}", headers=headers).status_code == 204
+    counts = assert_counts_match(user)
+    assert ("project", work) not in counts and ("tag", urgent) not in counts
+    assert counts[("tag", later)] == 2
+    assert client.get(f"/tasks/{task}", headers=headers).json()["project_id"] is None
+
+def test_counts_follow_bulk_import(client, app_user, monkeypatch):
+    user, headers = app_user()
+    admin, admin_headers = app_user(is_admin=True)
+    (work, home), (urgent, later, idea) = setup_taxonomy(client, headers)
+    create_task(client, headers, work, (urgent,))
+    # Several import transactions
+    monkeypatch.setattr("api.job_handlers.IMPORT_BATCH", 4)
+    tasks = [{"title": f"imported {n}", "project_id": (work, home, None)[n % 3],
+              "tag_ids": [(urgent, later, idea)[n % 3], later, later]} for n in range(10)]
+
+    response = client.post("/admin/jobs/import-tasks", json={"owner_id": user.id, "tasks": tasks}, headers=admin_headers)
+    assert response.status_code == 202, response.text
+    job_id = response.json()["id"]
+    deadline = time.monotonic() + 10
+    while (job := client.get(f"/jobs/{job_id}", headers=admin_headers).json())["status"] in ("queued", "running"):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    assert job["status"] == "succeeded", job
+
+    counts = assert_counts_match(user)
+    assert counts[("project", work)] == 5 and counts[("project", home)] == 3
+    assert counts[("tag", later)] == 10 and counts[("tag", urgent)] == 5
+    assert len(client.get("/tasks", params={"tags": f"{urgent},{later}"}, headers=headers).json()) == 4
+
+def test_import_rejects_foreign_project_and_tags(client, app_user):
+    user, headers = app_user()
+    other, other_headers = app_user()
+    admin, admin_headers = app_user(is_admin=True)
+    (work, _), (urgent, _, _) = setup_taxonomy(client, other_headers)
+    response = client.post("/admin/jobs/import-tasks", headers=admin_headers, json={
+        "owner_id": user.id, "tasks": [{"title": "x", "project_id": work, "tag_ids": [urgent]}]
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"]["unknown"] == {"projects": [work], "tags": [urgent]}
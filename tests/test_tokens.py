@@ -0,0 +1,77 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from api.auth import create_access_token, create_refresh_token, decode_token
+from api.maintenance import delete_user_cascade
+from api.tokens import issue_tokens, rotate, logout
+
+def assert_rejected(session, token: str, detail: str = None):
+    with pytest.raises(HTTPException) as error:
+        rotate(session, token)
+    assert error.value.status_code == 401
+    if detail:
+        assert error.value.detail == detail
+
+def test_rotate_succeeds_once(memory_session, make_user):
+    user = make_user(memory_session)
+    first = issue_tokens(user)
+
+    second = rotate(memory_session, first["refresh_token"])
+    assert decode_token(second["access_token"]) == user.username
+    assert second["refresh_token"] != first["refresh_token"]
+
+    third = rotate(memory_session, second["refresh_token"])
+    assert third["refresh_token"] != second["refresh_token"]
+
+def test_reuse_revokes_whole_family(memory_session, make_user):
+    user = make_user(memory_session)
+    stolen = issue_tokens(user)["refresh_token"]
+    current = rotate(memory_session, stolen)["refresh_token"]
+
+    assert_rejected(memory_session, stolen, "Refresh token reuse detected")
+    # The legitimate holder's newer token died with the family
+    assert_rejected(memory_session, current, "Refresh token revoked")
+
+def test_other_login_sessions_survive_reuse(memory_session, make_user):
+    user = make_user(memory_session)
+    stolen = issue_tokens(user)["refresh_token"]
+    other = issue_tokens(user)["refresh_token"]
+    rotate(memory_session, stolen)
+    assert_rejected(memory_session, stolen)
+
+    assert rotate(memory_session, other)["refresh_token"]
+
+def test_logout_revokes_family(memory_session, make_user):
+    user = make_user(memory_session)
+    token = rotate(memory_session, issue_tokens(user)["refresh_token"])["refresh_token"]
+    logout(memory_session, token)
+    assert_rejected(memory_session, token, "Refresh token revoked")
+
+def test_expired_and_foreign_tokens_rejected(memory_session, make_user):
+    user = make_user(memory_session)
+    assert_rejected(memory_session, create_refresh_token(user.id, expires_days=-1), "Invalid refresh token")
+    assert_rejected(memory_session, create_access_token(user.username), "Invalid refresh token")
+    assert_rejected(memory_session, "not-a-jwt", "Invalid refresh token")
+
+def test_deleted_user_rejected(memory_session, make_user):
+    user = make_user(memory_session)
+    token = issue_tokens(user)["refresh_token"]
+    delete_user_cascade(memory_session, user)
+    memory_session.commit()
+    assert_rejected(memory_session, token, "Refresh token revoked")
+
+def test_reregistered_username_does_not_inherit_tokens(memory_session, make_user):
+    user = make_user(memory_session)
+    old_token = issue_tokens(user)["refresh_token"]
+    delete_user_cascade(memory_session, user)
+    memory_session.commit()
+    # Token iat has whole-second precision
+    time.sleep(1.1)
+
+    again = make_user(memory_session, username=user.username)
+    # SQLite hands out the freed id again
+    assert again.id == user.id
+    assert_rejected(memory_session, old_token, "Refresh token revoked")
+    assert rotate(memory_session, issue_tokens(again)["refresh_token"])["refresh_token"]